@@ -0,0 +1,203 @@
+"""
+In-process response cache for the Volleybox API.
+
+Entries are keyed by endpoint + normalized params, expire after a
+per-endpoint TTL and are evicted LRU-first when the entry or byte budget is
+exceeded. Within the stale window after expiry an entry is still served
+instantly while a single background refresh re-scrapes it
+(stale-while-revalidate).
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+
+from scraper.urls import entity_key, normalize_url
+
+try:
+    import orjson
+except ImportError:  # size estimates fall back to stdlib json
+    orjson = None
+
+# Seconds an entry is fresh, per endpoint
+CACHE_TTLS = {
+    "teams/detail": 3600,
+    "players/detail": 6 * 3600,
+    "tournaments/detail": 15 * 60,
+    "search": 3600,
+}
+DEFAULT_TTL = 600
+# Seconds after expiry during which stale data is served while refreshing
+STALE_WINDOW = 24 * 3600
+
+MAX_ENTRIES = 2048
+MAX_BYTES = 64 * 1024 * 1024
+
+
+class CacheEntry:
+    __slots__ = ("value", "created", "ttl", "size")
+
+    def __init__(self, value, ttl, size, created=None):
+        self.value = value
+        self.created = time.time() if created is None else created
+        self.ttl = ttl
+        self.size = size
+
+    @property
+    def age(self):
+        return time.time() - self.created
+
+
+class ResponseCache:
+    """
+    LRU + TTL response cache with stale-while-revalidate.
+
+    Usage (inside an async endpoint):
+        data, meta = await cache.get("teams/detail", {"url": url}, loader)
+        cache.apply_headers(response, meta)
+    """
+
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL, stale_window=STALE_WINDOW,
+                 max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stale_window = stale_window
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._refreshing = {}
+        self.stats = {"hit": 0, "stale": 0, "miss": 0, "evicted": 0}
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    async def get(self, endpoint, params, loader):
+        """
+        Return cached data for an endpoint call, loading it on a miss.
+
+        Args:
+            endpoint: Endpoint name, e.g. 'teams/detail'
+            params: Dict of request params (normalized into the key)
+            loader: Async callable returning fresh data (None = not found)
+
+        Returns:
+            (data, meta) where meta has 'status' (HIT/STALE/MISS), 'age' and 'ttl'
+        """
+        key = cache_key(endpoint, params)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = entry.age
+            if age < entry.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hit"] += 1
+                return entry.value, {"status": "HIT", "age": age, "ttl": entry.ttl}
+            if age < entry.ttl + self.stale_window:
+                self._entries.move_to_end(key)
+                self.stats["stale"] += 1
+                self._refresh(key, endpoint, loader)
+                return entry.value, {"status": "STALE", "age": age, "ttl": entry.ttl}
+
+        self.stats["miss"] += 1
+        value = await loader()
+        if value is not None:
+            self.put(key, endpoint, value)
+        return value, {"status": "MISS", "age": 0, "ttl": self.ttl_for(endpoint)}
+
+    def status(self, endpoint, params):
+        """'HIT' or 'STALE' if get() would answer without loading, else None."""
+        entry = self._entries.get(cache_key(endpoint, params))
+        if entry is None:
+            return None
+        age = entry.age
+        if age < entry.ttl:
+            return "HIT"
+        if age < entry.ttl + self.stale_window:
+            return "STALE"
+        return None
+
+    def put(self, key, endpoint, value, created=None):
+        """
+        Insert or replace an entry, evicting least recently used ones if needed.
+        `created` backdates an entry loaded from elsewhere (e.g. the store's updated_at).
+        """
+        size = _estimate_size(value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = CacheEntry(value, self.ttl_for(endpoint), size, created)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats["evicted"] += 1
+
+    def invalidate(self, endpoint, params):
+        entry = self._entries.pop(cache_key(endpoint, params), None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _refresh(self, key, endpoint, loader):
+        """Start one background refresh per key."""
+        if key in self._refreshing:
+            return
+
+        async def run():
+            try:
+                value = await loader()
+                if value is not None:
+                    self.put(key, endpoint, value)
+            except Exception as e:
+                print(f"Cache refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.get_running_loop().create_task(run())
+
+    def apply_headers(self, response, meta):
+        """Set Cache-Control, Age and X-Cache headers on a response."""
+        remaining = max(0, int(meta["ttl"] - meta["age"]))
+        response.headers["Cache-Control"] = (
+            f"public, max-age={remaining}, stale-while-revalidate={self.stale_window}"
+        )
+        response.headers["Age"] = str(int(meta["age"]))
+        response.headers["X-Cache"] = meta["status"]
+
+    def info(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "refreshing": len(self._refreshing),
+            **self.stats,
+        }
+
+
+def cache_key(endpoint, params):
+    """
+    Normalize an endpoint call into a cache key.
+    Entity URLs collapse to their entity key, so tr/en and slug variants share an entry.
+    """
+    parts = [endpoint]
+    for name in sorted(params):
+        value = params[name]
+        if value is None:
+            continue
+        if name == "url":
+            key = entity_key(value)
+            value = f"{key.type}:{key.id}" if key else normalize_url(value, lang="tr")
+        elif isinstance(value, str):
+            value = value.strip().lower()
+        parts.append(f"{name}={value}")
+    return "|".join(parts)
+
+
+def _estimate_size(value):
+    try:
+        if orjson is not None:
+            return len(orjson.dumps(value, default=str))
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
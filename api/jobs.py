@@ -0,0 +1,291 @@
+"""
+Background scrape jobs for the Volleybox API.
+
+Long scrapes (tournament match archives, multi-page list crawls, detail
+crawls) run as jobs on the shared ScrapeQueue instead of inside a request.
+Clients start a job with POST /jobs, poll GET /jobs/{id} and can follow
+progress events over Server-Sent Events at GET /jobs/{id}/events.
+DELETE /jobs/{id} cancels a job: a queued one never starts, a running one
+stops at its next deadline check, freeing the scrape worker.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from scraper.core import Deadline, ScrapeCancelled
+from scraper.service import OPERATIONS
+from scraper.urls import normalize_url
+
+# Finished jobs kept in memory for status/result lookups
+MAX_FINISHED_JOBS = 100
+# Upper bound for list crawls started through the API
+MAX_PAGE_LIMIT = 50
+# Seconds a job may run once started (its Deadline); bounds how long it holds the worker
+MAX_JOB_SECONDS = 30 * 60
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+class JobError(ValueError):
+    """Raised for an unknown job kind or invalid job params."""
+
+
+class Job:
+    __slots__ = ("id", "kind", "params", "status", "created", "started", "finished",
+                 "progress", "events", "items", "result", "error", "future", "deadline", "_lock")
+
+    def __init__(self, kind, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.progress = None
+        self.events = []
+        # Records produced so far, for jobs that stream results (tournament_matches)
+        self.items = []
+        self.result = None
+        self.error = None
+        # concurrent.futures.Future of the queued run, set once submitted
+        self.future = None
+        # Passed to the scrape functions; time-limited once the job starts, cancel() stops it
+        self.deadline = Deadline()
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in FINISHED_STATES
+
+    def emit(self, event, **data):
+        """Record an event (called from the scrape worker thread)."""
+        with self._lock:
+            self.events.append({"id": len(self.events), "event": event, "time": time.time(), **data})
+
+    def events_since(self, index):
+        with self._lock:
+            return self.events[index:]
+
+    def report(self, step, total, count, label):
+        """Progress hook with the scrape_tournament_matches progress_callback signature."""
+        self.progress = {"step": step, "total": total, "count": count, "label": label}
+        self.emit("progress", **self.progress)
+
+    def to_dict(self, include_result=True):
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "progress": self.progress,
+            "error": self.error,
+        }
+        if self.result is not None:
+            data["result_count"] = len(self.result)
+            if include_result:
+                data["result"] = self.result
+        return data
+
+
+# --- Job kinds: run(scraper, job, **params) → list of records ---
+
+def _tournament_matches(iter_matches):
+    def run(scraper, job, url):
+        for match in iter_matches(scraper, url, progress_callback=job.report, deadline=job.deadline):
+            job.items.append(match)
+        return job.items
+    return run
+
+
+def _list_crawl(func):
+    def run(scraper, job, page_limit=1):
+        job.report(0, 1, 0, "Liste çekiliyor...")
+        data = func(scraper, page_limit=page_limit, deadline=job.deadline)
+        job.report(1, 1, len(data), "Tamamlandı")
+        return data
+    return run
+
+
+def _detail_crawl(profile_func):
+    def run(scraper, job, urls):
+        results = []
+        total = len(urls)
+        job.report(0, total, 0, "Hazırlanıyor...")
+        for i, url in enumerate(urls):
+            job.deadline.check()
+            profile = profile_func(scraper, url, deadline=job.deadline)
+            if profile:
+                results.append(profile)
+            job.report(i + 1, total, len(results), (profile or {}).get("name", url))
+        return results
+    return run
+
+
+def job_kinds(ops):
+    """
+    Build the job kinds on a scrape operations registry.
+
+    Args:
+        ops: Operation name → scrape function (scraper.service.OPERATIONS or its remote proxies)
+    """
+    return {
+        "tournament_matches": _tournament_matches(ops["tournament_matches"]),
+        "teams": _list_crawl(ops["team_list"]),
+        "players": _list_crawl(ops["player_list"]),
+        "tournaments": _list_crawl(ops["tournament_list"]),
+        "transfers": _list_crawl(ops["transfers"]),
+        "team_details": _detail_crawl(ops["team_profile"]),
+        "player_details": _detail_crawl(ops["player_profile"]),
+    }
+
+
+JOB_KINDS = job_kinds(OPERATIONS)
+
+# Store entity each job kind's results belong to
+JOB_ENTITIES = {
+    "tournament_matches": "matches",
+    "teams": "teams",
+    "players": "players",
+    "tournaments": "tournaments",
+    "transfers": "transfers",
+    "team_details": "teams",
+    "player_details": "players",
+}
+
+
+def validate_params(kind, params):
+    """Check and normalize the params of a job request."""
+    if kind not in JOB_KINDS:
+        raise JobError(f"Unknown job kind: {kind!r} (choose from {', '.join(JOB_KINDS)})")
+    params = dict(params or {})
+
+    if kind == "tournament_matches":
+        if not params.get("url"):
+            raise JobError("tournament_matches needs a 'url'")
+        return {"url": normalize_url(params["url"])}
+
+    if kind.endswith("_details"):
+        urls = params.get("urls")
+        if not urls or not isinstance(urls, list):
+            raise JobError(f"{kind} needs a non-empty 'urls' list")
+        return {"urls": [str(u) for u in urls]}
+
+    page_limit = params.get("page_limit", 1)
+    if not isinstance(page_limit, int) or not 1 <= page_limit <= MAX_PAGE_LIMIT:
+        raise JobError(f"page_limit must be between 1 and {MAX_PAGE_LIMIT}")
+    return {"page_limit": page_limit}
+
+
+class JobManager:
+    """
+    Tracks background jobs and runs them on a ScrapeQueue.
+    An identical job (same kind and params) that is still queued or running is
+    reused instead of starting a second crawl.
+    """
+
+    def __init__(self, scrape_queue, max_finished=MAX_FINISHED_JOBS, on_result=None, kinds=None,
+                 job_timeout=MAX_JOB_SECONDS):
+        self.scrape_queue = scrape_queue
+        self.kinds = kinds or JOB_KINDS
+        self.max_finished = max_finished
+        self.job_timeout = job_timeout
+        # Optional callable(job) run on the worker after a job succeeds
+        self.on_result = on_result
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, params=None):
+        """
+        Start (or join) a job.
+
+        Returns:
+            Job
+
+        Raises:
+            JobError: Invalid kind or params
+            QueueFull: The scrape queue is saturated
+        """
+        params = validate_params(kind, params)
+        key = _job_key(kind, params)
+
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.done and _job_key(job.kind, job.params) == key:
+                    return job
+
+            job = Job(kind, params)
+            job.emit("queued")
+            job.future = self.scrape_queue.submit(f"job|{job.id}", self._run, job)
+            self._jobs[job.id] = job
+            self._trim()
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list(self):
+        return [job.to_dict(include_result=False) for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: a queued job is dropped, a running one stops at its next
+        deadline check (between pages/items). Returns the job, or None if unknown.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        job.deadline.cancel()
+        if job.future is not None and job.future.cancel():
+            # Never started: the queue worker skips it
+            self._finish_cancelled(job)
+        return job
+
+    def _run(self, scraper, job):
+        if job.deadline.expired:
+            self._finish_cancelled(job)
+            return job.id
+        job.deadline.expires = time.monotonic() + self.job_timeout
+        job.status = "running"
+        job.started = time.time()
+        job.emit("started")
+        try:
+            job.result = self.kinds[job.kind](scraper, job, **job.params)
+            if self.on_result:
+                self.on_result(job)
+        except ScrapeCancelled as e:
+            if job.items:
+                # Keep what a streaming job produced before it stopped
+                job.result = job.items
+            self._finish_cancelled(job, str(e))
+        except Exception as e:
+            job.error = str(e)
+            job.finished = time.time()
+            job.emit("failed", error=job.error)
+            job.status = "failed"
+        else:
+            job.finished = time.time()
+            job.emit("done", result_count=len(job.result))
+            # Status last: event streams stop once the job is finished
+            job.status = "done"
+        return job.id
+
+    def _finish_cancelled(self, job, reason="Cancelled"):
+        job.error = reason
+        job.finished = time.time()
+        job.emit("cancelled", error=reason)
+        job.status = "cancelled"
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+def _job_key(kind, params):
+    return f"{kind}|{sorted(params.items())}"
@@ -1,33 +1,94 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Optional, List, Union
+import asyncio
 import sys
+import time
 import os
 from contextlib import asynccontextmanager
 
 # Add parent directory to path so we can import scraper
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scraper.core import VolleyboxScraper
-from scraper.teams import scrape_team_list, scrape_team_profile
-from scraper.players import scrape_player_list, scrape_player_profile
-from scraper.tournaments import scrape_tournament_list, scrape_tournament_detail
-from scraper.transfers import scrape_transfers
+from scraper.core import Deadline, ScrapeCancelled, VolleyboxScraper
+from scraper.search import Autocompleter, SearchIndex
+from scraper.service import OPERATIONS, ScraperClient, ServiceBusy, remote_operations
+from scraper.analytics import compute_standings, reconcile_standings, standings_records
+from scraper.store import VolleyboxStore
+from scraper.urls import entity_id, entity_key
+from api.cache import ResponseCache, cache_key
+from api.queue import ScrapeQueue, QueueFull
+from api.jobs import JobManager, JobError, JOB_ENTITIES, job_kinds
+from api.pagination import InvalidCursor, decode_cursor, encode_cursor, etag_for, etag_matches
+from api.responses import CompressionMiddleware, FastJSONResponse, dumps, select_fields
+from api.warmup import DETAIL_ENDPOINTS, Readiness, load_hot_entries, prewarm_targets
 
-# Global scraper instance
+# Standalone scraper service URL; when set, this process launches no browser
+# and several uvicorn workers can share the service's one (python -m scraper.service)
+SCRAPER_SERVICE = os.environ.get("VOLLEYBOX_SCRAPER_SERVICE")
+# Scrape operations by name, run locally or proxied to the scraper service
+ops = remote_operations(ScraperClient(SCRAPER_SERVICE)) if SCRAPER_SERVICE else OPERATIONS
+
+# Global scraper instance (None when a scraper service is used)
 scraper: Optional[VolleyboxScraper] = None
+# Serialized scrape queue that owns the scraper
+scrape_queue: Optional[ScrapeQueue] = None
+# Background jobs for long scrapes
+jobs: Optional[JobManager] = None
+# Local store backing the list endpoints
+store: Optional[VolleyboxStore] = None
+# Local search index over stored entity names, updated on every upsert
+search_index = SearchIndex()
+# Type-ahead over the same names, ranked by popularity and recency
+autocompleter = Autocompleter()
+
+# Store entity → search index entity type
+INDEXED_ENTITIES = {"players": "player", "teams": "team", "tournaments": "tournament"}
+
+def index_upsert(entity, records):
+    """Store listener: keep the search index in sync with upserted entities."""
+    if entity in INDEXED_ENTITIES:
+        search_index.add_records(records, INDEXED_ENTITIES[entity])
+        autocompleter.add_records(records, INDEXED_ENTITIES[entity])
+
+# Response cache shared by all endpoints
+cache = ResponseCache()
+# Startup warm-up progress (VOLLEYBOX_WARMUP=0 skips the browser warm-up)
+readiness = Readiness(enabled=os.environ.get("VOLLEYBOX_WARMUP", "1") != "0")
+_warmup_task: Optional[asyncio.Task] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global scraper
-    print("Starting scraper...")
-    scraper = VolleyboxScraper(headless=False) # Keep headful for cloudflare
+    global scraper, scrape_queue, jobs, store, search_index, autocompleter, _warmup_task
+    if SCRAPER_SERVICE:
+        print(f"Using scraper service at {SCRAPER_SERVICE}")
+    else:
+        print("Starting scraper...")
+        scraper = VolleyboxScraper(headless=False) # Keep headful for cloudflare
+    scrape_queue = ScrapeQueue(scraper, max_depth=int(os.environ.get("VOLLEYBOX_QUEUE_DEPTH", 32)))
+    scrape_queue.start()
+    store = VolleyboxStore()
+    search_index = SearchIndex.from_store(store)
+    autocompleter = Autocompleter.from_store(store)
+    store.add_listener(index_upsert)
+    print(f"Search index: {len(search_index)} entities")
+    jobs = JobManager(scrape_queue, on_result=store_job_result, kinds=job_kinds(ops))
+    readiness.cache_entries = load_hot_entries(store, cache)
+    print(f"Cache warm-up: {readiness.cache_entries} entries from the store")
+    if readiness.enabled:
+        _warmup_task = asyncio.create_task(warm_up())
     yield
+    if _warmup_task:
+        _warmup_task.cancel()
     print("Closing scraper...")
+    scrape_queue.stop()
     if scraper:
         scraper.close()
+    store.close()
 
-app = FastAPI(title="Volleybox API", lifespan=lifespan)
+app = FastAPI(title="Volleybox API", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Allow CORS for frontend
 app.add_middleware(
@@ -36,108 +97,623 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Age", "Cache-Control", "ETag", "Link", "Retry-After", "X-Cache", "X-Job-Id", "X-Next-Cursor", "X-Source"],
 )
+# gzip/brotli for large responses (tournament details, match lists)
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.environ.get("VOLLEYBOX_COMPRESS_MIN_SIZE", 1024)))
+
+
+def busy_error(e):
+    return HTTPException(
+        status_code=503,
+        detail="Scraper is busy, try again later",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+# Seconds an API-triggered scrape may take, queue wait included
+SCRAPE_TIMEOUT = float(os.environ.get("VOLLEYBOX_SCRAPE_TIMEOUT", 90))
+# Seconds between client disconnect checks while a request waits for a scrape
+DISCONNECT_POLL = 1.0
+
+
+def timeout_error():
+    return HTTPException(status_code=504, detail="Scrape timed out")
+
+
+async def queued_scrape(key: str, func, *args, timeout: Optional[float] = SCRAPE_TIMEOUT, **kwargs):
+    """
+    Run a scrape on the queue worker; identical in-flight requests share one scrape.
+    func gets a Deadline of `timeout` seconds (None = no limit) as deadline=...
+    A request that times out or is cancelled stops waiting, and the scrape itself
+    is cancelled once no request is waiting for it, freeing the browser.
+    """
+    deadline = Deadline(timeout)
+    try:
+        future = scrape_queue.submit(key, func, *args, deadline=deadline, **kwargs)
+    except QueueFull as e:
+        raise busy_error(e)
+    waiter = asyncio.wrap_future(future)
+    try:
+        # asyncio.wait, not wait_for: leaving must not cancel a scrape other requests share
+        await asyncio.wait({waiter}, timeout=None if timeout is None else deadline.remaining())
+        if not waiter.done():
+            raise timeout_error()
+        try:
+            return waiter.result()
+        except ScrapeCancelled:
+            raise timeout_error()
+        except ServiceBusy as e:
+            # Remote scraper service at its call limit
+            raise busy_error(e)
+    finally:
+        if not waiter.done():
+            # Nobody reads the outcome any more; mark it retrieved
+            waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+        scrape_queue.release(key, future)
+
+
+async def unless_disconnected(request: Request, awaitable):
+    """Await a scrape-backed result, giving up (and releasing the scrape) if the client disconnects."""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        task.cancel()
+
+
+# Detail endpoint → store entity its scrapes are upserted into
+DETAIL_ENTITIES = {endpoint: entity for entity, (endpoint, _) in DETAIL_ENDPOINTS.items()}
+
+# Detail scrapers by endpoint (pre-scrape list)
+DETAIL_SCRAPERS = {
+    "teams/detail": ops["team_profile"],
+    "players/detail": ops["player_profile"],
+    "tournaments/detail": ops["tournament_detail"],
+}
+
+
+async def cached_fetch(endpoint: str, params: dict, func, *args, **kwargs):
+    """
+    Get (data, cache meta) for an endpoint call from the response cache, scraping on a miss.
+    Detail scrapes are also upserted into the store, which warms the cache on the next start.
+    """
+    key = cache_key(endpoint, params)
+    entity = DETAIL_ENTITIES.get(endpoint)
+
+    def scrape(scraper, deadline=None):
+        data = func(scraper, *args, deadline=deadline, **kwargs)
+        if data and entity:
+            store.upsert(entity, [data])
+        return data
+
+    async def loader():
+        return await queued_scrape(key, scrape)
+
+    return await cache.get(endpoint, params, loader)
+
+
+async def cached_scrape(response: Response, endpoint: str, params: dict, func, *args, **kwargs):
+    """Serve an endpoint from the response cache, scraping on a miss."""
+    data, meta = await cached_fetch(endpoint, params, func, *args, **kwargs)
+    cache.apply_headers(response, meta)
+    return data
+
+
+def json_response(data, response: Optional[Response] = None, fields: Optional[str] = None):
+    """
+    Render data with FastJSONResponse, keeping only the requested top-level fields.
+    Headers set on the injected endpoint `response` (cache headers) are carried over.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return FastJSONResponse(select_fields(data, fields), headers=headers)
+
+
+async def warm_up():
+    """Launch the browser and pass Cloudflare, then pre-scrape the configured URLs."""
+    readiness.browser = "starting"
+    try:
+        ok = await queued_scrape("warmup", ops["warm_up"], timeout=None)
+    except Exception as e:
+        print(f"Browser warm-up failed: {e}")
+        ok = False
+    readiness.browser = "ready" if ok else "failed"
+
+    targets = prewarm_targets()
+    readiness.prewarm["total"] = len(targets)
+    for endpoint, url in targets:
+        try:
+            if cache.status(endpoint, {"url": url}) != "HIT":
+                await cached_fetch(endpoint, {"url": url}, DETAIL_SCRAPERS[endpoint], url)
+            readiness.prewarm["done"] += 1
+        except Exception as e:
+            print(f"Pre-scrape failed for {url}: {e}")
+            readiness.prewarm["failed"] += 1
+
+
+def store_job_result(job):
+    """Upsert finished job results into the store (runs on the queue worker)."""
+    entity = JOB_ENTITIES.get(job.kind)
+    if entity and job.result:
+        store.upsert(entity, job.result)
+
+
+# Seconds before stored list data is refreshed from the site
+LIST_TTL = 6 * 3600
+# List pages a background refresh stores; cursors page through what is stored
+LIST_REFRESH_PAGES = int(os.environ.get("VOLLEYBOX_LIST_PAGES", 5))
+
+LIST_SCRAPERS = {
+    "teams": ops["team_list"],
+    "players": ops["player_list"],
+    "tournaments": ops["tournament_list"],
+    "transfers": ops["transfers"],
+}
+
+# Background list refreshes in flight (keeps task references alive)
+_list_refreshes = {}
+
+
+async def refresh_list(entity: str, page_limit: int = 1):
+    """Scrape the first `page_limit` list pages of an entity into the store."""
+    def run(scraper, deadline=None):
+        data = LIST_SCRAPERS[entity](scraper, page_limit=page_limit, deadline=deadline)
+        return store.upsert(entity, data)
+
+    return await queued_scrape(f"list|{entity}|{page_limit}", run, timeout=SCRAPE_TIMEOUT * page_limit)
+
+
+def schedule_list_refresh(entity: str):
+    """Refresh LIST_REFRESH_PAGES pages of a list in the background; requests keep getting stored data."""
+    if entity in _list_refreshes:
+        return
+
+    async def run():
+        try:
+            await refresh_list(entity, page_limit=LIST_REFRESH_PAGES)
+        except Exception as e:
+            print(f"List refresh failed for {entity}: {e}")
+        finally:
+            _list_refreshes.pop(entity, None)
+
+    _list_refreshes[entity] = asyncio.get_running_loop().create_task(run())
+
+
+async def list_from_store(request: Request, entity: str, limit: int, cursor: Optional[str],
+                          fields: Optional[str] = None, **filters):
+    """
+    Serve one page of a list endpoint from the store.
+    Scrapes the first list page live only when nothing is stored yet, then fills
+    LIST_REFRESH_PAGES pages in the background; stale data triggers the same
+    background refresh. Cursors page through stored records only, so they end
+    after LIST_REFRESH_PAGES site pages; deeper catalogues are loaded with a
+    list job (POST /jobs with page_limit), whose results are stored too.
+    """
+    try:
+        after = decode_cursor(cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    updated = store.last_updated(entity)
+    if updated is None:
+        await refresh_list(entity)
+        schedule_list_refresh(entity)
+    elif time.time() - updated > LIST_TTL:
+        schedule_list_refresh(entity)
+
+    records, next_after = store.page(entity, limit=limit, after=after, **filters)
+    records = select_fields(records, fields)
+    next_cursor = encode_cursor(next_after)
+
+    headers = {"Cache-Control": "no-cache", "ETag": etag_for([records, next_cursor])}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(records, headers=headers)
 
 @app.get("/")
 def read_root():
-    return {"status": "ok", "message": "Volleybox API is running"}
+    """Health/readiness check: 503 until the browser has been warmed up."""
+    body = {
+        "status": "ok" if readiness.ready else "warming",
+        "message": "Volleybox API is running",
+        "readiness": readiness.to_dict(),
+        "cache": cache.info(),
+        "store": store.counts() if store else {},
+        "search_index": len(search_index),
+    }
+    return FastJSONResponse(body, status_code=200 if readiness.ready else 503)
+
+@app.get("/metrics/queue")
+def queue_metrics():
+    """Scrape queue depth, coalescing counters and wait/run time percentiles."""
+    return scrape_queue.metrics() if scrape_queue else {}
 
 @app.get("/teams")
-def get_teams(page: int = 1, limit: int = 0):
-    """List teams with optional pagination limit."""
-    # Note: scraping multiple pages takes time.
-    # For now, let's just scrape the requested page count if limit is high, 
-    # but the scraper function scrape_team_list takes page_limit.
-    # Let's map 'limit' loosely to 'page_limit' for now or just scrape 1 page.
-    
-    # Actually, scrape_team_list's page_limit means "scrape X pages".
-    # Let's default to 1 page for speed in API.
-    data = scrape_team_list(scraper, page_limit=1)
-    return data
+async def get_teams(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    country: Optional[str] = None,
+    league: Optional[str] = None,
+):
+    """List stored teams; page with the cursor from the Link / X-Next-Cursor header."""
+    return await list_from_store(request, "teams", limit, cursor, fields, country=country, league=league)
 
 @app.get("/teams/detail")
-def get_team_detail(url: str):
+async def get_team_detail(request: Request, response: Response, url: str, fields: Optional[str] = None):
     """Get detailed team info."""
-    data = scrape_team_profile(scraper, url)
+    data = await unless_disconnected(
+        request, cached_scrape(response, "teams/detail", {"url": url}, DETAIL_SCRAPERS["teams/detail"], url)
+    )
     if not data:
         raise HTTPException(status_code=404, detail="Team not found or scrape failed")
-    return data
+    autocompleter.touch(url)
+    return json_response(data, response, fields)
+
+class BatchRequest(BaseModel):
+    # Entity URLs or numeric ids (ids are resolved to URLs through the store)
+    items: List[Union[str, int]]
+    # Seconds to wait for scrapes of uncached items before answering with "pending"
+    wait: float = 20.0
+    fields: Optional[str] = None
+
+# Max items per batch request
+BATCH_LIMIT = 100
+# Batch scrapes still running after a response was sent (keeps task references alive)
+_batch_tasks = set()
+
+def resolve_batch_item(entity: str, item):
+    """Map a batch item (URL or id) to (entity id, URL); URL is None if the id is unknown."""
+    if isinstance(item, int) or (isinstance(item, str) and item.strip().isdigit()):
+        item_id = int(item)
+        record = store.get(entity, item_id)
+        return item_id, (record or {}).get("url") or None
+    key = entity_key(item)
+    if key is None or f"{key.type}s" != entity:
+        return None, None
+    return key.id, item
+
+async def batch_detail(entity: str, endpoint: str, func, request: BatchRequest):
+    """
+    Resolve a batch of detail lookups: cached entries are answered at once,
+    misses are scheduled together on the scrape queue (identical ones coalesce).
+    Scrapes still running after `wait` seconds are reported as "pending" and
+    land in the cache for a later call.
+    """
+    if len(request.items) > BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_LIMIT} items per batch")
+
+    results = []
+    tasks = {}
+    for item in request.items:
+        item_id, url = resolve_batch_item(entity, item)
+        result = {"input": item, "id": item_id}
+        results.append(result)
+        if item_id is None:
+            result["status"] = "invalid"
+        elif url is None:
+            result["status"] = "not_found"
+        else:
+            result["url"] = url
+            params = {"url": url}
+            cache_status = cache.status(endpoint, params)
+            if cache_status:
+                data, _ = await cached_fetch(endpoint, params, func, url)
+                result["status"] = "cached" if cache_status == "HIT" else "stale"
+                result["data"] = data
+            else:
+                key = (entity, item_id)
+                if key not in tasks:
+                    tasks[key] = asyncio.ensure_future(cached_fetch(endpoint, params, func, url))
+                result["task"] = tasks[key]
+
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=max(0.0, request.wait))
+
+    for result in results:
+        task = result.pop("task", None)
+        if task is None:
+            continue
+        if not task.done():
+            result["status"] = "pending"
+            _batch_tasks.add(task)
+            task.add_done_callback(_batch_tasks.discard)
+        elif task.exception() is not None:
+            error = task.exception()
+            busy = isinstance(error, HTTPException) and error.status_code == 503
+            result["status"] = "busy" if busy else "error"
+            if not busy:
+                result["error"] = str(error)
+        else:
+            data, _ = task.result()
+            result["status"] = "scraped" if data else "not_found"
+            if data:
+                result["data"] = data
+
+    for result in results:
+        if "data" in result:
+            result["data"] = select_fields(result["data"], request.fields)
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return FastJSONResponse({"results": results, "summary": summary})
+
+@app.post("/teams/batch")
+async def get_teams_batch(request: BatchRequest):
+    """Team details for many URLs/ids in one call, with per-item status."""
+    return await batch_detail("teams", "teams/detail", DETAIL_SCRAPERS["teams/detail"], request)
+
+@app.post("/players/batch")
+async def get_players_batch(request: BatchRequest):
+    """Player details for many URLs/ids in one call, with per-item status."""
+    return await batch_detail("players", "players/detail", DETAIL_SCRAPERS["players/detail"], request)
 
 @app.get("/players")
-def get_players(page: int = 1):
-    """List players."""
-    data = scrape_player_list(scraper, page_limit=1)
-    return data
+async def get_players(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    country: Optional[str] = None,
+    position: Optional[str] = None,
+    team: Optional[str] = None,
+):
+    """List stored players (country = nationality)."""
+    return await list_from_store(request, "players", limit, cursor, fields, country=country, position=position, team=team)
 
 @app.get("/players/detail")
-def get_player_detail(url: str):
+async def get_player_detail(request: Request, response: Response, url: str, fields: Optional[str] = None):
     """Get detailed player info."""
-    data = scrape_player_profile(scraper, url)
+    data = await unless_disconnected(
+        request, cached_scrape(response, "players/detail", {"url": url}, DETAIL_SCRAPERS["players/detail"], url)
+    )
     if not data:
         raise HTTPException(status_code=404, detail="Player not found")
-    return data
+    autocompleter.touch(url)
+    return json_response(data, response, fields)
 
 @app.get("/tournaments")
-def get_tournaments():
-    """List tournaments."""
-    data = scrape_tournament_list(scraper, page_limit=1)
-    return data
+async def get_tournaments(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    country: Optional[str] = None,
+    season: Optional[str] = None,
+):
+    """List stored tournaments."""
+    return await list_from_store(request, "tournaments", limit, cursor, fields, country=country, season=season)
 
 @app.get("/tournaments/detail")
-def get_tournament_detail(url: str):
+async def get_tournament_detail(request: Request, response: Response, url: str, fields: Optional[str] = None):
     """Get tournament detail."""
-    data = scrape_tournament_detail(scraper, url)
+    data = await unless_disconnected(
+        request, cached_scrape(response, "tournaments/detail", {"url": url}, DETAIL_SCRAPERS["tournaments/detail"], url)
+    )
     if not data:
         raise HTTPException(status_code=404, detail="Tournament not found")
-    return data
+    autocompleter.touch(url)
+    return json_response(data, response, fields)
+
+# Seconds stored tournament matches are served without re-scraping
+MATCHES_TTL = 3600
+# Seconds between checks for new records of a live match stream
+MATCH_STREAM_POLL = 0.25
+
+async def ndjson_lines(records, fields: Optional[str] = None):
+    for record in records:
+        yield dumps(select_fields(record, fields)) + "\n"
+
+async def ndjson_job_items(job, fields: Optional[str] = None):
+    """Follow a running job's records as NDJSON until the job finishes."""
+    sent = 0
+    while True:
+        items = job.items[sent:]
+        for item in items:
+            yield dumps(select_fields(item, fields)) + "\n"
+        sent += len(items)
+        if job.done and sent >= len(job.items):
+            break
+        await asyncio.sleep(MATCH_STREAM_POLL)
+    if job.status == "failed":
+        yield dumps({"error": job.error}) + "\n"
+
+@app.get("/tournaments/matches")
+async def get_tournament_matches(request: Request, url: str, stream: bool = False, fields: Optional[str] = None):
+    """
+    All matches of a tournament.
+    With stream=1 the matches are sent as NDJSON as soon as each round is extracted.
+    Fresh stored matches are served from the store; otherwise a tournament_matches
+    job scrapes them (shared with any identical job already running). A crawl that
+    outlasts SCRAPE_TIMEOUT keeps running: the response is then 202 with the job,
+    to be polled at /jobs/{id}.
+    """
+    tournament_id = entity_id(url)
+    if tournament_id is None or not isinstance(tournament_id, str):
+        raise HTTPException(status_code=400, detail="Not a tournament URL")
+
+    updated = store.last_updated("matches", tournament_id=tournament_id)
+    if updated is not None and time.time() - updated < MATCHES_TTL:
+        matches = store.matches(tournament_id=tournament_id)
+        headers = {"X-Source": "store"}
+        if stream:
+            return StreamingResponse(ndjson_lines(matches, fields), media_type="application/x-ndjson", headers=headers)
+        return FastJSONResponse(select_fields(matches, fields), headers=headers)
+
+    try:
+        job = jobs.submit("tournament_matches", {"url": url})
+    except QueueFull as e:
+        raise busy_error(e)
+    headers = {"X-Source": "live", "X-Job-Id": job.id}
+    if stream:
+        return StreamingResponse(ndjson_job_items(job, fields), media_type="application/x-ndjson", headers=headers)
+
+    # shield: a timed-out or disconnected request leaves the job running for others
+    waiter = asyncio.shield(asyncio.wrap_future(job.future))
+    try:
+        await unless_disconnected(request, asyncio.wait_for(waiter, SCRAPE_TIMEOUT))
+    except asyncio.TimeoutError:
+        return FastJSONResponse(
+            job.to_dict(include_result=False),
+            status_code=202,
+            headers={**headers, "Location": f"/jobs/{job.id}"},
+        )
+    if job.status == "failed":
+        raise HTTPException(status_code=502, detail=f"Scrape failed: {job.error}")
+    return FastJSONResponse(select_fields(job.result, fields), headers=headers)
+
+@app.get("/tournaments/standings")
+async def get_tournament_standings(
+    url: str,
+    by_group: bool = False,
+    reconcile: bool = False,
+    fields: Optional[str] = None,
+):
+    """
+    League table computed from the stored matches of a tournament (3-0/3-1 = 3 pts,
+    3-2 = 2/1). by_group=1 ranks teams within each round/group; reconcile=1 adds a
+    comparison with the standings scraped from the tournament's /table page.
+    """
+    tournament_id = entity_id(url)
+    if tournament_id is None or not isinstance(tournament_id, str):
+        raise HTTPException(status_code=400, detail="Not a tournament URL")
+    matches = store.matches(tournament_id=tournament_id)
+    if not matches:
+        raise HTTPException(status_code=404, detail="No stored matches; fetch /tournaments/matches first")
+
+    standings = compute_standings(matches, group_by="round" if by_group else None)
+    data = {"tournament_id": tournament_id, "standings": select_fields(standings_records(standings), fields)}
+    if reconcile:
+        scraped = store.standings(tournament_id)
+        data["reconciliation"] = standings_records(reconcile_standings(standings, scraped)) if scraped else None
+    return FastJSONResponse(data)
+
+@app.get("/transfers")
+async def get_transfers(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    country: Optional[str] = None,
+    position: Optional[str] = None,
+):
+    """List stored transfers, newest first."""
+    return await list_from_store(request, "transfers", limit, cursor, fields, country=country, position=position)
 
 @app.get("/search")
-def search(q: str):
-    """Search functionality."""
-    # We need to implement search_site logic here or import it
-    # Since search_site was in main.py, let's duplicate the logic or refactor.
-    # For speed, I'll reimplement specific search logic here or move search_site to a common module.
-    # Let's try to import it if possible, but main.py has argparse logic.
-    # Better to copy the logic or refactor. I'll copy the core logic for now.
-    
-    url = f"https://women.volleybox.net/{scraper.lang}/search"
-    soup = scraper.get_page(url, params={"q": q})
-    
-    if not soup:
-        return []
+async def search(
+    request: Request,
+    response: Response,
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    types: Optional[str] = Query(None, alias="type"),
+    live: bool = False,
+    fields: Optional[str] = None,
+):
+    """
+    Search players, teams and tournaments (type=player,team to filter).
+    Answered from the local index; the site search is only used when nothing
+    matches locally or live=1.
+    """
+    types = set(types.split(",")) if types else None
+    if not live:
+        results = search_index.search(q, limit=limit, types=types)
+        if results:
+            response.headers["X-Source"] = "index"
+            return json_response(results, response, fields)
 
-    results = []
-    for link in soup.select("a"):
-        href = link.get("href", "")
-        text = link.get_text(strip=True)
-        
-        if not text or len(text) < 2:
-            continue
-            
-        import re
-        result_type = None
-        if re.search(r'-p\d+$', href):
-            result_type = "player"
-        elif re.search(r'-t\d+$', href):
-            result_type = "team"
-        elif re.search(r'-c\d+$', href):
-            result_type = "tournament"
-        else:
-            continue
-            
-        full_url = href if href.startswith("http") else f"https://women.volleybox.net{href}"
-        results.append({
-            "name": text,
-            "type": result_type,
-            "url": full_url,
-        })
-        
-    # Deduplicate
-    seen = set()
-    unique = []
-    for r in results:
-        if r["url"] not in seen:
-            seen.add(r["url"])
-            unique.append(r)
-            
-    return unique
+    data = await unless_disconnected(request, cached_scrape(response, "search", {"q": q}, ops["search"], q)) or []
+    # Search page names carry extra labels; never let them replace scraped names
+    search_index.add_records(data, replace=False)
+    autocompleter.add_records(data, replace=False)
+    if types:
+        data = [item for item in data if item["type"] in types]
+    response.headers["X-Source"] = "live"
+    return json_response(data[:limit], response, fields)
+
+
+@app.get("/autocomplete")
+def autocomplete(
+    q: str,
+    k: int = Query(10, ge=1, le=50),
+    types: Optional[str] = Query(None, alias="type"),
+):
+    """Type-ahead suggestions from stored names (never scrapes), most viewed and most recent first."""
+    types = set(types.split(",")) if types else None
+    return FastJSONResponse(autocompleter.complete(q, k=k, types=types), headers={"Cache-Control": "public, max-age=60"})
+
+
+class JobRequest(BaseModel):
+    kind: str
+    params: dict = {}
+
+def get_job_or_404(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/jobs", status_code=202)
+def create_job(request: JobRequest):
+    """
+    Start a background scrape job.
+    Kinds: tournament_matches {url}, teams/players/tournaments/transfers {page_limit},
+    team_details/player_details {urls}.
+    """
+    try:
+        job = jobs.submit(request.kind, request.params)
+    except JobError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFull as e:
+        raise busy_error(e)
+    return job.to_dict(include_result=False)
+
+@app.get("/jobs")
+def list_jobs():
+    """List known jobs (without results)."""
+    return jobs.list()
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str, include_result: bool = True):
+    """Job status, progress and (once done) results."""
+    return get_job_or_404(job_id).to_dict(include_result=include_result)
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """Cancel a queued or running job (a running scrape stops at its next page or item)."""
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict(include_result=False)
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, poll: float = Query(0.5, ge=0.1, le=10)):
+    """Server-Sent Events stream of job progress; ends after the final event."""
+    job = get_job_or_404(job_id)
+
+    async def event_stream():
+        sent = 0
+        while True:
+            for event in job.events_since(sent):
+                sent += 1
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {dumps(event)}\n\n"
+            if job.done and sent >= len(job.events):
+                break
+            await asyncio.sleep(poll)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,51 @@
+"""
+Cursor pagination and ETag helpers for the store-backed list endpoints.
+
+Cursors are opaque URL-safe tokens wrapping the sort key of the last record
+on the previous page (keyset pagination), so paging stays stable while new
+records are upserted.
+"""
+
+import base64
+import hashlib
+import json
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a malformed cursor."""
+
+
+def encode_cursor(after):
+    """Encode a sort key as an opaque cursor (None → None)."""
+    if after is None:
+        return None
+    raw = json.dumps({"after": after}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor back to its sort key (None/'' → None)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return data["after"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def etag_for(payload):
+    """Strong ETag of a JSON-serializable payload."""
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    return f'"{hashlib.blake2b(raw, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value matches the ETag (handles lists, W/ and *)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return etag in candidates
@@ -0,0 +1,227 @@
+"""
+Serialized scrape queue for the Volleybox API.
+
+The API shares one VolleyboxScraper (one ChromiumPage), which must never be
+driven by two threads at once. All scrapes go through a ScrapeQueue: a single
+worker thread owns the scraper and runs jobs one at a time, identical
+concurrent requests share one job (single-flight), and the queue depth is
+bounded so overload is rejected early instead of piling up latency.
+Scrapes submitted with a Deadline are cancelled once it passes or once
+every request waiting on them has gone, freeing the browser for the next job.
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from scraper.core import ScrapeCancelled
+
+MAX_DEPTH = 32
+# Number of recent jobs kept for latency percentiles
+METRICS_WINDOW = 500
+# Fallback duration estimate (seconds) before any job has finished
+DEFAULT_JOB_SECONDS = 10.0
+
+
+class QueueFull(Exception):
+    """Raised when the scrape queue is saturated."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Scrape queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class _Job:
+    __slots__ = ("key", "func", "args", "kwargs", "future", "enqueued", "waiters", "deadline")
+
+    def __init__(self, key, func, args, kwargs, deadline=None):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued = time.monotonic()
+        self.waiters = 1
+        self.deadline = deadline
+
+
+class ScrapeQueue:
+    """
+    Single-worker scrape queue with request coalescing.
+
+    Usage:
+        jobs = ScrapeQueue(scraper)
+        jobs.start()
+        future = jobs.submit("teams/detail|team:2309", scrape_team_profile, url)
+        data = await asyncio.wrap_future(future)
+    """
+
+    def __init__(self, scraper, max_depth=MAX_DEPTH):
+        self.scraper = scraper
+        self.max_depth = max_depth
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._worker = None
+        self._running = None
+        self._wait_times = deque(maxlen=METRICS_WINDOW)
+        self._run_times = deque(maxlen=METRICS_WINDOW)
+        self.stats = {"submitted": 0, "coalesced": 0, "rejected": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    def start(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="scrape-queue", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout=30):
+        """Stop the worker after the job in progress; queued jobs are cancelled."""
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self._worker = None
+        with self._lock:
+            for job in self._pending.values():
+                job.future.cancel()
+            self._pending.clear()
+
+    def submit(self, key, func, *args, deadline=None, **kwargs):
+        """
+        Queue func(scraper, *args, **kwargs), sharing the job with any identical
+        request (same key) that is already queued or running.
+
+        Args:
+            key: Coalescing key, e.g. a response cache key
+            func: Scrape function taking the scraper as first argument
+            deadline: Optional Deadline, passed on to func as deadline=...;
+                a shared job runs until the latest deadline of its requests
+
+        Returns:
+            concurrent.futures.Future with the scrape result
+
+        Raises:
+            QueueFull: If max_depth jobs are already waiting
+        """
+        with self._lock:
+            job = self._pending.get(key)
+            if job is not None and job.deadline is not None and job.deadline.expired:
+                # Being cancelled: don't join it, start a fresh scrape
+                job = None
+            if job is not None:
+                job.waiters += 1
+                if deadline is not None and job.deadline is not None:
+                    job.deadline.extend(deadline)
+                self.stats["coalesced"] += 1
+                return job.future
+
+            if self._queue.qsize() >= self.max_depth:
+                self.stats["rejected"] += 1
+                raise QueueFull(self.retry_after())
+
+            if deadline is not None:
+                kwargs["deadline"] = deadline
+            job = _Job(key, func, args, kwargs, deadline)
+            self._pending[key] = job
+            self.stats["submitted"] += 1
+        self._queue.put(job)
+        return job.future
+
+    def release(self, key, future):
+        """
+        Stop waiting for a submitted job (timed out or disconnected request).
+        When no request is left waiting, the job is dropped if still queued,
+        or its deadline is cancelled so the running scrape stops at its next check.
+        """
+        with self._lock:
+            job = self._pending.get(key)
+            if job is None or job.future is not future or future.done():
+                return
+            job.waiters -= 1
+            if job.waiters > 0:
+                return
+            if future.cancel():
+                # Still queued: the worker skips it
+                del self._pending[key]
+                self.stats["cancelled"] += 1
+            elif job.deadline is not None:
+                job.deadline.cancel()
+
+    def retry_after(self):
+        """Seconds until the current backlog is expected to drain."""
+        return max(1, math.ceil((self._queue.qsize() + 1) * self._avg_run_time()))
+
+    def _avg_run_time(self):
+        if not self._run_times:
+            return DEFAULT_JOB_SECONDS
+        return sum(self._run_times) / len(self._run_times)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            if not job.future.set_running_or_notify_cancel():
+                self._finish(job)
+                continue
+            if job.deadline is not None and job.deadline.expired:
+                # Nobody is waiting any more; don't spend the browser on it
+                self.stats["cancelled"] += 1
+                job.future.set_exception(ScrapeCancelled("Deadline exceeded before the scrape started"))
+                self._finish(job)
+                continue
+
+            started = time.monotonic()
+            self._wait_times.append(started - job.enqueued)
+            self._running = job.key
+            try:
+                result = job.func(self.scraper, *job.args, **job.kwargs)
+            except ScrapeCancelled as e:
+                self.stats["cancelled"] += 1
+                job.future.set_exception(e)
+            except BaseException as e:
+                self.stats["failed"] += 1
+                job.future.set_exception(e)
+            else:
+                self.stats["completed"] += 1
+                job.future.set_result(result)
+            finally:
+                self._run_times.append(time.monotonic() - started)
+                self._running = None
+                self._finish(job)
+
+    def _finish(self, job):
+        with self._lock:
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+
+    def metrics(self):
+        """Queue depth, throughput counters and wait/run time percentiles (seconds)."""
+        return {
+            "depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "running": self._running,
+            **self.stats,
+            "wait_seconds": _percentiles(self._wait_times),
+            "run_seconds": _percentiles(self._run_times),
+        }
+
+
+def _percentiles(samples):
+    if not samples:
+        return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def pick(q):
+        return round(ordered[min(last, int(q * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[last], 3),
+    }
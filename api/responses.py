@@ -0,0 +1,163 @@
+"""
+Response helpers for the Volleybox API: fast JSON rendering, response
+compression and sparse fieldsets.
+"""
+
+import json
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import orjson
+except ImportError:  # falls back to stdlib json
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # only gzip is offered
+    brotli = None
+
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Already-compressed or streamed-event content is never compressed
+_SKIP_CONTENT_TYPES = ("text/event-stream", "image/", "application/zip", "application/gzip")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when it is installed.
+    Endpoints return it directly, which also skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content):
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def parse_fields(fields):
+    """'name, url,standings' → {'name', 'url', 'standings'} (None if not given)."""
+    if not fields:
+        return None
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    return selected or None
+
+
+def select_fields(data, fields):
+    """
+    Keep only the requested top-level keys of a record or of each record in a list.
+
+    Args:
+        data: Dict, list of dicts or anything else (returned unchanged)
+        fields: Comma-separated field names or a set of names (None = all)
+    """
+    if isinstance(fields, str):
+        fields = parse_fields(fields)
+    if not fields:
+        return data
+    if isinstance(data, dict):
+        return {k: v for k, v in data.items() if k in fields}
+    if isinstance(data, list):
+        return [
+            {k: v for k, v in item.items() if k in fields} if isinstance(item, dict) else item
+            for item in data
+        ]
+    return data
+
+
+def accepts_encoding(accept_encoding, encoding):
+    """True if an Accept-Encoding header allows the encoding (q=0 means refused)."""
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        if name.strip().lower() != encoding:
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+class CompressionMiddleware:
+    """
+    Compress responses above a size threshold: brotli when the client accepts
+    it and the brotli package is installed, gzip otherwise.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESS_MIN_SIZE, gzip_level=GZIP_LEVEL, brotli_quality=BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.brotli_quality = brotli_quality
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and brotli is not None:
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            if accepts_encoding(accept_encoding, "br"):
+                await _BrotliResponder(self.app, self.minimum_size, self.brotli_quality)(scope, receive, send)
+                return
+        await self.gzip(scope, receive, send)
+
+
+class _BrotliResponder:
+    """Brotli-compresses complete (non-streamed) responses."""
+
+    def __init__(self, app, minimum_size, quality):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.quality = quality
+        self.start_message = None
+        self.passthrough = False
+
+    async def __call__(self, scope, receive, send):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                self.start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                self.passthrough = (
+                    "content-encoding" in headers
+                    or any(content_type.startswith(t) for t in _SKIP_CONTENT_TYPES)
+                )
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if self.start_message is not None:
+                start, self.start_message = self.start_message, None
+                body = message.get("body", b"")
+                streaming = message.get("more_body", False)
+                if self.passthrough or streaming or len(body) < self.minimum_size:
+                    # Streams and small bodies go out as they are
+                    self.passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressed = brotli.compress(body, quality=self.quality)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = "br"
+                headers["Content-Length"] = str(len(compressed))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def dumps(data):
+    """Serialize to a JSON string (orjson when available), used for NDJSON/SSE lines."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, default=str)
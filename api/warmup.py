@@ -0,0 +1,99 @@
+"""
+Startup warm-up for the Volleybox API.
+
+On startup the API loads recently scraped detail records from the store
+into the response cache (so the first requests for hot entities are cache
+hits), launches the browser and passes Cloudflare once, and optionally
+pre-scrapes a configured list of URLs in the background. Progress is kept
+in a Readiness object that / reports to load balancers.
+"""
+
+import os
+import time
+
+from scraper.urls import entity_key
+
+from api.cache import cache_key
+
+# Detail endpoint and the keys that only a profile scrape (not a list crawl) produces
+DETAIL_ENDPOINTS = {
+    "teams": ("teams/detail", ("roster", "coach", "arena", "founded")),
+    "players": ("players/detail", ("birth_date", "height", "career")),
+    "tournaments": ("tournaments/detail", ("standings", "teams")),
+}
+
+# Hot records loaded per entity type
+WARM_LIMIT = int(os.environ.get("VOLLEYBOX_WARM_LIMIT", 200))
+
+
+class Readiness:
+    """Startup state of the API instance."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started = time.time()
+        self.browser = "pending" if enabled else "skipped"
+        self.cache_entries = 0
+        self.prewarm = {"total": 0, "done": 0, "failed": 0}
+
+    @property
+    def ready(self):
+        return self.browser in ("ready", "skipped")
+
+    def to_dict(self):
+        return {
+            "ready": self.ready,
+            "browser": self.browser,
+            "cache_entries": self.cache_entries,
+            "prewarm": self.prewarm,
+            "uptime": round(time.time() - self.started, 1),
+        }
+
+
+def load_hot_entries(store, cache, limit=WARM_LIMIT):
+    """
+    Put the most recently scraped detail records into the response cache.
+    Entries keep their scrape time as age, so old ones are served as stale and
+    refreshed in the background instead of counting as fresh.
+
+    Returns:
+        Number of cache entries loaded
+    """
+    loaded = 0
+    now = time.time()
+    for entity, (endpoint, detail_keys) in DETAIL_ENDPOINTS.items():
+        max_age = cache.ttl_for(endpoint) + cache.stale_window
+        for record in store.recent(entity, limit):
+            updated_at = record.pop("updated_at", 0)
+            url = record.get("url")
+            if not url or now - updated_at > max_age:
+                continue
+            if not any(key in record for key in detail_keys):
+                continue
+            cache.put(cache_key(endpoint, {"url": url}), endpoint, record, created=updated_at)
+            loaded += 1
+    return loaded
+
+
+def prewarm_targets(value=None):
+    """
+    Parse the pre-scrape list: comma/newline separated URLs from
+    VOLLEYBOX_PREWARM, or a file named by VOLLEYBOX_PREWARM_FILE.
+
+    Returns:
+        List of (endpoint, url) for team, player and tournament URLs
+    """
+    if value is None:
+        value = os.environ.get("VOLLEYBOX_PREWARM", "")
+        path = os.environ.get("VOLLEYBOX_PREWARM_FILE")
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                value += "\n" + f.read()
+
+    targets = []
+    for url in value.replace(",", "\n").splitlines():
+        url = url.strip()
+        key = entity_key(url)
+        if url and key is not None:
+            targets.append((DETAIL_ENDPOINTS[f"{key.type}s"][0], url))
+    return targets
@@ -0,0 +1,95 @@
+"""
+Checks for the streaming writers (JSON/JSONL and Excel) in scraper.exporter.
+
+Writes small exports into a temporary directory and verifies the files,
+failing loudly on a mismatch.
+
+Kullanım:
+    python check_export.py
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+from openpyxl import load_workbook
+
+from scraper.exporter import ExcelStreamWriter, StreamWriter
+
+RECORDS = [{"match_id": i, "home_team": "Smaç SK", "away_team": "Blok SK"} for i in range(3)]
+
+
+def _read(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def check_close_twice(tmp):
+    """A second close() (or close() after the with block) must not truncate the export."""
+    for format, compression in (("json", None), ("jsonl", None), ("jsonl", "gzip")):
+        with StreamWriter(os.path.join(tmp, f"twice-{format}-{compression}"), format, compression) as writer:
+            writer.write_many(RECORDS)
+        before = _read(writer.filename)
+        writer.close()
+        writer.close()
+        after = _read(writer.filename)
+        assert after == before, f"{writer.filename}: second close changed the file"
+
+        if format == "json":
+            records = json.loads(after)
+        else:
+            records = [json.loads(line) for line in after.splitlines()]
+        assert records == RECORDS, f"{writer.filename}: wrote {records!r}"
+
+        try:
+            writer.write(RECORDS[0])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{writer.filename}: write after close() was accepted")
+
+
+def check_close_unopened(tmp):
+    """Closing a writer that never wrote still leaves a valid, empty file."""
+    writer = StreamWriter(os.path.join(tmp, "empty"), format="json")
+    writer.close()
+    writer.close()
+    assert json.loads(_read(writer.filename)) == [], f"{writer.filename}: not an empty JSON array"
+
+
+def check_excel_late_columns(tmp):
+    """A column that first appears mid-stream joins the header instead of forking a sheet."""
+    records = RECORDS + [dict(RECORDS[0], match_id=3, venue="Spor Salonu")] + RECORDS
+    with ExcelStreamWriter(os.path.join(tmp, "late.xlsx"), max_rows=100) as writer:
+        writer.write_many(records)
+    writer.close()
+
+    workbook = load_workbook(writer.filename, read_only=True)
+    assert workbook.sheetnames == ["data"], f"sheets: {workbook.sheetnames}"
+    header, *rows = workbook["data"].iter_rows(values_only=True)
+    assert header == ("match_id", "home_team", "away_team", "venue"), f"header: {header}"
+    # Read-only mode trims trailing empty cells, so pad rows back to the header
+    written = [dict(zip(header, row + (None,) * (len(header) - len(row)))) for row in rows]
+    assert written == [dict(dict.fromkeys(header), **r) for r in records], f"rows: {written}"
+
+    # Rolling over at the row limit repeats the full header
+    with ExcelStreamWriter(os.path.join(tmp, "rollover.xlsx"), max_rows=4) as writer:
+        writer.write_many(records)
+    workbook = load_workbook(writer.filename, read_only=True)
+    assert workbook.sheetnames == ["data", "data (2)", "data (3)"], f"sheets: {workbook.sheetnames}"
+    for ws in workbook:
+        assert next(ws.iter_rows(values_only=True)) == header, f"{ws.title}: header mismatch"
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for check in (check_close_twice, check_close_unopened, check_excel_late_columns):
+            check(tmp)
+            print(f"✓ {check.__name__}")
+    print("Export checks OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Checks for the result cache of scraper.service.ScraperService.
+
+Runs the service in-process with stand-in operations (no browser) and
+verifies that the cache stays bounded, evicts the least recently used
+result first and drops expired results.
+
+Kullanım:
+    python check_service.py
+"""
+
+import time
+
+import scraper.service as service
+
+calls = []
+
+
+def _profile(scraper, url, deadline=None):
+    calls.append(url)
+    return {"url": url}
+
+
+def check_lru_eviction():
+    svc = service.ScraperService(scraper=None, max_cache_entries=3)
+    for i in range(3):
+        svc.call("team_profile", [f"/tr/team-t{i}"])
+    svc.call("team_profile", ["/tr/team-t0"])            # t0 becomes most recently used
+    svc.call("team_profile", ["/tr/team-t3"])            # evicts t1
+    assert len(svc._cache) == 3, f"cache holds {len(svc._cache)} entries"
+    assert svc.stats["evictions"] == 1, svc.stats
+
+    calls.clear()
+    svc.call("team_profile", ["/tr/team-t0"])
+    assert calls == [], "t0 was evicted instead of the least recently used entry"
+    svc.call("team_profile", ["/tr/team-t1"])
+    assert calls == ["/tr/team-t1"], "t1 should have been evicted and re-scraped"
+
+
+def check_expiry():
+    ttls = dict(service.SERVICE_CACHE_TTLS)
+    service.SERVICE_CACHE_TTLS["team_profile"] = 0.05
+    try:
+        svc = service.ScraperService(scraper=None)
+        svc.call("team_profile", ["/tr/team-t1"])
+        svc.call("team_profile", ["/tr/team-t2"])
+        time.sleep(0.1)
+
+        calls.clear()
+        svc.call("team_profile", ["/tr/team-t1"])           # expired on read: scraped again
+        assert calls == ["/tr/team-t1"], "an expired result was served"
+        assert len(svc._cache) == 1, "expired entries were not dropped on write"
+    finally:
+        service.SERVICE_CACHE_TTLS.clear()
+        service.SERVICE_CACHE_TTLS.update(ttls)
+
+
+def main():
+    service.OPERATIONS["team_profile"] = _profile
+    for check in (check_lru_eviction, check_expiry):
+        check()
+        print(f"✓ {check.__name__}")
+    print("Service checks OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Round-trip check for scraper.store.VolleyboxStore.
+
+Upserts one sample record of every keyed entity (KEY_COLUMNS) into a
+temporary database and reads it back through get(), recent() and, where
+supported, page(), failing loudly if a record cannot be read back.
+
+Kullanım:
+    python check_store.py
+"""
+
+import os
+import tempfile
+
+from scraper.store import KEY_COLUMNS, LIST_FILTERS, VolleyboxStore
+
+BASE = "https://women.volleybox.net/tr"
+
+# Sample record and its key per entity table
+SAMPLES = {
+    "players": (2001, {
+        "name": "Ada Yılmaz", "url": f"{BASE}/ada-yilmaz-p2001",
+        "position": "Pasör", "nationality": "Türkiye", "height": "182 cm",
+    }),
+    "teams": (2309, {
+        "name": "Smaç SK", "url": f"{BASE}/smac-sk-t2309", "country": "Türkiye", "league": "2. Lig",
+    }),
+    "tournaments": ("o38677", {
+        "name": "Kadınlar 2. Lig", "url": f"{BASE}/kadinlar-2-lig-2024-25-o38677",
+        "season": "2024/25", "country": "Türkiye",
+    }),
+    "matches": (5, {
+        "match_id": 5, "tournament": "Kadınlar 2. Lig", "tournament_id": "o38677",
+        "round": "1. Hafta", "date_timestamp": 1727000000, "date_str": "22.09.2024",
+        "home_team": "Smaç SK", "away_team": "Blok SK", "home_sets": "3", "away_sets": "1",
+        "venue": "Spor Salonu",
+    }),
+}
+
+
+def check(store, entity, key, record):
+    assert store.upsert(entity, [record]) == 1, f"{entity}: upsert skipped the sample"
+
+    stored = store.get(entity, key)
+    assert stored is not None, f"{entity}: get({key!r}) found nothing"
+    assert stored.get("name", stored.get("home_team")) == record.get("name", record.get("home_team")), \
+        f"{entity}: get({key!r}) returned {stored!r}"
+    assert stored["updated_at"] > 0, f"{entity}: missing updated_at"
+
+    recent = store.recent(entity)
+    assert len(recent) == 1 and recent[0] == stored, f"{entity}: recent() returned {recent!r}"
+
+    if entity in LIST_FILTERS:
+        page, next_after = store.page(entity)
+        assert page == [stored] and next_after is None, f"{entity}: page() returned {page!r}"
+
+    if "url" in record:
+        assert store.get_by_url(record["url"]) == stored, f"{entity}: get_by_url() mismatch"
+
+
+def main():
+    missing = set(KEY_COLUMNS) - set(SAMPLES)
+    assert not missing, f"No sample record for: {', '.join(sorted(missing))}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with VolleyboxStore(os.path.join(tmp, "check.db")) as store:
+            for entity, (key, record) in SAMPLES.items():
+                check(store, entity, key, record)
+                print(f"✓ {entity}")
+    print("Store round-trip OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,11 +12,16 @@ Kullanım:
     python main.py tournaments --list                   # Turnuva listesi
     python main.py tournaments --url <url>              # Turnuva detayı
     python main.py transfers                            # Transferler
-    python main.py search <arama terimi>                # Sitede arama
+    python main.py transfers --incremental              # Sadece yeni transferler (transfer_log.jsonl'e eklenir)
+    python main.py search <arama terimi>                # Arama (önce yerel veritabanı, yoksa site)
+    python main.py search <arama terimi> --live         # Doğrudan sitede arama
 
 Ortak opsiyonlar:
-    --format json|csv|excel                             # Export formatı (default: json)
+    --format json|jsonl|csv|excel|parquet|arrow|db      # Export formatı (default: json, db = SQLite)
     --output <dosya>                                    # Çıktı dosya adı
+    --stream                                            # Kayıtları çekildikçe diske yaz (json/jsonl/excel)
+    --compress gzip|zstd                                # --stream çıktısını sıkıştır
+    --dataset <klasör>                                  # Bölümlenmiş veri seti (entity/tournament=/season=; parquet|jsonl)
     --lang tr|en                                        # Site dili (default: tr)
     --pages <n>                                         # Sayfa limiti (default: 5)
     --limit <n>                                         # Detay limiti (default: 10)
@@ -28,63 +33,39 @@ from rich.console import Console
 from rich.panel import Panel
 
 from scraper.core import VolleyboxScraper
-from scraper.players import scrape_player_list, scrape_player_profile, scrape_players_detail
-from scraper.teams import scrape_team_list, scrape_team_profile, scrape_teams_detail
-from scraper.tournaments import scrape_tournament_list, scrape_tournament_detail
-from scraper.transfers import scrape_transfers
-from scraper.exporter import export_data, print_summary
+from scraper.players import scrape_player_list, scrape_player_profile, scrape_players_detail, iter_players_detail
+from scraper.teams import scrape_team_list, scrape_team_profile, scrape_teams_detail, iter_teams_detail
+from scraper.tournaments import scrape_tournament_list, scrape_tournament_detail, iter_tournament_matches
+from scraper.transfers import scrape_transfers, scrape_new_transfers, TRANSFER_STATE_FILE, TRANSFER_LOG_FILE
+from scraper.search import search_site, search_local
+from scraper.exporter import export_data, print_summary, stream_export
+from scraper.dataset import write_partition, season_slug
+from scraper.urls import entity_id
 
 console = Console()
 
 
-def search_site(scraper, query):
-    """Search the site using the search bar."""
-    console.print(f"[bold cyan]🔍 Aranıyor: {query}[/bold cyan]")
-
-    url = f"https://women.volleybox.net/{scraper.lang}/search"
-    soup = scraper.get_page(url, params={"q": query})
-
-    if not soup:
-        return []
-
-    results = []
-
-    # Find all result links
-    for link in soup.select("a"):
-        href = link.get("href", "")
-        text = link.get_text(strip=True)
-
-        if not text or len(text) < 2:
-            continue
-
-        import re
-        result_type = None
-        if re.search(r'-p\d+$', href):
-            result_type = "player"
-        elif re.search(r'-t\d+$', href):
-            result_type = "team"
-        elif re.search(r'-c\d+$', href):
-            result_type = "tournament"
-        else:
-            continue
-
-        full_url = href if href.startswith("http") else f"https://women.volleybox.net{href}"
-        results.append({
-            "name": text,
-            "type": result_type,
-            "url": full_url,
-        })
-
-    # Deduplicate
-    seen = set()
-    unique = []
-    for r in results:
-        if r["url"] not in seen:
-            seen.add(r["url"])
-            unique.append(r)
-
-    console.print(f"[bold green]✓ {len(unique)} sonuç bulundu[/bold green]")
-    return unique
+def dataset_partition(args, data):
+    """
+    Decide the dataset entity folder and partition for a command's output.
+    Single-entity scrapes get their own partition so a re-scrape only
+    rewrites that entity; list crawls are unpartitioned. The two go to
+    different entity folders (e.g. 'players' vs 'player_profiles'), so
+    reading an entity never mixes a list with the profiles it contains.
+    """
+    url_id = entity_id(args.url) if getattr(args, "url", None) else None
+
+    if args.command == "tournaments" and url_id:
+        season = season_slug(data[0].get("tournament" if args.matches else "name", ""))
+        partition = {"tournament": url_id}
+        if season:
+            partition["season"] = season
+        return ("matches" if args.matches else "tournament_details"), partition
+    if args.command == "teams" and url_id:
+        return ("rosters" if args.roster else "team_profiles"), {"team": url_id}
+    if args.command == "players" and url_id:
+        return "player_profiles", {"player": url_id}
+    return args.command, None
 
 
 def main():
@@ -117,15 +98,25 @@ def main():
 
     # --- Transfers ---
     transfer_parser = subparsers.add_parser("transfers", help="Transfer verileri")
+    transfer_parser.add_argument("--incremental", action="store_true", help="Sadece bilinen son transferden yenileri çek")
+    transfer_parser.add_argument("--state-file", type=str, default=TRANSFER_STATE_FILE, help="Artımlı mod durum dosyası")
+    transfer_parser.add_argument("--log-file", type=str, default=TRANSFER_LOG_FILE, help="Yeni transferlerin eklendiği JSONL dosyası")
 
     # --- Search ---
     search_parser = subparsers.add_parser("search", help="Sitede arama")
     search_parser.add_argument("query", type=str, help="Arama terimi")
+    search_parser.add_argument("--live", action="store_true", help="Yerel dizini atla, doğrudan sitede ara")
 
     # --- Common options ---
     for p in [players_parser, teams_parser, tourn_parser, transfer_parser, search_parser]:
-        p.add_argument("--format", choices=["json", "csv", "excel"], default="json", help="Export formatı")
+        p.add_argument(
+            "--format", choices=["json", "jsonl", "csv", "excel", "parquet", "arrow", "db"],
+            help="Export formatı (default: json; --dataset ile parquet)",
+        )
         p.add_argument("--output", "-o", type=str, help="Çıktı dosya adı")
+        p.add_argument("--stream", action="store_true", help="Kayıtları çekildikçe diske yaz (sabit bellek)")
+        p.add_argument("--compress", choices=["gzip", "zstd"], help="--stream çıktısı için sıkıştırma (json/jsonl)")
+        p.add_argument("--dataset", type=str, help="Bölümlenmiş veri seti klasörü (tek dosya yerine)")
         p.add_argument("--lang", choices=["tr", "en"], default="tr", help="Site dili")
         p.add_argument("--pages", type=int, default=5, help="Sayfa limiti")
         p.add_argument("--limit", type=int, default=10, help="Detay çekilecek kayıt limiti")
@@ -136,6 +127,22 @@ def main():
         parser.print_help()
         sys.exit(0)
 
+    if args.dataset:
+        if args.format not in (None, "parquet", "jsonl"):
+            parser.error("--dataset sadece parquet ve jsonl formatlarıyla kullanılabilir")
+        if args.output:
+            parser.error("--dataset ve --output birlikte kullanılamaz")
+    else:
+        args.format = args.format or "json"
+    if args.stream and args.format not in ("json", "jsonl", "excel"):
+        parser.error("--stream sadece json, jsonl ve excel formatlarıyla kullanılabilir")
+    if args.stream and args.dataset:
+        parser.error("--stream ve --dataset birlikte kullanılamaz")
+    if args.compress and not args.stream:
+        parser.error("--compress sadece --stream ile kullanılabilir")
+    if args.compress and args.format == "excel":
+        parser.error("--compress sadece json ve jsonl formatlarıyla kullanılabilir")
+
     # Banner
     console.print(Panel.fit(
         "[bold white]🏐 Volleybox Scraper[/bold white]\n"
@@ -143,6 +150,14 @@ def main():
         border_style="bright_magenta",
     ))
 
+    # Searches are answered from the local store when possible (no browser needed)
+    if args.command == "search" and not args.live:
+        data = search_local(args.query)
+        if data:
+            console.print(f"[bold green]✓ {len(data)} sonuç yerel veritabanından bulundu[/bold green]")
+            write_output(args, data)
+            return
+
     # Create scraper with context manager for proper cleanup
     with VolleyboxScraper(lang=args.lang) as scraper:
         data = []
@@ -155,7 +170,10 @@ def main():
             elif args.list:
                 data = scrape_player_list(scraper, page_limit=args.pages)
                 if args.detail and data:
-                    data = scrape_players_detail(scraper, data, limit=args.limit)
+                    if args.stream:
+                        data = iter_players_detail(scraper, data, limit=args.limit)
+                    else:
+                        data = scrape_players_detail(scraper, data, limit=args.limit)
             else:
                 console.print("[yellow]--list veya --url belirtin.[/yellow]")
                 sys.exit(1)
@@ -180,7 +198,10 @@ def main():
             elif args.list:
                 data = scrape_team_list(scraper, page_limit=args.pages)
                 if args.detail and data:
-                    data = scrape_teams_detail(scraper, data, limit=args.limit)
+                    if args.stream:
+                        data = iter_teams_detail(scraper, data, limit=args.limit)
+                    else:
+                        data = scrape_teams_detail(scraper, data, limit=args.limit)
             else:
                 console.print("[yellow]--list veya --url belirtin.[/yellow]")
                 sys.exit(1)
@@ -188,8 +209,11 @@ def main():
         elif args.command == "tournaments":
             if args.url:
                 if args.matches:
-                    from scraper.tournaments import scrape_tournament_matches
-                    data = scrape_tournament_matches(scraper, args.url)
+                    if args.stream:
+                        data = iter_tournament_matches(scraper, args.url)
+                    else:
+                        from scraper.tournaments import scrape_tournament_matches
+                        data = scrape_tournament_matches(scraper, args.url)
                 else:
                     result = scrape_tournament_detail(scraper, args.url)
                     data = [result] if result else []
@@ -200,16 +224,38 @@ def main():
                 sys.exit(1)
 
         elif args.command == "transfers":
-            data = scrape_transfers(scraper, page_limit=args.pages)
+            if args.incremental:
+                data = scrape_new_transfers(
+                    scraper, page_limit=args.pages,
+                    state_file=args.state_file, log_file=args.log_file,
+                )
+            else:
+                data = scrape_transfers(scraper, page_limit=args.pages)
 
         elif args.command == "search":
             data = search_site(scraper, args.query)
 
+        if args.stream:
+            # Generators must be consumed while the browser is still open
+            output = args.output or f"volleybox_{args.command}"
+            count = stream_export(data, output, format=args.format, compression=args.compress)
+            if not count:
+                console.print("[yellow]⚠ Veri bulunamadı.[/yellow]")
+            return
+
     # --- Output ---
+    write_output(args, data)
+
+
+def write_output(args, data):
+    """Print a summary and export the command's results."""
     if data:
         print_summary(data, title=f"{args.command.upper()} Sonuçları")
 
-        if args.output:
+        if args.dataset:
+            entity, partition = dataset_partition(args, data)
+            write_partition(args.dataset, entity, data, partition=partition, format=args.format)
+        elif args.output:
             export_data(data, args.output, format=args.format)
         else:
             default_name = f"volleybox_{args.command}"
@@ -0,0 +1,432 @@
+"""
+Standings and aggregation engine for scraped match data.
+Builds the league table of every team at once from a matches frame with
+vectorized pandas/NumPy operations (no per-row loops), under volleyball
+scoring rules, and reconciles it with the standings scraped by
+scrape_tournament_detail. Also serves the dashboard: MatchExplorer filter
+indexes and pre-aggregated chart frames.
+
+Points: a 3-0 or 3-1 win is worth 3 points (loser 0), a 3-2 win 2 points
+(loser 1).
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .models import SETS_TO_WIN, StandingRow
+from .search import fold
+
+# Columns of a standings table, in display order
+STANDING_COLUMNS = [
+    "rank", "team", "played", "wins", "losses",
+    "sets_won", "sets_lost", "set_ratio", "points",
+]
+
+# Columns compared between computed and scraped standings
+RECONCILE_COLUMNS = ["points", "wins", "losses", "sets_won", "sets_lost"]
+
+_DIGIT_RUN_RE = re.compile(r"(\d+)")
+# Round names that are groups/pools rather than weeks ("Group B", "Grup 2", "Pool A")
+_GROUP_NAME_RE = re.compile(r"\b(group|grup|gruppe|groupe|pool|havuz)\b", re.IGNORECASE)
+_NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+def match_frame(matches):
+    """
+    Matches (list of dicts or DataFrame) as a frame with numeric set columns.
+
+    Returns:
+        DataFrame with at least home_team, away_team, home_sets, away_sets
+    """
+    df = matches.copy() if isinstance(matches, pd.DataFrame) else pd.DataFrame(list(matches))
+    for column in ("home_team", "away_team"):
+        if column not in df.columns:
+            df[column] = ""
+    for column in ("home_sets", "away_sets"):
+        df[column] = pd.to_numeric(df[column], errors="coerce") if column in df.columns else np.nan
+    return df
+
+
+def played_mask(df):
+    """Boolean Series: matches with a final result (one side reached SETS_TO_WIN)."""
+    home, away = df["home_sets"], df["away_sets"]
+    return home.notna() & away.notna() & (np.maximum(home, away) == SETS_TO_WIN) & (home != away)
+
+
+def match_points(winner_sets, loser_sets):
+    """
+    League points for each side, vectorized.
+
+    Returns:
+        (winner_points, loser_points) arrays
+    """
+    close = np.asarray(loser_sets) >= SETS_TO_WIN - 1
+    return np.where(close, 2, 3), np.where(close, 1, 0)
+
+
+def compute_standings(matches, group_by=None):
+    """
+    League table for all teams from their match results.
+
+    Args:
+        matches: List of match dicts or a DataFrame (scrape_tournament_matches output)
+        group_by: Optional match column holding the group (e.g. 'round' for
+            'Group 1'...); teams are then ranked within each group
+
+    Returns:
+        DataFrame with STANDING_COLUMNS (plus 'group'), sorted by group and
+        rank: points, then wins, then set ratio. Teams without a played match
+        are included with zeros.
+    """
+    df = match_frame(matches)
+    played = df[played_mask(df)]
+
+    home_sets = played["home_sets"].to_numpy(dtype=np.int64)
+    away_sets = played["away_sets"].to_numpy(dtype=np.int64)
+    home_won = home_sets > away_sets
+    winner_points, loser_points = match_points(np.maximum(home_sets, away_sets), np.minimum(home_sets, away_sets))
+
+    # One row per team per match: home sides first, then away sides
+    sides = pd.DataFrame({
+        "team": np.concatenate([played["home_team"].to_numpy(), played["away_team"].to_numpy()]),
+        "wins": np.concatenate([home_won, ~home_won]).astype(np.int64),
+        "sets_won": np.concatenate([home_sets, away_sets]),
+        "sets_lost": np.concatenate([away_sets, home_sets]),
+        "points": np.concatenate([
+            np.where(home_won, winner_points, loser_points),
+            np.where(home_won, loser_points, winner_points),
+        ]),
+    })
+    keys = ["team"]
+    if group_by:
+        group = played[group_by].to_numpy() if group_by in played.columns else np.full(len(played), "")
+        sides.insert(0, "group", np.concatenate([group, group]))
+        keys = ["group", "team"]
+
+    table = sides.groupby(keys, sort=False).agg(
+        played=("wins", "size"),
+        wins=("wins", "sum"),
+        sets_won=("sets_won", "sum"),
+        sets_lost=("sets_lost", "sum"),
+        points=("points", "sum"),
+    )
+    table = table.reindex(_all_teams(df, group_by, keys), fill_value=0).reset_index()
+
+    table["losses"] = table["played"] - table["wins"]
+    sets_lost = table["sets_lost"].to_numpy(dtype=float)
+    sets_won = table["sets_won"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table["set_ratio"] = np.where(sets_lost > 0, sets_won / sets_lost, np.where(sets_won > 0, np.inf, 0.0))
+
+    sort_keys = (["group"] if group_by else []) + ["points", "wins", "set_ratio", "team"]
+    ascending = ([True] if group_by else []) + [False, False, False, True]
+    table = table.sort_values(sort_keys, ascending=ascending, kind="stable", ignore_index=True)
+    table["rank"] = table.groupby("group").cumcount() + 1 if group_by else np.arange(1, len(table) + 1)
+
+    columns = (["group"] if group_by else []) + STANDING_COLUMNS
+    return table[columns]
+
+
+def _all_teams(df, group_by, keys):
+    """Index of every (group,) team appearing in the matches, played or not."""
+    teams = pd.DataFrame({
+        "team": np.concatenate([df["home_team"].to_numpy(), df["away_team"].to_numpy()]),
+    })
+    if group_by:
+        group = df[group_by].to_numpy() if group_by in df.columns else np.full(len(df), "")
+        teams.insert(0, "group", np.concatenate([group, group]))
+    teams = teams[teams["team"].notna() & (teams["team"] != "")].drop_duplicates()
+    return pd.MultiIndex.from_frame(teams) if group_by else pd.Index(teams["team"], name="team")
+
+
+def team_row(standings, team):
+    """One team's standings row as a dict (None if the team is not in the table)."""
+    rows = standings[standings["team"] == team]
+    if rows.empty:
+        return None
+    return rows.iloc[0].to_dict()
+
+
+def standings_records(standings):
+    """Standings or reconciliation frame → JSON-safe list of dicts (NaN and an unbeaten set ratio become None)."""
+    table = standings.copy()
+    if "set_ratio" in table.columns:
+        table["set_ratio"] = table["set_ratio"].replace(np.inf, np.nan).round(3)
+    table = table.astype(object).where(table.notna(), None)
+    return table.to_dict("records")
+
+
+def scraped_standings_frame(rows):
+    """
+    Scraped standings (Turkish keys from scrape_tournament_detail, or
+    VolleyboxStore.standings rows) as a frame with numeric columns.
+    """
+    records = []
+    for row in rows:
+        if "group_name" in row:
+            row = {**row, "group": row["group_name"]}
+        records.append(StandingRow.from_dict(row).to_dict())
+    columns = ["group", "rank", "team", "team_url"] + RECONCILE_COLUMNS
+    frame = pd.DataFrame.from_records(records, columns=columns)
+    for column in ["rank"] + RECONCILE_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
+
+
+def reconcile_standings(computed, scraped):
+    """
+    Compare computed standings with the scraped table, matched by folded team name.
+
+    Args:
+        computed: compute_standings() frame
+        scraped: Scraped standing rows or a scraped_standings_frame()
+
+    Returns:
+        DataFrame with one row per team: the computed and scraped values of
+        RECONCILE_COLUMNS ('<col>' and 'scraped_<col>'), their differences
+        ('diff_<col>', computed - scraped) and 'status': 'ok', 'mismatch',
+        'only_computed' or 'only_scraped'
+    """
+    if not isinstance(scraped, pd.DataFrame):
+        scraped = scraped_standings_frame(scraped)
+
+    left = computed[["team"] + RECONCILE_COLUMNS].copy()
+    left["key"] = left["team"].map(fold)
+    right = scraped[["team"] + RECONCILE_COLUMNS].rename(
+        columns={c: f"scraped_{c}" for c in ["team"] + RECONCILE_COLUMNS}
+    )
+    right["key"] = right["scraped_team"].map(fold)
+    # A team is listed once per table; keep the first row for duplicate names
+    left = left.drop_duplicates("key")
+    right = right.drop_duplicates("key")
+
+    merged = left.merge(right, on="key", how="outer", indicator=True)
+    merged["team"] = merged["team"].fillna(merged["scraped_team"])
+
+    diffs = []
+    for column in RECONCILE_COLUMNS:
+        diff = merged[column] - merged[f"scraped_{column}"]
+        merged[f"diff_{column}"] = diff
+        diffs.append(diff.fillna(0).ne(0).to_numpy())
+    any_diff = np.logical_or.reduce(diffs)
+
+    merged["status"] = np.select(
+        [merged["_merge"] == "left_only", merged["_merge"] == "right_only", any_diff],
+        ["only_computed", "only_scraped", "mismatch"],
+        default="ok",
+    )
+    columns = ["team", "status"] + [
+        name for column in RECONCILE_COLUMNS for name in (column, f"scraped_{column}", f"diff_{column}")
+    ]
+    merged = merged[columns].astype({name: "Int64" for name in columns[2:]})
+    return merged.sort_values(["status", "team"], ignore_index=True)
+
+
+def looks_like_groups(round_names):
+    """
+    Whether a tournament's round names are groups ('Group 1', 'Grup B') rather
+    than weeks ('1. Hafta'), i.e. whether standings per round make sense.
+    """
+    names = [str(name) for name in round_names if name]
+    groups = sum(bool(_GROUP_NAME_RE.search(name)) for name in names)
+    # Knockout rounds ('Final') may follow the groups; weeks never carry a group name
+    return bool(names) and groups >= min(2, len(names))
+
+
+def natural_key(text):
+    """Sort key that orders 'Group 2' before 'Group 10'."""
+    return [int(part) if part.isdigit() else part.lower() for part in _DIGIT_RUN_RE.split(str(text))]
+
+
+class MatchExplorer:
+    """
+    Filter index over a matches frame, built once per dataset.
+
+    Teams, rounds and venues are stored as category codes with posting lists
+    (category → sorted row ids), and played/unplayed as boolean bitmaps, so
+    a filter is an intersection of small sorted arrays instead of boolean
+    masks over the whole frame.
+
+    Usage:
+        explorer = MatchExplorer(matches)
+        rows = explorer.filter(team="Smaç SK", played=True)
+        frame = explorer.take(rows)
+    """
+
+    def __init__(self, matches):
+        self.df = match_frame(matches).reset_index(drop=True)
+        n = len(self.df)
+
+        home = self.df["home_team"].fillna("").to_numpy(dtype=object)
+        away = self.df["away_team"].fillna("").to_numpy(dtype=object)
+        self.teams = sorted({name for name in np.concatenate([home, away]) if name})
+        team_index = pd.Index(self.teams)
+        self.home_codes = team_index.get_indexer(home)
+        self.away_codes = team_index.get_indexer(away)
+
+        self.rounds, self.round_codes = self._categories("round")
+        self.venues, self.venue_codes = self._categories("venue")
+
+        rows = np.arange(n)
+        # A team listed on both sides of a row is posted once
+        away_only = self.away_codes != self.home_codes
+        self._team_postings = _postings(
+            np.concatenate([self.home_codes, self.away_codes[away_only]]),
+            np.concatenate([rows, rows[away_only]]),
+            self.teams,
+        )
+        self._round_postings = _postings(self.round_codes, rows, self.rounds)
+        self._venue_postings = _postings(self.venue_codes, rows, self.venues)
+
+        self.played = played_mask(self.df).to_numpy()
+        self.unplayed = ~self.played
+
+    def __len__(self):
+        return len(self.df)
+
+    def _categories(self, column):
+        """Naturally sorted category names of a column and the row codes (-1 = missing)."""
+        if column not in self.df.columns:
+            return [], np.full(len(self.df), -1)
+        values = self.df[column].fillna("").astype(str).to_numpy(dtype=object)
+        names = sorted({value for value in values if value}, key=natural_key)
+        return names, pd.Index(names).get_indexer(values)
+
+    def team_rows(self, team):
+        return self._team_postings.get(team, _NO_ROWS)
+
+    def round_rows(self, round_name):
+        return self._round_postings.get(round_name, _NO_ROWS)
+
+    def venue_rows(self, venue):
+        return self._venue_postings.get(venue, _NO_ROWS)
+
+    def filter(self, team=None, round_name=None, venue=None, played=None):
+        """
+        Row ids matching every given filter (None = no filter).
+
+        Args:
+            team: Team playing home or away
+            round_name: Round/group name
+            venue: Venue name
+            played: True for matches with a result, False for unplayed ones
+
+        Returns:
+            Sorted numpy array of row positions
+        """
+        lists = []
+        if team is not None:
+            lists.append(self.team_rows(team))
+        if round_name is not None:
+            lists.append(self.round_rows(round_name))
+        if venue is not None:
+            lists.append(self.venue_rows(venue))
+
+        if lists:
+            # Intersect the shortest lists first
+            lists.sort(key=len)
+            rows = lists[0]
+            for other in lists[1:]:
+                if not len(rows):
+                    break
+                rows = np.intersect1d(rows, other, assume_unique=True)
+            if played is not None:
+                rows = rows[(self.played if played else self.unplayed)[rows]]
+            return rows
+
+        if played is not None:
+            return np.flatnonzero(self.played if played else self.unplayed)
+        return np.arange(len(self.df))
+
+    def take(self, rows, columns=None):
+        """Frame of the given row ids (optionally only some columns)."""
+        frame = self.df if columns is None else self.df[[c for c in columns if c in self.df.columns]]
+        return frame.take(rows)
+
+    def round_counts(self):
+        """Matches per round as a Series (index = round name), in round order."""
+        return _code_counts(self.round_codes, self.rounds)
+
+    def venue_counts(self):
+        return _code_counts(self.venue_codes, self.venues)
+
+    def home_counts(self):
+        """Home matches per team as a Series (index = team name)."""
+        return _code_counts(self.home_codes, self.teams)
+
+
+def _postings(codes, rows, names):
+    """Posting lists: category name → sorted row ids carrying its code (-1 codes dropped)."""
+    order = np.lexsort((rows, codes))
+    codes, rows = codes[order], rows[order]
+    bounds = np.searchsorted(codes, np.arange(len(names) + 1))
+    return {name: rows[bounds[i]:bounds[i + 1]] for i, name in enumerate(names)}
+
+
+def _code_counts(codes, names):
+    counts = np.bincount(codes[codes >= 0], minlength=len(names))
+    return pd.Series(counts, index=pd.Index(names, dtype=object), dtype=np.int64)
+
+
+# Chart data: small, pre-aggregated frames for the dashboard's Altair charts,
+# so Vega-Lite gets a handful of rows instead of the raw dataset
+
+# Most rows sent to the browser for one chart
+CHART_MAX_ROWS = 50
+
+
+def count_chart_data(counts, limit=CHART_MAX_ROWS, top=True):
+    """
+    Category counts as a two-column chart frame ('label', 'count').
+
+    Args:
+        counts: Series of counts indexed by category (e.g. MatchExplorer.round_counts())
+        limit: Most rows to return
+        top: Keep the largest counts (sorted descending); False keeps the given order
+
+    Returns:
+        DataFrame with at most limit rows, zero counts dropped
+    """
+    counts = counts[counts > 0]
+    if top:
+        counts = counts.sort_values(ascending=False, kind="stable")
+    counts = counts.head(limit)
+    return pd.DataFrame({"label": counts.index.astype(str), "count": counts.to_numpy(dtype=np.int64)})
+
+
+def roster_chart_data(roster, limit=CHART_MAX_ROWS):
+    """
+    Height bars and position counts of a team roster.
+
+    Args:
+        roster: Roster rows from scrape_team_profile (dicts or a DataFrame)
+        limit: Most players in the height chart (tallest first)
+
+    Returns:
+        (heights, positions): heights has 'player_name', 'height', 'position'
+        for players with a numeric height; positions is a count_chart_data() frame
+    """
+    df = roster.copy() if isinstance(roster, pd.DataFrame) else pd.DataFrame(list(roster))
+    for column in ("player_name", "height", "position"):
+        if column not in df.columns:
+            df[column] = None
+
+    height = pd.to_numeric(df["height"].astype(str).str.extract(r"(\d+)", expand=False), errors="coerce")
+    heights = (
+        pd.DataFrame({"player_name": df["player_name"], "height": height, "position": df["position"].fillna("")})
+        .dropna(subset=["height"])
+        .nlargest(limit, "height", keep="first")
+        .reset_index(drop=True)
+    )
+    heights["height"] = heights["height"].astype(np.int64)
+
+    positions = count_chart_data(df["position"].replace("", np.nan).dropna().value_counts(sort=False), limit)
+    return heights, positions
+
+
+def win_loss_chart_data(wins, losses, labels=("wins", "losses")):
+    """Win/loss donut data ('label', 'count'); empty frame when no match was decided."""
+    counts = pd.Series([wins, losses], index=list(labels), dtype=np.int64)
+    return count_chart_data(counts, top=False)
@@ -5,20 +5,85 @@ Uses a persistent user data directory to maintain session and improve Cloudflare
 """
 
 import os
+import math
 import time
 import random
+import threading
 from bs4 import BeautifulSoup
 from DrissionPage import ChromiumPage, ChromiumOptions
 from rich.console import Console
 
+from .urls import BASE_URL, absolute_url
+
 console = Console()
 
-BASE_URL = "https://women.volleybox.net"
 DEFAULT_LANG = "tr"
 # Persistent user data directory
 USER_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "browser_data")
 
 
+class ScrapeCancelled(Exception):
+    """Raised inside a scrape when its deadline passes or it is cancelled."""
+
+
+class Deadline:
+    """
+    Time budget for one scrape, checked cooperatively between navigation
+    steps and waits. cancel() ends it early from another thread; sleeps
+    taken through pause() wake up immediately.
+
+    Usage:
+        deadline = Deadline(30)
+        team = scrape_team_profile(scraper, url, deadline=deadline)
+    """
+
+    def __init__(self, seconds=None):
+        self.expires = time.monotonic() + seconds if seconds is not None else math.inf
+        self._cancelled = threading.Event()
+
+    def remaining(self):
+        """Seconds left (0 once cancelled, inf without a time limit)."""
+        if self._cancelled.is_set():
+            return 0.0
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def extend(self, other):
+        """Keep running until the later of the two deadlines (shared scrapes)."""
+        self.expires = max(self.expires, other.expires)
+
+    def check(self):
+        """Raise ScrapeCancelled if the deadline has passed."""
+        if self.expired:
+            raise ScrapeCancelled("Cancelled" if self._cancelled.is_set() else "Deadline exceeded")
+
+    def wait(self, seconds):
+        """Sleep up to `seconds`, raising ScrapeCancelled if the deadline ends first."""
+        self.check()
+        self._cancelled.wait(min(seconds, self.remaining()))
+        self.check()
+
+
+def pause(seconds, deadline=None):
+    """time.sleep that honours an optional Deadline."""
+    if deadline is None:
+        time.sleep(seconds)
+    else:
+        deadline.wait(seconds)
+
+
+def check_deadline(deadline=None):
+    """Cancellation point between scrape steps (no-op without a deadline)."""
+    if deadline is not None:
+        deadline.check()
+
+
 class VolleyboxScraper:
     """Main scraper engine for women.volleybox.net with Cloudflare bypass."""
 
@@ -111,7 +176,7 @@ class VolleyboxScraper:
             
         return False
 
-    def _wait_for_cloudflare(self, timeout=120):
+    def _wait_for_cloudflare(self, timeout=120, deadline=None):
         """
         Wait for Cloudflare challenge to resolve. 
         Prompts user if needed.
@@ -130,7 +195,7 @@ class VolleyboxScraper:
             if not self._is_cloudflare_page(page.html or ""):
                 console.print("  [green]✓ Cloudflare geçildi![/green]")
                 return True
-            time.sleep(1)
+            pause(1, deadline)
 
         # Prompt user interaction
         console.print("[bold yellow]⚠ Lütfen açılan pencerede Cloudflare doğrulamasını tamamlayın![/bold yellow]")
@@ -139,14 +204,38 @@ class VolleyboxScraper:
             if not self._is_cloudflare_page(page.html or ""):
                 console.print("  [green]✓ Cloudflare geçildi![/green]")
                 return True
-            time.sleep(2)
+            pause(2, deadline)
         
         return False
 
-    def get_page(self, url, params=None):
-        """Fetch a page."""
+    def _navigate(self, url, deadline=None):
+        """
+        Load a URL in the browser tab, bounded by the deadline.
+
+        Returns:
+            The ChromiumPage
+        """
+        check_deadline(deadline)
+        page = self._get_page()
+        if deadline is not None and deadline.remaining() < math.inf:
+            page.get(url, timeout=deadline.remaining())
+        else:
+            page.get(url)
+        check_deadline(deadline)
+        return page
+
+    def get_page(self, url, params=None, deadline=None):
+        """
+        Fetch a page.
+
+        Args:
+            url: Absolute or site-relative URL
+            params: Optional query parameters
+            deadline: Optional Deadline; rate-limit and Cloudflare waits stop at
+                it and ScrapeCancelled is raised instead of retrying
+        """
         if url.startswith("/"):
-            url = f"{BASE_URL}{url}"
+            url = absolute_url(url)
         
         if params:
             param_str = "&".join(f"{k}={v}" for k, v in params.items())
@@ -161,14 +250,15 @@ class VolleyboxScraper:
                 elapsed = time.time() - self._last_request_time
                 wait = random.uniform(*self.delay)
                 if elapsed < wait:
-                    time.sleep(wait - elapsed)
+                    pause(wait - elapsed, deadline)
+                check_deadline(deadline)
 
                 console.print(f"  [dim]Fetching: {url}[/dim]")
-                page.get(url)
+                self._navigate(url, deadline)
                 self._last_request_time = time.time()
                 
                 # Check Cloudflare
-                if not self._wait_for_cloudflare():
+                if not self._wait_for_cloudflare(deadline=deadline):
                     console.print("  [red]Cloudflare geçilemedi.[/red]")
                     continue
 
@@ -176,11 +266,25 @@ class VolleyboxScraper:
                 if html:
                     return BeautifulSoup(html, "lxml")
 
+            except ScrapeCancelled:
+                console.print("  [yellow]⏹ İstek iptal edildi (süre doldu).[/yellow]")
+                raise
             except Exception as e:
                 console.print(f"  [red]Hata: {e}[/red]")
                 
         return None
 
+    def warm_up(self, deadline=None):
+        """
+        Launch the browser and pass the Cloudflare check on the home page,
+        so the first real request does not pay for either.
+
+        Returns:
+            True if the site was reached
+        """
+        console.print("[bold cyan]🔥 Tarayıcı hazırlanıyor...[/bold cyan]")
+        return self.get_page(self.build_url(""), deadline=deadline) is not None
+
     def build_url(self, path=""):
         path = path.lstrip("/")
         return f"{BASE_URL}/{self.lang}/{path}"
@@ -0,0 +1,294 @@
+"""
+Partitioned dataset output for scraped data.
+Writes each entity into Hive-style partition directories with an atomic
+manifest, e.g.:
+
+    dataset/
+        _manifest.json
+        matches/tournament=o38677/season=2025-26/v1760000000000000000-123/part-00000.parquet
+        tournament_details/tournament=o38677/v1760000000000000000-123/part-00000.parquet
+        players/v1760000000000000000-123/part-00000.parquet
+
+List crawls are unpartitioned ('players'); single-entity scrapes use their
+own folders ('player_profiles/player=<id>'), so the two never overlap.
+
+Re-scraping one tournament rewrites only its partition, and readers can use
+the manifest to load just the partitions they need.
+
+Every write goes into a new version directory, which is published by
+atomically replacing the manifest that points at it; the previous version
+stays on disk until a later write, so readers never see a missing or
+half-written partition. Manifest updates are serialized across processes
+with a lock file, so several writers can share one dataset.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from rich.console import Console
+
+from .exporter import StreamWriter, to_arrow_table, pa, pq
+
+console = Console()
+
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_LOCK_FILE = "_manifest.lock"
+DEFAULT_ROWS_PER_FILE = 100_000
+# Versions kept per partition (the published one plus older ones still being read)
+KEEP_VERSIONS = 2
+# Seconds to wait for the manifest lock, and age after which a lock is stale
+LOCK_TIMEOUT = 60
+STALE_LOCK_SECONDS = 300
+
+# Dataset folder → exporter entity type (Arrow schema)
+RECORD_ENTITIES = {
+    "matches": "match",
+    "players": "player",
+    "player_profiles": "player",
+    "rosters": "player",
+    "teams": "team",
+    "team_profiles": "team",
+    "transfers": "transfer",
+    "tournaments": "tournament",
+    "tournament_details": "tournament",
+}
+
+_SEASON_RE = re.compile(r"(\d{4})\s*[/-]\s*(\d{2,4})")
+_UNSAFE_VALUE_RE = re.compile(r"[^\w.-]+", re.UNICODE)
+_VERSION_RE = re.compile(r"^v(\d+)-\d+$")
+
+
+def season_slug(text):
+    """Extract a path-safe season from a name: 'Ligi 2025/26' → '2025-26' ('' if none)."""
+    match = _SEASON_RE.search(text or "")
+    return f"{match.group(1)}-{match.group(2)}" if match else ""
+
+
+def partition_path(entity, partition=None):
+    """Relative directory of a partition: 'matches/tournament=o38677/season=2025-26'."""
+    parts = [entity]
+    for key, value in (partition or {}).items():
+        value = _UNSAFE_VALUE_RE.sub("_", str(value)).strip("_") or "unknown"
+        parts.append(f"{key}={value}")
+    return "/".join(parts)
+
+
+def write_partition(root, entity, records, partition=None, format=None, rows_per_file=DEFAULT_ROWS_PER_FILE):
+    """
+    Atomically (re)write one partition and record it in the manifest.
+
+    The files are written to a new version directory inside the partition,
+    which becomes visible only when the manifest is replaced to point at it,
+    so readers never see a missing or half-written partition. Versions older
+    than the last KEEP_VERSIONS are removed afterwards.
+
+    Args:
+        root: Dataset root directory
+        entity: Entity folder name ('matches', 'players', ...)
+        records: Iterable of dicts or typed records
+        partition: Ordered dict of partition key → value (None = unpartitioned)
+        format: 'parquet' or 'jsonl' (default: parquet if pyarrow is installed)
+        rows_per_file: Max rows per part file
+
+    Returns:
+        Number of records written
+    """
+    format = format or ("parquet" if pa is not None else "jsonl")
+    if format not in ("parquet", "jsonl"):
+        raise ValueError(f"Unknown dataset format: {format!r}")
+
+    rel_path = partition_path(entity, partition)
+    part_dir = os.path.join(root, *rel_path.split("/"))
+    version = f"v{time.time_ns()}-{os.getpid()}"
+    tmp_dir = os.path.join(part_dir, f"{version}.tmp")
+    os.makedirs(tmp_dir)
+
+    files = []
+    rows = 0
+    chunk = []
+    try:
+        for record in records:
+            chunk.append(record.to_dict() if hasattr(record, "to_dict") else record)
+            if len(chunk) >= rows_per_file:
+                files.append(_write_part(tmp_dir, len(files), chunk, format, entity))
+                rows += len(chunk)
+                chunk = []
+        if chunk or not files:
+            files.append(_write_part(tmp_dir, len(files), chunk, format, entity))
+            rows += len(chunk)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with manifest_lock(root):
+        # A fresh name, so this rename cannot clobber anything readers use
+        os.replace(tmp_dir, os.path.join(part_dir, version))
+        manifest = load_manifest(root)
+        manifest["partitions"][rel_path] = {
+            "entity": entity,
+            "values": {k: str(v) for k, v in (partition or {}).items()},
+            "format": format,
+            "version": version,
+            "files": files,
+            "rows": rows,
+            "updated_at": now,
+        }
+        manifest["updated_at"] = now
+        _save_manifest(root, manifest)
+        # Published: only now drop versions nobody is pointed at any more
+        _remove_old_versions(part_dir, version)
+
+    console.print(f"[bold green]✓ {rows} kayıt → {os.path.join(root, rel_path, version)}[/bold green]")
+    return rows
+
+
+@contextmanager
+def manifest_lock(root, timeout=LOCK_TIMEOUT):
+    """
+    Exclusive lock on a dataset's manifest, shared by all processes.
+
+    Uses an O_EXCL lock file, so it works on every platform; a lock left by
+    a crashed writer is broken after STALE_LOCK_SECONDS.
+    """
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, MANIFEST_LOCK_FILE)
+    give_up = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > STALE_LOCK_SECONDS:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > give_up:
+                raise TimeoutError(f"Dataset manifest is locked: {path}")
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def load_manifest(root):
+    """Load the dataset manifest (empty manifest if the dataset is new)."""
+    path = os.path.join(root, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"version": 1, "updated_at": None, "partitions": {}}
+
+
+def list_partitions(root, entity=None, **filters):
+    """
+    List manifest partitions, optionally filtered by entity and partition values.
+
+    Example:
+        list_partitions("dataset", "matches", tournament="o38677")
+
+    Returns:
+        List of (relative path, partition info) tuples
+    """
+    filters = {k: str(v) for k, v in filters.items()}
+    result = []
+    for rel_path, info in load_manifest(root)["partitions"].items():
+        if entity and info["entity"] != entity:
+            continue
+        values = info["values"]
+        if any(values.get(k) != v for k, v in filters.items()):
+            continue
+        result.append((rel_path, info))
+    return result
+
+
+def read_dataset(root, entity, **filters):
+    """
+    Read only the partitions matching the filters.
+
+    Args:
+        root: Dataset root directory
+        entity: Entity folder name
+        **filters: Partition values to match (e.g. tournament="o38677")
+
+    Returns:
+        List of dicts; partition values are added as fields when missing
+    """
+    records = []
+    for rel_path, info in list_partitions(root, entity, **filters):
+        part_dir = os.path.join(root, *rel_path.split("/"))
+        if info.get("version"):
+            part_dir = os.path.join(part_dir, info["version"])
+        for name in info["files"]:
+            path = os.path.join(part_dir, name)
+            if info["format"] == "parquet":
+                rows = pq.read_table(path).to_pylist()
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    rows = [json.loads(line) for line in f if line.strip()]
+            for row in rows:
+                for key, value in info["values"].items():
+                    row.setdefault(key, value)
+            records.extend(rows)
+    return records
+
+
+def _write_part(directory, index, rows, format, entity):
+    """Write one part file and return its file name."""
+    if format == "parquet":
+        name = f"part-{index:05d}.parquet"
+        table = to_arrow_table(rows, _record_entity(entity)) if rows else pa.table({})
+        pq.write_table(table, os.path.join(directory, name), compression="zstd")
+    else:
+        name = f"part-{index:05d}.jsonl"
+        with StreamWriter(os.path.join(directory, name), format="jsonl") as writer:
+            writer.write_many(rows)
+    return name
+
+
+def _record_entity(entity):
+    """Map a dataset folder ('matches') to the exporter entity type ('match')."""
+    return RECORD_ENTITIES.get(entity)
+
+
+def _remove_old_versions(part_dir, current):
+    """
+    Delete all but the newest KEEP_VERSIONS published versions of a partition,
+    never touching the current one, newer ones or writes still in progress
+    (.tmp). Part files of the old unversioned layout are removed too.
+    """
+    current_ts = int(_VERSION_RE.match(current).group(1))
+    older = []
+    for name in os.listdir(part_dir):
+        path = os.path.join(part_dir, name)
+        match = _VERSION_RE.match(name)
+        if match and int(match.group(1)) < current_ts:
+            older.append((int(match.group(1)), path))
+        elif name.startswith("part-") and os.path.isfile(path):
+            os.remove(path)
+    older.sort(reverse=True)
+    for _, path in older[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _save_manifest(root, manifest):
+    """Atomically write the manifest."""
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
@@ -1,40 +1,89 @@
 """
 Export module for scraper data.
-Supports JSON, CSV, and Excel export formats.
+Supports JSON, JSONL, CSV, Excel, Parquet and Arrow IPC export formats,
+plus a streaming JSON/JSONL writer for large crawls.
 """
 
+import re
+import gzip
 import json
+import pickle
+import operator
+import tempfile
+import itertools
 import pandas as pd
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:  # optional fast serializer
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional zstd compression
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional columnar export
+    pa = None
+    pq = None
+
+from .models import Match, Player, Team, Transfer, StandingRow
+from .urls import entity_id, entity_key
+
 console = Console()
 
+COMPRESSION_EXT = {"gzip": ".gz", "zstd": ".zst"}
 
-def export_data(data, filename, format="json"):
+# Excel sheet limits (rows include the header row)
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_SHEET_NAME_LEN = 31
+_SHEET_NAME_INVALID_RE = re.compile(r"[\[\]:*?/\\]")
+
+
+def export_data(data, filename, format="json", entity=None):
     """
     Export scraped data to a file.
 
     Args:
         data: List of dicts to export
         filename: Output filename (extension will be added if missing)
-        format: 'json', 'csv', or 'excel'
+        format: 'json', 'jsonl', 'csv', 'excel', 'parquet', 'arrow' or 'db'
+            ('db' upserts into a SQLite store, see scraper.store)
+        entity: Entity type for columnar/db formats ('match', 'player', 'team',
+            'transfer', 'tournament'); detected from the records if omitted
     """
     if not data:
         console.print("[yellow]⚠ Dışa aktarılacak veri yok.[/yellow]")
         return
 
     # Ensure proper extension
-    ext_map = {"json": ".json", "csv": ".csv", "excel": ".xlsx"}
+    ext_map = {
+        "json": ".json", "jsonl": ".jsonl", "csv": ".csv", "excel": ".xlsx",
+        "parquet": ".parquet", "arrow": ".arrow", "db": ".db",
+    }
     expected_ext = ext_map.get(format, ".json")
     if not filename.endswith(expected_ext):
         filename = filename.rsplit(".", 1)[0] + expected_ext if "." in filename else filename + expected_ext
 
     if format == "json":
         _export_json(data, filename)
+    elif format == "jsonl":
+        with StreamWriter(filename, format="jsonl") as writer:
+            writer.write_many(data)
     elif format == "csv":
         _export_csv(data, filename)
     elif format == "excel":
         _export_excel(data, filename)
+    elif format == "parquet":
+        _export_parquet(data, filename, entity)
+    elif format == "arrow":
+        _export_arrow(data, filename, entity)
+    elif format == "db":
+        _export_db(data, filename, entity)
     else:
         console.print(f"[red]✗ Bilinmeyen format: {format}[/red]")
         return
@@ -49,6 +98,374 @@ def _export_json(data, filename):
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
+class StreamWriter:
+    """
+    Write records to a JSON array or JSONL file one at a time.
+
+    Memory stays flat regardless of the number of records: each record is
+    serialized and written immediately, and the file is flushed every
+    `flush_every` records so partial output is usable while a crawl runs.
+    Uses orjson when installed and supports gzip/zstd compression.
+
+    Usage:
+        with StreamWriter("matches", format="jsonl", compression="gzip") as writer:
+            for match in iter_tournament_matches(scraper, url):
+                writer.write(match)
+    """
+
+    def __init__(self, filename, format="jsonl", compression=None, flush_every=100):
+        if format not in ("json", "jsonl"):
+            raise ValueError(f"Streaming format must be 'json' or 'jsonl', got {format!r}")
+        if compression not in (None, "gzip", "zstd"):
+            raise ValueError(f"Unknown compression: {compression!r}")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd compression requires the 'zstandard' package")
+
+        self.format = format
+        self.compression = compression
+        self.flush_every = flush_every
+        self.filename = self._with_extension(filename)
+        self.count = 0
+        self._file = None
+        self._raw = None
+        self._closed = False
+
+    def _with_extension(self, filename):
+        ext = f".{self.format}" + COMPRESSION_EXT.get(self.compression, "")
+        if filename.endswith(ext):
+            return filename
+        for known in (".jsonl", ".json"):
+            if filename.endswith(known):
+                filename = filename[: -len(known)]
+                break
+        return filename + ext
+
+    def open(self):
+        if self.compression == "gzip":
+            self._file = gzip.open(self.filename, "wb")
+        elif self.compression == "zstd":
+            self._raw = open(self.filename, "wb")
+            self._file = zstandard.ZstdCompressor().stream_writer(self._raw)
+        else:
+            self._file = open(self.filename, "wb")
+        if self.format == "json":
+            self._file.write(b"[\n")
+        return self
+
+    def write(self, record):
+        """Serialize and write a single record (dict or typed record)."""
+        if self._closed:
+            raise ValueError(f"Write to a closed StreamWriter: {self.filename}")
+        if self._file is None:
+            self.open()
+        if hasattr(record, "to_dict"):
+            record = record.to_dict()
+
+        line = _dumps(record)
+        if self.format == "json":
+            if self.count:
+                line = b",\n" + line
+        else:
+            line += b"\n"
+        self._file.write(line)
+
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def write_many(self, records):
+        """Write every record from an iterable; returns the number written."""
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self):
+        """Finish the file; closing again is a no-op (it must not truncate the export)."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._file is None:
+            # Never opened: still leave a valid, empty file
+            self.open()
+        if self.format == "json":
+            self._file.write(b"\n]\n")
+        self._file.close()
+        if self._raw is not None:
+            self._raw.close()
+        self._file = None
+        self._raw = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def stream_export(records, filename, format="jsonl", compression=None, flush_every=100, sheet_by="auto"):
+    """
+    Stream an iterable of records to a JSON/JSONL/Excel file with constant memory.
+
+    Args:
+        records: Iterable (list or generator) of dicts or typed records
+        filename: Output filename (extension is added if missing)
+        format: 'json' (array), 'jsonl' or 'excel'
+        compression: None, 'gzip' or 'zstd' (JSON formats only)
+        flush_every: Flush to disk every N records (JSON formats only)
+        sheet_by: Excel sheet split, see ExcelStreamWriter
+
+    Returns:
+        Number of records written
+    """
+    if format == "excel":
+        writer = ExcelStreamWriter(filename, sheet_by=sheet_by)
+    else:
+        writer = StreamWriter(filename, format=format, compression=compression, flush_every=flush_every)
+    with writer:
+        writer.write_many(records)
+    console.print(f"[bold green]✓ {writer.count} kayıt → {writer.filename}[/bold green]")
+    return writer.count
+
+
+def _dumps(record):
+    """Serialize one record to UTF-8 JSON bytes (orjson if available)."""
+    if orjson is not None:
+        return orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+
+
+# --- Columnar (Parquet / Arrow) export ---
+
+if pa is not None:
+    _DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+    ROSTER_TYPE = pa.struct([
+        ("player_id", pa.int64()),
+        ("name", pa.string()),
+        ("url", pa.string()),
+        ("position", pa.string()),
+        ("number", pa.int16()),
+    ])
+
+    STANDING_TYPE = pa.struct([
+        ("group", pa.string()),
+        ("rank", pa.int16()),
+        ("team_id", pa.int64()),
+        ("team", pa.string()),
+        ("team_url", pa.string()),
+        ("points", pa.int16()),
+        ("wins", pa.int16()),
+        ("losses", pa.int16()),
+        ("sets_won", pa.int16()),
+        ("sets_lost", pa.int16()),
+    ])
+
+    SCHEMAS = {
+        "match": pa.schema([
+            ("match_id", pa.int64()),
+            ("tournament", _DICT_STRING),
+            ("tournament_id", _DICT_STRING),
+            ("round", _DICT_STRING),
+            ("date_timestamp", pa.timestamp("s", tz="UTC")),
+            ("date_str", pa.string()),
+            ("home_team", _DICT_STRING),
+            ("away_team", _DICT_STRING),
+            ("home_sets", pa.int8()),
+            ("away_sets", pa.int8()),
+            ("venue", _DICT_STRING),
+            ("score", _DICT_STRING),
+        ]),
+        "player": pa.schema([
+            ("player_id", pa.int64()),
+            ("name", pa.string()),
+            ("url", pa.string()),
+            ("position", _DICT_STRING),
+            ("nationality", _DICT_STRING),
+            ("birth_date", pa.string()),
+            ("height", pa.int16()),
+            ("weight", pa.int16()),
+            ("spike_height", pa.int16()),
+            ("block_height", pa.int16()),
+            ("current_team", _DICT_STRING),
+            ("photo_url", pa.string()),
+            ("career", pa.list_(pa.struct([
+                ("season", pa.string()),
+                ("team", pa.string()),
+                ("league", pa.string()),
+            ]))),
+        ]),
+        "team": pa.schema([
+            ("team_id", pa.int64()),
+            ("name", pa.string()),
+            ("url", pa.string()),
+            ("country", _DICT_STRING),
+            ("league", _DICT_STRING),
+            ("city", _DICT_STRING),
+            ("founded", pa.string()),
+            ("arena", pa.string()),
+            ("coach", pa.string()),
+            ("president", pa.string()),
+            ("logo_url", pa.string()),
+            ("roster", pa.list_(ROSTER_TYPE)),
+            ("trophies", pa.list_(pa.string())),
+        ]),
+        "transfer": pa.schema([
+            ("player_id", pa.int64()),
+            ("player_name", pa.string()),
+            ("player_url", pa.string()),
+            ("from_team_id", pa.int64()),
+            ("from_team", _DICT_STRING),
+            ("from_team_url", pa.string()),
+            ("to_team_id", pa.int64()),
+            ("to_team", _DICT_STRING),
+            ("to_team_url", pa.string()),
+            ("position", _DICT_STRING),
+            ("nationality", _DICT_STRING),
+            ("date", pa.string()),
+        ]),
+        "tournament": pa.schema([
+            ("tournament_id", pa.string()),
+            ("name", pa.string()),
+            ("url", pa.string()),
+            ("season", _DICT_STRING),
+            ("country", _DICT_STRING),
+            ("team_count", pa.int16()),
+            ("teams", pa.list_(pa.struct([
+                ("team_id", pa.int64()),
+                ("name", pa.string()),
+                ("url", pa.string()),
+            ]))),
+            ("standings", pa.list_(STANDING_TYPE)),
+        ]),
+    }
+else:
+    SCHEMAS = {}
+
+
+def detect_entity(record):
+    """Guess the entity type of a scraped record from its keys and URL."""
+    if "type" in record and set(record) <= {"name", "type", "url"}:
+        # Search results mix players, teams and tournaments
+        return None
+    if "match_id" in record:
+        return "match"
+    if "player_url" in record and "to_team" in record:
+        return "transfer"
+    if "standings" in record or "team_count" in record:
+        return "tournament"
+    key = entity_key(record.get("url", ""))
+    return key.type if key else None
+
+
+def _typed_rows(data, entity):
+    """Convert scraped dicts to rows matching the entity's Arrow schema."""
+    if entity == "match":
+        return [Match.from_dict(d).to_dict() for d in data]
+    if entity == "transfer":
+        return [
+            {"player_id": t.player_id, "from_team_id": t.from_team_id, "to_team_id": t.to_team_id, **t.to_dict()}
+            for t in map(Transfer.from_dict, data)
+        ]
+    if entity == "player":
+        return [{"player_id": p.player_id, **p.to_dict()} for p in map(Player.from_dict, data)]
+    if entity == "team":
+        rows = []
+        for team in map(Team.from_dict, data):
+            row = {"team_id": team.team_id, **team.to_dict()}
+            row["roster"] = [{"player_id": p.player_id, **p.to_dict()} for p in team.roster]
+            rows.append(row)
+        return rows
+    if entity == "tournament":
+        rows = []
+        for d in data:
+            row = dict(d)
+            row["tournament_id"] = entity_id(d.get("url", ""))
+            row["teams"] = [{"team_id": entity_id(t.get("url", "")), **t} for t in d.get("teams", [])]
+            row["standings"] = [
+                {"team_id": s.team_id, **s.to_dict()}
+                for s in map(StandingRow.from_dict, d.get("standings", []))
+            ]
+            rows.append(row)
+        return rows
+    return list(data)
+
+
+_PYARROW_MISSING = "Parquet/Arrow export requires the 'pyarrow' package"
+
+
+def to_arrow_table(data, entity=None):
+    """
+    Build a typed Arrow table from scraped records.
+
+    Known entities use an explicit schema: int sets and ids, timestamp dates,
+    dictionary-encoded team/venue/round names, and nested roster, career,
+    teams and standings as list<struct> columns instead of joined strings.
+    Keys outside the schema are kept as extra columns with inferred types.
+
+    Args:
+        data: List of dicts
+        entity: Entity type; detected from the first record if omitted
+
+    Returns:
+        pyarrow.Table
+    """
+    if pa is None:
+        raise ImportError(_PYARROW_MISSING)
+
+    data = list(data)
+    entity = entity or (detect_entity(data[0]) if data else None)
+    schema = SCHEMAS.get(entity)
+    rows = _typed_rows(data, entity) if schema is not None else data
+    if schema is None:
+        return pa.Table.from_pylist(rows)
+
+    table = pa.Table.from_pylist(rows, schema=schema)
+
+    # Keep any keys not covered by the schema (e.g. roster --team context)
+    extra_keys = []
+    for row in rows:
+        for key in row:
+            if key not in schema.names and key not in extra_keys:
+                extra_keys.append(key)
+    for key in extra_keys:
+        values = [row.get(key) for row in rows]
+        try:
+            column = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            column = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+        table = table.append_column(key, column)
+
+    return table
+
+
+def _export_parquet(data, filename, entity=None):
+    """Export data as a zstd-compressed Parquet file."""
+    if pq is None:
+        raise ImportError(_PYARROW_MISSING)
+    pq.write_table(to_arrow_table(data, entity), filename, compression="zstd")
+
+
+def _export_arrow(data, filename, entity=None):
+    """Export data as an Arrow IPC (Feather v2) file."""
+    if pa is None:
+        raise ImportError(_PYARROW_MISSING)
+    table = to_arrow_table(data, entity)
+    with pa.OSFile(filename, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _export_db(data, filename, entity=None):
+    """Upsert data into a SQLite store keyed by entity id."""
+    from .store import VolleyboxStore
+
+    entity = entity or detect_entity(data[0])
+    if entity is None:
+        raise ValueError("Veritabanı için varlık tipi belirlenemedi (entity parametresi verin)")
+    with VolleyboxStore(filename) as store:
+        store.upsert(entity, data)
+
+
 def _export_csv(data, filename):
     """Export data as CSV."""
     df = _to_dataframe(data)
@@ -57,41 +474,244 @@ def _export_csv(data, filename):
 
 def _export_excel(data, filename):
     """Export data as Excel."""
-    df = _to_dataframe(data)
-    df.to_excel(filename, index=False, engine="openpyxl")
+    with ExcelStreamWriter(filename, sheet_by="auto") as writer:
+        writer.write_many(data)
+
+
+class ExcelStreamWriter:
+    """
+    Write records to an .xlsx workbook using openpyxl's write-only mode.
+
+    Flattened rows are spooled to a temporary file per sheet while the
+    column union is collected, and each sheet is written from its spool on
+    close() with the full header, so a column that first appears late in
+    the stream still lands in the same sheet. Memory stays flat: neither
+    the records nor the workbook are held as Python objects. Records can be
+    split into sheets, and a sheet rolls over to '<name> (2)',
+    '<name> (3)', ... (with the same header) only at Excel's row limit.
+
+    Args:
+        filename: Output filename (.xlsx is added if missing)
+        sheet_by: None (single sheet), 'entity' (players/teams/matches/...),
+            'auto' (matches per tournament, everything else per entity),
+            a record key (e.g. 'tournament') or a callable(record) -> name
+        max_rows: Rows per sheet including the header
+    """
+
+    def __init__(self, filename, sheet_by=None, max_rows=EXCEL_MAX_ROWS):
+        from openpyxl import Workbook
+
+        if not filename.endswith(".xlsx"):
+            filename = filename.rsplit(".", 1)[0] + ".xlsx" if "." in filename else filename + ".xlsx"
+        self.filename = filename
+        self.sheet_by = sheet_by
+        self.max_rows = max_rows
+        self.count = 0
+        self._workbook = Workbook(write_only=True)
+        self._sheets = {}
+        self._titles = set()
+        self._closed = False
+
+    def write(self, record):
+        """Flatten and spool a single record (dict or typed record)."""
+        if self._closed:
+            raise ValueError(f"{self.filename}: write() after close()")
+        if hasattr(record, "to_dict"):
+            record = record.to_dict()
+        name = self._sheet_name(record)
+        sheet = self._sheets.get(name)
+        if sheet is None:
+            sheet = self._sheets[name] = {"columns": {}, "spool": tempfile.TemporaryFile()}
+
+        flat = _flatten_record(record)
+        sheet["columns"].update(dict.fromkeys(flat))
+        pickle.dump(flat, sheet["spool"], pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def write_many(self, records):
+        """Write every record from an iterable; returns the number written."""
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            for name, sheet in self._sheets.items():
+                self._write_sheet(name, list(sheet["columns"]), sheet["spool"])
+            if not self._sheets:
+                self._workbook.create_sheet("data")
+            self._workbook.save(self.filename)
+        finally:
+            for sheet in self._sheets.values():
+                sheet["spool"].close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _sheet_name(self, record):
+        sheet_by = self.sheet_by
+        if sheet_by is None:
+            return "data"
+        if callable(sheet_by):
+            return str(sheet_by(record) or "data")
+        if sheet_by in ("auto", "entity"):
+            entity = detect_entity(record)
+            if sheet_by == "auto" and entity == "match" and record.get("tournament"):
+                return str(record["tournament"])
+            return f"{entity}s" if entity else "data"
+        return str(record.get(sheet_by) or "data")
+
+    def _write_sheet(self, name, columns, spool):
+        """Write one spooled sheet, rolling over at max_rows."""
+        spool.seek(0)
+        part, ws, rows = 0, None, self.max_rows
+        while True:
+            try:
+                flat = pickle.load(spool)
+            except EOFError:
+                break
+            if rows >= self.max_rows:
+                part += 1
+                ws = self._workbook.create_sheet(self._title(name, part))
+                ws.append(columns)
+                rows = 1
+            ws.append([flat.get(column) for column in columns])
+            rows += 1
+
+    def _title(self, base, part):
+        """Unique, valid sheet title (max 31 chars, no []:*?/\\)."""
+        base = _SHEET_NAME_INVALID_RE.sub("-", base).strip() or "data"
+        suffix = f" ({part})" if part > 1 else ""
+        title = base[: EXCEL_SHEET_NAME_LEN - len(suffix)] + suffix
+        n = 2
+        while title.lower() in self._titles:
+            extra = f" ~{n}"
+            title = base[: EXCEL_SHEET_NAME_LEN - len(suffix) - len(extra)] + extra + suffix
+            n += 1
+        self._titles.add(title.lower())
+        return title
+
+
+def _flatten_record(item):
+    """Flatten one record the same way _to_dataframe flattens a column."""
+    flat = {}
+    for key, value in item.items():
+        if isinstance(value, list):
+            flat[key] = _join_list(value)
+        elif isinstance(value, dict):
+            for sub_key, sub_val in value.items():
+                flat[f"{key}_{sub_key}"] = sub_val
+        else:
+            flat[key] = value
+    return flat
+
+
+# Cell value for keys a record does not have (matches pandas' NaN fill)
+_MISSING = float("nan")
 
 
 def _to_dataframe(data):
     """
     Convert list of dicts to a pandas DataFrame.
-    Handles nested structures by flattening them.
+    Handles nested structures by flattening them:
+    lists become '; '-joined strings (lists of dicts use ' | ' and ' ;; '),
+    dicts are expanded into '<key>_<sub_key>' columns.
+
+    Works column by column from a precomputed key schema instead of building
+    a flattened dict per row; only columns that actually hold lists or dicts
+    are post-processed.
     """
-    flat_data = []
-    for item in data:
-        flat_item = {}
-        for key, value in item.items():
-            if isinstance(value, list):
-                # Convert lists to semicolon-separated strings
-                if value and isinstance(value[0], dict):
-                    # List of dicts — serialize each
-                    parts = []
-                    for v in value:
-                        if isinstance(v, dict):
-                            parts.append(" | ".join(f"{k}: {val}" for k, val in v.items()))
-                        else:
-                            parts.append(str(v))
-                    flat_item[key] = " ;; ".join(parts)
-                else:
-                    flat_item[key] = "; ".join(str(v) for v in value)
-            elif isinstance(value, dict):
-                # Flatten dict into separate columns
+    data = data if isinstance(data, list) else list(data)
+    if not data:
+        return pd.DataFrame()
+
+    # Distinct key layouts in order of first appearance (usually just one)
+    layouts = list(dict.fromkeys(map(tuple, data)))
+    keys = list(dict.fromkeys(itertools.chain.from_iterable(layouts)))
+    if not keys:
+        # Records without any fields: one empty row each
+        return pd.DataFrame(index=range(len(data)))
+
+    if len(layouts) == 1:
+        # Every record has the same keys: transpose at C speed
+        getter = operator.itemgetter(*keys)
+        rows = map(getter, data) if len(keys) > 1 else ((getter(item),) for item in data)
+        raw_columns = dict(zip(keys, map(list, zip(*rows))))
+    else:
+        raw_columns = {key: [item.get(key, _MISSING) for item in data] for key in keys}
+
+    columns = {}
+    dict_keys = set()
+    for key, values in raw_columns.items():
+        value_types = set(map(type, values))
+        if any(issubclass(t, dict) for t in value_types):
+            dict_keys.add(key)
+            continue
+        if any(issubclass(t, list) for t in value_types):
+            values = [_join_list(v) if isinstance(v, list) else v for v in values]
+        columns[key] = values
+
+    if dict_keys:
+        columns = _expand_dict_columns(data, raw_columns, columns, dict_keys)
+
+    # The index keeps the row count when every column was an empty dict
+    return pd.DataFrame(columns, index=range(len(data)))
+
+
+def _join_list(value):
+    """Serialize a list cell the way CSV/Excel exports always have."""
+    if value and isinstance(value[0], dict):
+        # List of dicts — serialize each
+        return " ;; ".join(
+            " | ".join(f"{k}: {val}" for k, val in v.items()) if isinstance(v, dict) else str(v)
+            for v in value
+        )
+    return "; ".join(map(str, value))
+
+
+def _expand_dict_columns(data, raw_columns, columns, dict_keys):
+    """
+    Expand dict-valued columns into '<key>_<sub_key>' columns.
+
+    Column order must match the first appearance of each flattened key
+    across rows, so it is computed from the distinct flattened layouts.
+    """
+    n_rows = len(data)
+    expanded = {}
+    for key in dict_keys:
+        values = raw_columns[key]
+        plain = [
+            _MISSING if isinstance(v, dict) else _join_list(v) if isinstance(v, list) else v
+            for v in values
+        ]
+        if any(v is not _MISSING for v in plain):
+            expanded[key] = plain
+        for row, value in enumerate(values):
+            if isinstance(value, dict):
                 for sub_key, sub_val in value.items():
-                    flat_item[f"{key}_{sub_key}"] = sub_val
-            else:
-                flat_item[key] = value
-        flat_data.append(flat_item)
+                    column = expanded.setdefault(f"{key}_{sub_key}", [_MISSING] * n_rows)
+                    column[row] = sub_val
+
+    layouts = dict.fromkeys(
+        tuple(
+            part
+            for key, value in item.items()
+            for part in ([f"{key}_{sub}" for sub in value] if isinstance(value, dict) else [key])
+        )
+        for item in data
+    )
+    order = dict.fromkeys(itertools.chain.from_iterable(layouts))
 
-    return pd.DataFrame(flat_data)
+    merged = {}
+    for name in order:
+        merged[name] = expanded[name] if name in expanded else columns[name]
+    return merged
 
 
 def print_summary(data, title="Sonuçlar"):
@@ -0,0 +1,437 @@
+"""
+Typed record classes for scraped data.
+Compact __slots__ dataclasses for matches, players, teams, transfers and
+standings rows, with conversion to and from the plain dicts the scrapers
+produce and the exporters write.
+
+Numeric fields are real ints ("home_sets": "3" → 3, "" → None) and repeated
+names (teams, venues, rounds, tournaments) are interned so that archives with
+thousands of matches share one string object per name.
+"""
+
+import re
+import sys
+import json
+from dataclasses import dataclass, field
+
+from .urls import entity_id
+
+_DIGITS_RE = re.compile(r"-?\d+")
+
+# Sets needed to win a match; a row without a winner (e.g. a 0:0 placeholder) is unplayed
+SETS_TO_WIN = 3
+
+
+def _int(value):
+    """Parse an int from scraped text ('3', '182 cm', 1759582800); None if missing."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    match = _DIGITS_RE.search(str(value))
+    return int(match.group()) if match else None
+
+
+def _name(value):
+    """Intern a repeated name/label string."""
+    return sys.intern(value) if value else ""
+
+
+def _extra(data, known):
+    """Keys not mapped to fields, kept so conversion round-trips losslessly."""
+    extra = {k: v for k, v in data.items() if k not in known}
+    return extra or None
+
+
+@dataclass(slots=True)
+class Match:
+    match_id: int
+    tournament: str = ""
+    tournament_id: str | None = None
+    round: str = ""
+    date_timestamp: int | None = None
+    date_str: str = ""
+    home_team: str = ""
+    away_team: str = ""
+    home_sets: int | None = None
+    away_sets: int | None = None
+    venue: str = ""
+    extra: dict | None = None
+
+    # 'score' is derived from the sets, so it is not kept in extra
+    _KEYS = frozenset({
+        "match_id", "tournament", "tournament_id", "round", "date_timestamp", "date_str",
+        "home_team", "away_team", "home_sets", "away_sets", "venue", "score",
+    })
+
+    @property
+    def played(self):
+        """True once one side has won (the same rule as analytics.played_mask)."""
+        if self.home_sets is None or self.away_sets is None:
+            return False
+        return max(self.home_sets, self.away_sets) == SETS_TO_WIN and self.home_sets != self.away_sets
+
+    @property
+    def score(self):
+        return f"{self.home_sets}:{self.away_sets}" if self.played else "v"
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            match_id=_int(data.get("match_id")),
+            tournament=_name(data.get("tournament", "")),
+            tournament_id=_name(data.get("tournament_id") or "") or None,
+            round=_name(data.get("round", "")),
+            date_timestamp=_int(data.get("date_timestamp")),
+            date_str=data.get("date_str", "") or "",
+            home_team=_name(data.get("home_team", "")),
+            away_team=_name(data.get("away_team", "")),
+            home_sets=_int(data.get("home_sets")),
+            away_sets=_int(data.get("away_sets")),
+            venue=_name(data.get("venue", "")),
+            extra=_extra(data, cls._KEYS),
+        )
+
+    def to_dict(self):
+        data = {
+            "match_id": self.match_id,
+            "tournament": self.tournament,
+            "tournament_id": self.tournament_id,
+            "round": self.round,
+            "date_timestamp": self.date_timestamp,
+            "date_str": self.date_str,
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "home_sets": self.home_sets,
+            "away_sets": self.away_sets,
+            "venue": self.venue,
+            "score": self.score,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class RosterEntry:
+    player_id: int | None
+    name: str = ""
+    url: str = ""
+    position: str = ""
+    number: int | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        url = data.get("url", "")
+        return cls(
+            player_id=entity_id(url),
+            name=data.get("name", "") or data.get("player_name", ""),
+            url=url,
+            position=_name(data.get("position", "")),
+            number=_int(data.get("number")),
+        )
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "url": self.url,
+            "position": self.position,
+            "number": self.number,
+        }
+
+
+@dataclass(slots=True)
+class Player:
+    player_id: int | None
+    name: str = ""
+    url: str = ""
+    position: str = ""
+    nationality: str = ""
+    birth_date: str = ""
+    height: int | None = None
+    weight: int | None = None
+    spike_height: int | None = None
+    block_height: int | None = None
+    current_team: str = ""
+    photo_url: str = ""
+    career: list = field(default_factory=list)
+    extra: dict | None = None
+
+    _KEYS = frozenset({
+        "name", "url", "position", "nationality", "birth_date", "height", "weight",
+        "spike_height", "block_height", "current_team", "photo_url", "career",
+    })
+
+    @classmethod
+    def from_dict(cls, data):
+        url = data.get("url", "")
+        return cls(
+            player_id=entity_id(url),
+            name=data.get("name", ""),
+            url=url,
+            position=_name(data.get("position", "")),
+            nationality=_name(data.get("nationality", "")),
+            birth_date=data.get("birth_date", ""),
+            height=_int(data.get("height")),
+            weight=_int(data.get("weight")),
+            spike_height=_int(data.get("spike_height")),
+            block_height=_int(data.get("block_height")),
+            current_team=_name(data.get("current_team", "")),
+            photo_url=data.get("photo_url", ""),
+            career=[
+                {k: _name(v) if isinstance(v, str) else v for k, v in entry.items()}
+                for entry in data.get("career", [])
+            ],
+            extra=_extra(data, cls._KEYS),
+        )
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "url": self.url,
+            "position": self.position,
+            "nationality": self.nationality,
+            "birth_date": self.birth_date,
+            "height": self.height,
+            "weight": self.weight,
+            "spike_height": self.spike_height,
+            "block_height": self.block_height,
+            "current_team": self.current_team,
+            "photo_url": self.photo_url,
+        }
+        if self.career:
+            data["career"] = list(self.career)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class Team:
+    team_id: int | None
+    name: str = ""
+    url: str = ""
+    country: str = ""
+    league: str = ""
+    city: str = ""
+    founded: str = ""
+    arena: str = ""
+    coach: str = ""
+    president: str = ""
+    logo_url: str = ""
+    roster: list = field(default_factory=list)
+    trophies: list = field(default_factory=list)
+    extra: dict | None = None
+
+    _KEYS = frozenset({
+        "name", "url", "country", "league", "city", "founded", "arena",
+        "coach", "president", "logo_url", "roster", "trophies",
+    })
+
+    @classmethod
+    def from_dict(cls, data):
+        url = data.get("url", "")
+        return cls(
+            team_id=entity_id(url),
+            name=_name(data.get("name", "")),
+            url=_name(url),
+            country=_name(data.get("country", "")),
+            league=_name(data.get("league", "")),
+            city=_name(data.get("city", "")),
+            founded=data.get("founded", ""),
+            arena=_name(data.get("arena", "")),
+            coach=data.get("coach", ""),
+            president=data.get("president", ""),
+            logo_url=data.get("logo_url", ""),
+            roster=[RosterEntry.from_dict(p) for p in data.get("roster", [])],
+            trophies=list(data.get("trophies", [])),
+            extra=_extra(data, cls._KEYS),
+        )
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "url": self.url,
+            "country": self.country,
+            "league": self.league,
+            "city": self.city,
+            "founded": self.founded,
+            "arena": self.arena,
+            "coach": self.coach,
+            "president": self.president,
+            "logo_url": self.logo_url,
+        }
+        if self.roster:
+            data["roster"] = [p.to_dict() for p in self.roster]
+        if self.trophies:
+            data["trophies"] = list(self.trophies)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class Transfer:
+    player_id: int | None
+    player_name: str = ""
+    player_url: str = ""
+    from_team_id: int | None = None
+    from_team: str = ""
+    from_team_url: str = ""
+    to_team_id: int | None = None
+    to_team: str = ""
+    to_team_url: str = ""
+    position: str = ""
+    nationality: str = ""
+    date: str = ""
+    extra: dict | None = None
+
+    _KEYS = frozenset({
+        "player_name", "player_url", "from_team", "from_team_url", "to_team", "to_team_url",
+        "position", "nationality", "date",
+    })
+
+    @property
+    def key(self):
+        """Dedup key: (player id, from team id, to team id)."""
+        return (self.player_id, self.from_team_id, self.to_team_id)
+
+    @classmethod
+    def from_dict(cls, data):
+        player_url = data.get("player_url", "")
+        from_team_url = data.get("from_team_url", "")
+        to_team_url = data.get("to_team_url", "")
+        return cls(
+            player_id=entity_id(player_url),
+            player_name=data.get("player_name", ""),
+            player_url=player_url,
+            from_team_id=entity_id(from_team_url),
+            from_team=_name(data.get("from_team", "")),
+            from_team_url=_name(from_team_url),
+            to_team_id=entity_id(to_team_url),
+            to_team=_name(data.get("to_team", "")),
+            to_team_url=_name(to_team_url),
+            position=_name(data.get("position", "")),
+            nationality=_name(data.get("nationality", "")),
+            date=data.get("date", ""),
+            extra=_extra(data, cls._KEYS),
+        )
+
+    def to_dict(self):
+        data = {
+            "player_name": self.player_name,
+            "player_url": self.player_url,
+            "from_team": self.from_team,
+            "from_team_url": self.from_team_url,
+            "to_team": self.to_team,
+            "to_team_url": self.to_team_url,
+            "position": self.position,
+            "nationality": self.nationality,
+            "date": self.date,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class StandingRow:
+    team_id: int | None
+    team: str = ""
+    team_url: str = ""
+    group: str = ""
+    rank: int | None = None
+    points: int | None = None
+    wins: int | None = None
+    losses: int | None = None
+    sets_won: int | None = None
+    sets_lost: int | None = None
+    extra: dict | None = None
+
+    _KEYS = frozenset({
+        "team", "team_url", "group", "rank", "points", "wins", "losses", "sets_won", "sets_lost",
+    })
+
+    # Turkish keys produced by scrape_tournament_detail → field names
+    TURKISH_KEYS = {
+        "sıra": "rank",
+        "takım": "team",
+        "puan": "points",
+        "galibiyet": "wins",
+        "mağlubiyet": "losses",
+        "kazanılan_set": "sets_won",
+        "kaybedilen_set": "sets_lost",
+    }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = {cls.TURKISH_KEYS.get(k, k): v for k, v in data.items()}
+        team_url = data.get("team_url", "")
+        return cls(
+            team_id=entity_id(team_url),
+            team=_name(data.get("team", "")),
+            team_url=_name(team_url),
+            group=_name(data.get("group", "")),
+            rank=_int(data.get("rank")),
+            points=_int(data.get("points")),
+            wins=_int(data.get("wins")),
+            losses=_int(data.get("losses")),
+            sets_won=_int(data.get("sets_won")),
+            sets_lost=_int(data.get("sets_lost")),
+            extra=_extra(data, cls._KEYS),
+        )
+
+    def to_dict(self):
+        data = {
+            "group": self.group,
+            "rank": self.rank,
+            "team": self.team,
+            "team_url": self.team_url,
+            "points": self.points,
+            "wins": self.wins,
+            "losses": self.losses,
+            "sets_won": self.sets_won,
+            "sets_lost": self.sets_lost,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+RECORD_TYPES = {
+    "match": Match,
+    "player": Player,
+    "team": Team,
+    "transfer": Transfer,
+    "standing": StandingRow,
+}
+
+
+def from_dicts(cls, data):
+    """Convert an iterable of dicts to a list of records of the given class."""
+    from_dict = cls.from_dict
+    return [from_dict(item) for item in data]
+
+
+def to_dicts(records):
+    """Convert an iterable of records back to plain dicts for export."""
+    return [record.to_dict() for record in records]
+
+
+def load_records(path, cls=Match):
+    """
+    Load a JSON array or JSONL file of scraped dicts as typed records.
+
+    Args:
+        path: Path to a .json (array) or .jsonl file
+        cls: Record class (default Match)
+
+    Returns:
+        List of records
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [cls.from_dict(json.loads(line)) for line in f if line.strip()]
+        return from_dicts(cls, json.load(f))
@@ -3,20 +3,22 @@ Player scraping module for women.volleybox.net
 Handles player list and individual player profile scraping.
 """
 
-import re
 from rich.console import Console
 from rich.progress import track
 
+from .urls import PLAYER_HREF_RE, absolute_url, entity_id
+
 console = Console()
 
 
-def scrape_player_list(scraper, page_limit=5):
+def scrape_player_list(scraper, page_limit=5, deadline=None):
     """
     Scrape the player list with pagination.
 
     Args:
         scraper: VolleyboxScraper instance
         page_limit: Max number of pages to scrape (0 = all)
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
 
     Returns:
         List of dicts with player summary info
@@ -32,7 +34,7 @@ def scrape_player_list(scraper, page_limit=5):
 
         url = scraper.build_url("players")
         params = {"page": page} if page > 1 else None
-        soup = scraper.get_page(url, params=params)
+        soup = scraper.get_page(url, params=params, deadline=deadline)
 
         if not soup:
             console.print(f"  [red]Sayfa {page} çekilemedi, durduruluyor.[/red]")
@@ -50,19 +52,21 @@ def scrape_player_list(scraper, page_limit=5):
             break
 
         page_count = 0
-        seen_urls = {p.get("url", "") for p in players}
+        seen_ids = {entity_id(p.get("url", "")) for p in players}
 
         for item in player_items:
             href = item.get("href", "")
             # Match player URLs like /tr/name-p12345
-            if not re.search(r'-p\d+$', href):
+            match = PLAYER_HREF_RE.search(href)
+            if not match:
                 continue
 
-            full_url = href if href.startswith("http") else f"https://women.volleybox.net{href}"
-
-            if full_url in seen_urls:
+            player_id = int(match.group(1))
+            if player_id in seen_ids:
                 continue
-            seen_urls.add(full_url)
+            seen_ids.add(player_id)
+
+            full_url = absolute_url(href)
 
             name = item.get_text(strip=True)
             if not name or len(name) < 2:
@@ -120,20 +124,21 @@ def scrape_player_list(scraper, page_limit=5):
     return players
 
 
-def scrape_player_profile(scraper, url):
+def scrape_player_profile(scraper, url, deadline=None):
     """
     Scrape a single player's profile page.
 
     Args:
         scraper: VolleyboxScraper instance
         url: Player profile URL
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
 
     Returns:
         Dict with detailed player info
     """
     console.print(f"[bold cyan]👤 Oyuncu profili çekiliyor: {url}[/bold cyan]")
 
-    soup = scraper.get_page(url)
+    soup = scraper.get_page(url, deadline=deadline)
     if not soup:
         return None
 
@@ -232,7 +237,7 @@ def scrape_player_profile(scraper, url):
     if img:
         src = img.get("src", "")
         if src:
-            player["photo_url"] = src if src.startswith("http") else f"https://women.volleybox.net{src}"
+            player["photo_url"] = absolute_url(src)
 
     console.print(f"[bold green]✓ Profil çekildi: {player.get('name', 'N/A')}[/bold green]")
     return player
@@ -250,15 +255,20 @@ def scrape_players_detail(scraper, player_list, limit=0):
     Returns:
         List of detailed player dicts
     """
+    return list(iter_players_detail(scraper, player_list, limit=limit))
+
+
+def iter_players_detail(scraper, player_list, limit=0):
+    """
+    Generator version of scrape_players_detail.
+    Yields each detailed player as soon as it is scraped, so callers can
+    stream results to disk without holding the whole crawl in memory.
+    """
     if limit:
         player_list = player_list[:limit]
 
-    detailed = []
     for player_summary in track(player_list, description="Oyuncu detayları çekiliyor..."):
         profile = scrape_player_profile(scraper, player_summary["url"])
         if profile:
             # Merge summary info with detailed info
-            merged = {**player_summary, **profile}
-            detailed.append(merged)
-
-    return detailed
+            yield {**player_summary, **profile}
@@ -0,0 +1,448 @@
+"""
+Search module for women.volleybox.net
+Answers queries from a local index of every stored player, team and
+tournament, and falls back to the site search page when nothing matches.
+
+The local index folds Turkish case and diacritics, so "vakifbank",
+"VAKIFBANK" and "Vakıfbank" all find the same team, and every query word
+is matched as a prefix ("vak ist" → "VakıfBank Istanbul").
+"""
+
+import os
+import re
+import time
+import heapq
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+from rich.console import Console
+
+from .store import DEFAULT_DB_PATH, VolleyboxStore
+from .urls import BASE_URL, absolute_url, classify_href, entity_key
+
+console = Console()
+
+# Characters NFKD does not decompose to ASCII
+_FOLD_MAP = str.maketrans({"ı": "i", "ø": "o", "ł": "l", "ß": "ss", "æ": "ae", "đ": "d"})
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Result order for equally good matches
+_TYPE_ORDER = {"team": 0, "player": 1, "tournament": 2}
+
+# Cached autocomplete answers (cleared whenever an entity is added)
+AUTOCOMPLETE_CACHE_SIZE = 4096
+
+
+def fold(text):
+    """
+    Turkish-aware case and diacritic folding: 'İSTANBUL', 'Istanbul' and
+    'ıstanbul' → 'istanbul'; 'Şahin Güneş' → 'sahin gunes'.
+    """
+    if not text:
+        return ""
+    # Turkish dotted capital İ must become i (str.lower() would give 'i̇')
+    text = text.replace("İ", "i").lower().translate(_FOLD_MAP)
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """Folded word tokens of a name or query."""
+    return _TOKEN_RE.findall(fold(text))
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over entity names with prefix matching.
+
+    Tokens are kept in a sorted list, so a prefix query is a bisect plus a
+    short scan, and entities can be added incrementally as they are scraped.
+
+    Usage:
+        index = SearchIndex.from_store(store)
+        index.search("vakıf")  # → [{"name": ..., "type": "team", "url": ...}]
+    """
+
+    def __init__(self):
+        self._docs = []
+        self._doc_ids = {}
+        self._postings = {}
+        self._tokens = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, name, url, entity_type=None, replace=True):
+        """
+        Add one entity, or rename it if it is already indexed.
+
+        Args:
+            name: Display name
+            url: Entity URL (its entity key identifies the entity)
+            entity_type: 'player', 'team' or 'tournament' (default: from the URL)
+            replace: Rename an already indexed entity (False keeps the existing name)
+
+        Returns:
+            True if the entity was added or renamed
+        """
+        key = entity_key(url)
+        if key is None or not name:
+            return False
+        with self._lock:
+            doc_id = self._doc_ids.get(key)
+            if doc_id is not None:
+                doc = self._docs[doc_id]
+                if not replace or doc["name"] == name:
+                    return False
+                for token in tokenize(doc["name"]):
+                    self._postings[token].discard(doc_id)
+                doc["name"] = name
+                doc["folded"] = fold(name)
+            else:
+                doc_id = len(self._docs)
+                self._doc_ids[key] = doc_id
+                self._docs.append({
+                    "name": name,
+                    "type": entity_type or key.type,
+                    "url": absolute_url(url),
+                    "folded": fold(name),
+                })
+            for token in tokenize(name):
+                postings = self._postings.get(token)
+                if postings is None:
+                    self._postings[token] = postings = set()
+                    insort(self._tokens, token)
+                postings.add(doc_id)
+        return True
+
+    def add_records(self, records, entity_type=None, replace=True):
+        """
+        Index scraped records (players, teams, tournaments, search results),
+        including the rosters and team lists nested in them.
+
+        Returns:
+            Number of entities added or renamed
+        """
+        added = 0
+        for record in records:
+            added += self.add(record.get("name", ""), record.get("url", ""), entity_type, replace)
+            for nested in (record.get("roster") or []) + (record.get("teams") or []):
+                added += self.add(nested.get("name", ""), nested.get("url", ""), replace=False)
+        return added
+
+    def search(self, query, limit=20, types=None):
+        """
+        Find entities whose name contains every query word as a word prefix.
+
+        Args:
+            query: Search text (any case/diacritics)
+            limit: Max results
+            types: Optional set of entity types to keep ('player', 'team', 'tournament')
+
+        Returns:
+            List of dicts with name, type and url, best matches first
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            candidates = None
+            exact_hits = {}
+            # Rarest-looking (longest) token first keeps the intersection small
+            for token in sorted(query_tokens, key=len, reverse=True):
+                matched = set()
+                for index_token in self._prefix_tokens(token):
+                    postings = self._postings[index_token]
+                    matched |= postings
+                    if index_token == token:
+                        for doc_id in postings:
+                            exact_hits[doc_id] = exact_hits.get(doc_id, 0) + 1
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return []
+
+            folded_query = " ".join(query_tokens)
+            docs = self._docs
+            ranked = heapq.nsmallest(
+                limit,
+                (
+                    doc_id for doc_id in candidates
+                    if types is None or docs[doc_id]["type"] in types
+                ),
+                key=lambda doc_id: (
+                    not docs[doc_id]["folded"].startswith(folded_query),
+                    -exact_hits.get(doc_id, 0),
+                    len(docs[doc_id]["name"]),
+                    _TYPE_ORDER.get(docs[doc_id]["type"], 9),
+                ),
+            )
+            return [
+                {"name": docs[i]["name"], "type": docs[i]["type"], "url": docs[i]["url"]}
+                for i in ranked
+            ]
+
+    def _prefix_tokens(self, prefix):
+        """Indexed tokens starting with prefix (bisect into the sorted token list)."""
+        tokens = self._tokens
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            yield tokens[i]
+            i += 1
+
+    @classmethod
+    def from_store(cls, store):
+        """Build an index of every player, team and tournament in a VolleyboxStore."""
+        index = cls()
+        for entity_type, name, url, _ in store.search_entries():
+            index.add(name, url, entity_type)
+        return index
+
+
+class Autocompleter:
+    """
+    Type-ahead over entity names using a sorted key array and bisect.
+
+    Each entity is reachable from the start of its folded name and from the
+    start of every later word ("oz" → "Cansu Özbay"). Matches are ranked by
+    popularity (touch() counts), then recency (last scrape time), then name
+    length, and the top k are returned.
+
+    A prefix maps to one contiguous slice of the sorted keys, so a lookup is
+    two bisects, a slice and a top-k selection keyed by a precomputed rank.
+
+    Usage:
+        completer = Autocompleter.from_store(store)
+        completer.complete("vak", k=8)
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._key_docs = []
+        self._docs = []
+        self._rank = []
+        self._doc_ids = {}
+        self._cache = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, name, url, entity_type=None, updated_at=None, replace=True):
+        """
+        Add an entity (or refresh its name/recency).
+
+        Returns:
+            True if the entity was added or changed
+        """
+        key = entity_key(url)
+        if key is None or not name:
+            return False
+        updated_at = time.time() if updated_at is None else updated_at
+        with self._lock:
+            doc_id = self._doc_ids.get(key)
+            if doc_id is not None:
+                doc = self._docs[doc_id]
+                doc["updated_at"] = max(doc["updated_at"], updated_at)
+                if not replace or doc["name"] == name:
+                    self._update_rank(doc_id)
+                    return False
+                self._remove_keys(doc_id, doc["name"])
+                doc["name"] = name
+                self._update_rank(doc_id)
+            else:
+                doc_id = self._new_doc(name, url, entity_type or key.type, updated_at, key)
+            for prefix_key in _completion_keys(name):
+                i = bisect_left(self._keys, prefix_key)
+                self._keys.insert(i, prefix_key)
+                self._key_docs.insert(i, doc_id)
+            self._cache.clear()
+        return True
+
+    def add_records(self, records, entity_type=None, replace=True):
+        """Add scraped records (and nested rosters/team lists); returns the number added or changed."""
+        added = 0
+        now = time.time()
+        for record in records:
+            added += self.add(record.get("name", ""), record.get("url", ""), entity_type, now, replace)
+            for nested in (record.get("roster") or []) + (record.get("teams") or []):
+                added += self.add(nested.get("name", ""), nested.get("url", ""), updated_at=now, replace=False)
+        return added
+
+    def touch(self, url):
+        """Count a view of an entity (raises it in future rankings)."""
+        doc_id = self._doc_ids.get(entity_key(url))
+        if doc_id is not None:
+            with self._lock:
+                self._docs[doc_id]["hits"] += 1
+                self._update_rank(doc_id)
+                self._cache.clear()
+
+    def complete(self, query, k=10, types=None):
+        """
+        Top-k entities whose name (or a later word of it) starts with the query.
+
+        Args:
+            query: Typed text (any case/diacritics)
+            k: Max results
+            types: Optional set of entity types to keep
+
+        Returns:
+            List of dicts with name, type and url
+        """
+        prefix = " ".join(tokenize(query))
+        if not prefix:
+            return []
+        cache_key = (prefix, k, frozenset(types) if types else None)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            lo = bisect_left(self._keys, prefix)
+            hi = bisect_left(self._keys, prefix + "\uffff", lo)
+            matched = set(self._key_docs[lo:hi])
+            docs = self._docs
+            if types:
+                matched = [d for d in matched if docs[d]["type"] in types]
+            top = heapq.nsmallest(k, matched, key=self._rank.__getitem__)
+            results = [{"name": docs[d]["name"], "type": docs[d]["type"], "url": docs[d]["url"]} for d in top]
+
+            if len(self._cache) >= AUTOCOMPLETE_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[cache_key] = results
+        return results
+
+    def _new_doc(self, name, url, entity_type, updated_at, key):
+        doc_id = len(self._docs)
+        self._doc_ids[key] = doc_id
+        self._docs.append({
+            "name": name,
+            "type": entity_type,
+            "url": absolute_url(url),
+            "updated_at": updated_at or 0,
+            "hits": 0,
+        })
+        self._rank.append(None)
+        self._update_rank(doc_id)
+        return doc_id
+
+    def _update_rank(self, doc_id):
+        doc = self._docs[doc_id]
+        self._rank[doc_id] = (-doc["hits"], -doc["updated_at"], len(doc["name"]))
+
+    def _remove_keys(self, doc_id, name):
+        for prefix_key in _completion_keys(name):
+            i = bisect_left(self._keys, prefix_key)
+            while i < len(self._keys) and self._keys[i] == prefix_key:
+                if self._key_docs[i] == doc_id:
+                    del self._keys[i]
+                    del self._key_docs[i]
+                    break
+                i += 1
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the completer from every stored player, team and tournament (one sort)."""
+        completer = cls()
+        pairs = []
+        for entity_type, name, url, updated_at in store.search_entries():
+            key = entity_key(url)
+            if key is None or key in completer._doc_ids:
+                continue
+            doc_id = completer._new_doc(name, url, entity_type, updated_at, key)
+            pairs.extend((prefix_key, doc_id) for prefix_key in _completion_keys(name))
+        pairs.sort()
+        completer._keys = [key for key, _ in pairs]
+        completer._key_docs = [doc_id for _, doc_id in pairs]
+        return completer
+
+
+def _completion_keys(name):
+    """Folded name suffixes starting at each word: 'Cansu Özbay' → ['cansu ozbay', 'ozbay']."""
+    tokens = tokenize(name)
+    return {" ".join(tokens[i:]) for i in range(len(tokens))}
+
+
+def search_site(scraper, query, index=None, deadline=None):
+    """
+    Search for players, teams and tournaments.
+    With an index the local results are returned when there are any; the
+    site search page is only used as a fallback, and its results are added
+    to the index.
+
+    Args:
+        scraper: VolleyboxScraper instance
+        query: Search term
+        index: Optional SearchIndex to answer from first
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
+
+    Returns:
+        List of dicts with name, type and url of each result
+    """
+    if index is not None:
+        results = index.search(query)
+        if results:
+            console.print(f"[bold green]✓ {len(results)} sonuç yerel dizinden bulundu[/bold green]")
+            return results
+
+    console.print(f"[bold cyan]🔍 Aranıyor: {query}[/bold cyan]")
+
+    url = f"{BASE_URL}/{scraper.lang}/search"
+    soup = scraper.get_page(url, params={"q": query}, deadline=deadline)
+
+    if not soup:
+        return []
+
+    results = parse_search_results(soup)
+    if index is not None:
+        # Search page names carry extra labels; never let them replace scraped names
+        index.add_records(results, replace=False)
+    console.print(f"[bold green]✓ {len(results)} sonuç bulundu[/bold green]")
+    return results
+
+
+def search_local(query, db_path=None, limit=20):
+    """
+    Search the local store without opening a browser.
+
+    Args:
+        query: Search term
+        db_path: SQLite store path (default: the store's DEFAULT_DB_PATH)
+        limit: Max results
+
+    Returns:
+        List of result dicts (empty if there is no store yet or nothing matches)
+    """
+    db_path = db_path or DEFAULT_DB_PATH
+    if not os.path.exists(db_path):
+        return []
+    with VolleyboxStore(db_path) as store:
+        return SearchIndex.from_store(store).search(query, limit=limit)
+
+
+def parse_search_results(soup):
+    """Extract unique player/team/tournament links from a search results page."""
+    results = []
+    seen = set()
+
+    for link in soup.select("a"):
+        text = link.get_text(strip=True)
+        if not text or len(text) < 2:
+            continue
+
+        href = link.get("href", "")
+        key = classify_href(href)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+
+        results.append({
+            "name": text,
+            "type": key.type,
+            "url": absolute_url(href),
+        })
+
+    return results
@@ -0,0 +1,479 @@
+"""
+Standalone scraper service for women.volleybox.net
+Owns the one browser, its rate limiter and a result cache, and exposes the
+scrape functions over a small HTTP/JSON RPC, so any number of stateless API
+worker processes can share a single Chromium instead of each launching
+their own and fighting over browser_data.
+
+Kullanım:
+    python -m scraper.service --port 8765
+    VOLLEYBOX_SCRAPER_SERVICE=http://127.0.0.1:8765 uvicorn api.main:app --workers 4
+
+Endpoints:
+    GET  /health                   → status, cache and call counters
+    POST /call   {op, args, kwargs} → {"result": ...}
+    POST /stream {op, args, kwargs} → NDJSON: {"progress": [...]}, {"item": {...}}, {"done": n}
+"""
+
+import json
+import math
+import time
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rich.console import Console
+
+from .core import Deadline, ScrapeCancelled, VolleyboxScraper
+from .teams import scrape_team_list, scrape_team_profile
+from .players import scrape_player_list, scrape_player_profile
+from .tournaments import scrape_tournament_list, scrape_tournament_detail, iter_tournament_matches
+from .transfers import scrape_transfers
+from .search import search_site
+from .urls import entity_key
+
+console = Console()
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Seconds a client waits for one call (detail scrapes can sit behind a Cloudflare check)
+CLIENT_TIMEOUT = 600
+# Calls allowed to run or wait for the browser at once; more are refused with 503
+MAX_PENDING_CALLS = 16
+# Retry-After (seconds) sent with a 503
+BUSY_RETRY_AFTER = 5
+# Results kept in the service cache; least recently used ones are evicted first
+MAX_CACHE_ENTRIES = 1024
+
+
+def _warm_up(scraper, deadline=None):
+    return scraper.warm_up(deadline=deadline)
+
+
+# RPC name → scrape function taking the scraper as first argument
+OPERATIONS = {
+    "team_list": scrape_team_list,
+    "team_profile": scrape_team_profile,
+    "player_list": scrape_player_list,
+    "player_profile": scrape_player_profile,
+    "tournament_list": scrape_tournament_list,
+    "tournament_detail": scrape_tournament_detail,
+    "tournament_matches": iter_tournament_matches,
+    "transfers": scrape_transfers,
+    "search": search_site,
+    "warm_up": _warm_up,
+}
+
+# Operations that yield records and report progress (served on /stream)
+STREAM_OPERATIONS = {"tournament_matches"}
+
+# Seconds a service-side result stays cached, per operation (0 = never cached)
+SERVICE_CACHE_TTLS = {
+    "team_list": 6 * 3600,
+    "team_profile": 3600,
+    "player_list": 6 * 3600,
+    "player_profile": 6 * 3600,
+    "tournament_list": 6 * 3600,
+    "tournament_detail": 15 * 60,
+    "transfers": 15 * 60,
+    "search": 3600,
+}
+
+
+class ServiceError(RuntimeError):
+    """Raised by ScraperClient when the service reports an error or is unreachable."""
+
+
+class ServiceBusy(ServiceError):
+    """Raised when the service already has MAX_PENDING_CALLS calls running or waiting."""
+
+    def __init__(self, retry_after=BUSY_RETRY_AFTER):
+        super().__init__(f"Scraper service is busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ScraperService:
+    """
+    Serialized, cached access to one VolleyboxScraper.
+
+    Calls run one at a time on the browser. Identical concurrent calls share
+    one run (single-flight), and results are cached per operation TTL, so
+    many API workers asking for the same page cost one page load. Waiting for
+    the browser or a shared run is bounded by the caller's deadline, and at
+    most max_pending calls may run or wait at once. The cache is an LRU of at
+    most max_cache_entries results; expired ones are dropped on read and write.
+    """
+
+    def __init__(self, scraper, max_pending=MAX_PENDING_CALLS, max_cache_entries=MAX_CACHE_ENTRIES):
+        self.scraper = scraper
+        self.max_pending = max_pending
+        self.max_cache_entries = max_cache_entries
+        self._browser_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        # key → (expires_at, result), least recently used first
+        self._cache = OrderedDict()
+        self._pending = 0
+        self.stats = {
+            "calls": 0, "cache_hits": 0, "coalesced": 0, "errors": 0, "streams": 0, "rejected": 0, "timeouts": 0,
+            "evictions": 0,
+        }
+
+    def call(self, op, args=(), kwargs=None):
+        """
+        Run an operation (cached and coalesced) and return its result.
+        A numeric 'deadline' kwarg is the caller's time budget in seconds.
+        """
+        func = OPERATIONS[op]
+        kwargs = _with_deadline(kwargs)
+        key = _call_key(op, args, kwargs)
+        ttl = SERVICE_CACHE_TTLS.get(op, 0)
+
+        deadline = kwargs.get("deadline")
+
+        with self._lock:
+            self.stats["calls"] += 1
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                return cached
+            self._reserve()
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+
+        try:
+            if not owner:
+                try:
+                    return future.result(timeout=_wait_seconds(deadline))
+                except TimeoutError:
+                    self.stats["timeouts"] += 1
+                    raise ScrapeCancelled(f"{op}: deadline exceeded waiting for a shared call") from None
+
+            try:
+                with self._browser(op, deadline):
+                    result = func(self.scraper, *args, **kwargs)
+            except Exception as e:
+                self.stats["errors"] += 1
+                future.set_exception(e)
+                raise
+            else:
+                if ttl and result:
+                    with self._lock:
+                        self._cache_put(key, result, ttl)
+                future.set_result(result)
+                return result
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stream(self, op, args=(), kwargs=None, emit=None):
+        """Run a streaming operation, passing each progress report and record to emit(message)."""
+        func = OPERATIONS[op]
+        kwargs = _with_deadline(kwargs)
+        with self._lock:
+            self.stats["streams"] += 1
+            self._reserve()
+        count = 0
+        try:
+            with self._browser(op, kwargs.get("deadline")):
+                kwargs["progress_callback"] = lambda *progress: emit({"progress": list(progress)})
+                for item in func(self.scraper, *args, **kwargs):
+                    emit({"item": item})
+                    count += 1
+        finally:
+            with self._lock:
+                self._pending -= 1
+        return count
+
+    def _cache_get(self, key):
+        """Cached result or None; an expired entry is dropped (caller holds self._lock)."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _cache_put(self, key, result, ttl):
+        """Cache a result, dropping expired entries and then the least recently used (caller holds self._lock)."""
+        now = time.time()
+        self._cache[key] = (now + ttl, result)
+        self._cache.move_to_end(key)
+        for stale in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+            del self._cache[stale]
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _reserve(self):
+        """Count a call as pending (caller holds self._lock); ServiceBusy when full."""
+        if self._pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise ServiceBusy()
+        self._pending += 1
+
+    @contextmanager
+    def _browser(self, op, deadline=None):
+        """Hold the browser, waiting no longer than the caller's deadline allows."""
+        if not self._browser_lock.acquire(timeout=_wait_seconds(deadline)):
+            self.stats["timeouts"] += 1
+            raise ScrapeCancelled(f"{op}: deadline exceeded waiting for the browser")
+        try:
+            yield
+        finally:
+            self._browser_lock.release()
+
+    def health(self):
+        return {
+            "status": "ok",
+            "browser_busy": self._browser_lock.locked(),
+            "inflight": len(self._inflight),
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "cache_entries": len(self._cache),
+            "max_cache_entries": self.max_cache_entries,
+            **self.stats,
+        }
+
+
+def _with_deadline(kwargs):
+    """Turn a 'deadline' in seconds sent by a client into a Deadline."""
+    kwargs = dict(kwargs or {})
+    if kwargs.get("deadline") is not None:
+        kwargs["deadline"] = Deadline(float(kwargs["deadline"]))
+    return kwargs
+
+
+def _wait_seconds(deadline):
+    """Seconds a call may wait for the browser or a shared run."""
+    if deadline is None:
+        return CLIENT_TIMEOUT
+    return max(0, min(deadline.remaining(), CLIENT_TIMEOUT))
+
+
+def _call_key(op, args, kwargs):
+    """Cache/coalescing key; entity URLs collapse to their entity key (deadlines are ignored)."""
+    def normalize(value):
+        if isinstance(value, str):
+            key = entity_key(value)
+            return f"{key.type}:{key.id}" if key else value.strip().lower()
+        return value
+
+    return json.dumps(
+        [op, [normalize(a) for a in args], {k: normalize(v) for k, v in sorted(kwargs.items()) if k != "deadline"}],
+        default=str,
+    )
+
+
+def _make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                self._send_json(200, service.health())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            path = self.path.rstrip("/")
+            if path not in ("/call", "/stream"):
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                op = request["op"]
+                args = request.get("args", [])
+                kwargs = request.get("kwargs", {})
+            except (ValueError, KeyError) as e:
+                self._send_json(400, {"error": f"bad request: {e}"})
+                return
+            streaming = op in STREAM_OPERATIONS
+            if op not in OPERATIONS or streaming != (path == "/stream"):
+                self._send_json(400, {"error": f"unknown operation for {path}: {op!r}"})
+                return
+
+            if streaming:
+                self._stream(op, args, kwargs)
+                return
+            try:
+                result = service.call(op, args, kwargs)
+            except ServiceBusy as e:
+                self._send_json(503, {"error": str(e), "busy": True}, {"Retry-After": str(e.retry_after)})
+                return
+            except ScrapeCancelled as e:
+                self._send_json(504, {"error": str(e), "cancelled": True})
+                return
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            self._send_json(200, {"result": result})
+
+        def _stream(self, op, args, kwargs):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+
+            def emit(message):
+                self.wfile.write(json.dumps(message, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+            try:
+                count = service.stream(op, args, kwargs, emit)
+                emit({"done": count})
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            except ServiceBusy as e:
+                emit({"error": str(e), "busy": True})
+            except ScrapeCancelled as e:
+                emit({"error": str(e), "cancelled": True})
+            except Exception as e:
+                emit({"error": str(e)})
+
+        def _send_json(self, status, data, headers=None):
+            body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, scraper=None):
+    """Run the scraper service until interrupted."""
+    scraper = scraper or VolleyboxScraper()
+    server = ThreadingHTTPServer((host, port), _make_handler(ScraperService(scraper)))
+    server.daemon_threads = True
+    console.print(f"[bold cyan]🛰  Scraper servisi çalışıyor: http://{host}:{port}[/bold cyan]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        scraper.close()
+
+
+class ScraperClient:
+    """
+    HTTP client for a running scraper service.
+
+    Usage:
+        client = ScraperClient("http://127.0.0.1:8765")
+        team = client.call("team_profile", url)
+        for match in client.stream("tournament_matches", url):
+            ...
+    """
+
+    def __init__(self, base_url, timeout=CLIENT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def call(self, op, *args, **kwargs):
+        with self._post("/call", op, args, kwargs) as response:
+            return json.loads(response.read())["result"]
+
+    def stream(self, op, *args, progress_callback=None, **kwargs):
+        """Yield records of a streaming operation, forwarding progress to progress_callback."""
+        with self._post("/stream", op, args, kwargs) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if "item" in message:
+                    yield message["item"]
+                elif "progress" in message:
+                    if progress_callback:
+                        progress_callback(*message["progress"])
+                elif "error" in message:
+                    if message.get("busy"):
+                        raise ServiceBusy()
+                    raise (ScrapeCancelled if message.get("cancelled") else ServiceError)(message["error"])
+                elif "done" in message:
+                    return
+
+    def health(self):
+        with urllib.request.urlopen(f"{self.base_url}/health", timeout=10) as response:
+            return json.loads(response.read())
+
+    def _post(self, path, op, args, kwargs):
+        timeout = self.timeout
+        deadline = kwargs.pop("deadline", None)
+        if deadline is not None:
+            # The service gets the remaining budget; the call gives up shortly after it
+            remaining = deadline.remaining()
+            deadline.check()
+            if remaining < math.inf:
+                kwargs["deadline"] = remaining
+                timeout = min(timeout, remaining + 5)
+        body = json.dumps({"op": op, "args": list(args), "kwargs": kwargs}, default=str).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.base_url}{path}", data=body, headers={"Content-Type": "application/json"}
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=timeout)
+        except urllib.error.HTTPError as e:
+            try:
+                error = json.loads(e.read())
+            except ValueError:
+                error = {}
+            message = error.get("error", str(e))
+            if error.get("busy"):
+                raise ServiceBusy(int(e.headers.get("Retry-After") or BUSY_RETRY_AFTER)) from e
+            if error.get("cancelled"):
+                raise ScrapeCancelled(message) from e
+            raise ServiceError(f"{op}: {message}") from e
+        except urllib.error.URLError as e:
+            raise ServiceError(f"Scraper service unreachable at {self.base_url}: {e.reason}") from e
+
+
+def remote_operations(client):
+    """
+    Proxies with the same signatures as OPERATIONS that run on a remote
+    service; the local scraper argument is ignored.
+    """
+    def proxy(op):
+        if op in STREAM_OPERATIONS:
+            def run(scraper, *args, progress_callback=None, **kwargs):
+                yield from client.stream(op, *args, progress_callback=progress_callback, **kwargs)
+        else:
+            def run(scraper, *args, **kwargs):
+                return client.call(op, *args, **kwargs)
+        run.__name__ = op
+        return run
+
+    return {op: proxy(op) for op in OPERATIONS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Volleybox scraper servisi")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Dinlenecek adres")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port")
+    parser.add_argument("--lang", choices=["tr", "en"], default="tr", help="Site dili")
+    parser.add_argument("--headless", action="store_true", help="Tarayıcıyı görünmez çalıştır")
+    args = parser.parse_args()
+    serve(args.host, args.port, VolleyboxScraper(lang=args.lang, headless=args.headless))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,544 @@
+"""
+Local SQLite warehouse for scraped data.
+Upserts players, teams, tournaments, matches, standings and transfers into
+an embedded database keyed by canonical entity id (see scraper.urls), so
+consumers can query indexed tables instead of re-scraping or reloading
+whole JSON files.
+
+Each entity table keeps typed, indexed columns for querying plus the full
+scraped record as JSON in `data`. Upserts merge into existing rows: a
+summary from a list crawl never blanks out fields from an earlier profile
+scrape. `updated_at` (unix time) records when a row was last scraped.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from rich.console import Console
+
+from .models import Match, Player, Team, Transfer, StandingRow
+from .urls import entity_id, entity_key
+
+console = Console()
+
+DEFAULT_DB_PATH = os.environ.get(
+    "VOLLEYBOX_DB",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "volleybox.db"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    name TEXT, url TEXT, position TEXT, nationality TEXT, birth_date TEXT,
+    height INTEGER, weight INTEGER, current_team TEXT,
+    data TEXT NOT NULL, updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY,
+    name TEXT, url TEXT, country TEXT, league TEXT, city TEXT,
+    data TEXT NOT NULL, updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS team_players (
+    team_id INTEGER NOT NULL, player_id INTEGER NOT NULL,
+    number INTEGER, position TEXT, updated_at REAL NOT NULL,
+    PRIMARY KEY (team_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    tournament_id TEXT PRIMARY KEY,
+    name TEXT, url TEXT, season TEXT, country TEXT, team_count INTEGER,
+    data TEXT NOT NULL, updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER PRIMARY KEY,
+    tournament_id TEXT, tournament TEXT, round TEXT,
+    date_timestamp INTEGER, date_str TEXT,
+    home_team TEXT, away_team TEXT, home_sets INTEGER, away_sets INTEGER,
+    venue TEXT, updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS standings (
+    tournament_id TEXT NOT NULL, group_name TEXT NOT NULL, team_id INTEGER NOT NULL,
+    team TEXT, rank INTEGER, points INTEGER, wins INTEGER, losses INTEGER,
+    sets_won INTEGER, sets_lost INTEGER, updated_at REAL NOT NULL,
+    PRIMARY KEY (tournament_id, group_name, team_id)
+);
+CREATE TABLE IF NOT EXISTS transfers (
+    player_id INTEGER NOT NULL, from_team_id INTEGER NOT NULL, to_team_id INTEGER NOT NULL,
+    player_name TEXT, from_team TEXT, to_team TEXT, position TEXT, nationality TEXT,
+    date TEXT, data TEXT NOT NULL, first_seen REAL NOT NULL, updated_at REAL NOT NULL,
+    PRIMARY KEY (player_id, from_team_id, to_team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_players_team ON players (current_team);
+CREATE INDEX IF NOT EXISTS idx_team_players_player ON team_players (player_id);
+CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches (tournament_id, date_timestamp);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (date_timestamp);
+CREATE INDEX IF NOT EXISTS idx_matches_home ON matches (home_team);
+CREATE INDEX IF NOT EXISTS idx_matches_away ON matches (away_team);
+CREATE INDEX IF NOT EXISTS idx_standings_team ON standings (team_id);
+CREATE INDEX IF NOT EXISTS idx_transfers_to_team ON transfers (to_team_id);
+CREATE INDEX IF NOT EXISTS idx_transfers_from_team ON transfers (from_team_id);
+CREATE INDEX IF NOT EXISTS idx_transfers_date ON transfers (date);
+"""
+
+# Singular entity names (exporter.detect_entity) → table
+ENTITY_TABLES = {
+    "player": "players",
+    "team": "teams",
+    "tournament": "tournaments",
+    "match": "matches",
+    "transfer": "transfers",
+}
+
+# Key column of each entity table
+KEY_COLUMNS = {
+    "players": "player_id",
+    "teams": "team_id",
+    "tournaments": "tournament_id",
+    "matches": "match_id",
+}
+
+# Filters accepted by VolleyboxStore.page: filter name → column (case-insensitive match)
+LIST_FILTERS = {
+    "players": {"position": "position", "country": "nationality", "team": "current_team"},
+    "teams": {"country": "country", "league": "league"},
+    "tournaments": {"country": "country", "season": "season"},
+    "transfers": {"position": "position", "country": "nationality"},
+}
+
+
+def _merge_sql(table, key, columns):
+    """INSERT ... ON CONFLICT that keeps existing values when the new ones are empty."""
+    all_columns = [key] + columns + ["data", "updated_at"]
+    updates = [f"{c} = COALESCE(NULLIF(excluded.{c}, ''), {table}.{c})" for c in columns]
+    updates.append(f"data = json_patch({table}.data, excluded.data)")
+    updates.append("updated_at = excluded.updated_at")
+    return (
+        f"INSERT INTO {table} ({', '.join(all_columns)}) "
+        f"VALUES ({', '.join('?' for _ in all_columns)}) "
+        f"ON CONFLICT({key}) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+_PLAYER_COLUMNS = ["name", "url", "position", "nationality", "birth_date", "height", "weight", "current_team"]
+_TEAM_COLUMNS = ["name", "url", "country", "league", "city"]
+_TOURNAMENT_COLUMNS = ["name", "url", "season", "country", "team_count"]
+
+_UPSERT_PLAYER = _merge_sql("players", "player_id", _PLAYER_COLUMNS)
+_UPSERT_TEAM = _merge_sql("teams", "team_id", _TEAM_COLUMNS)
+_UPSERT_TOURNAMENT = _merge_sql("tournaments", "tournament_id", _TOURNAMENT_COLUMNS)
+
+_UPSERT_MATCH = """
+INSERT INTO matches (match_id, tournament_id, tournament, round, date_timestamp, date_str,
+                     home_team, away_team, home_sets, away_sets, venue, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(match_id) DO UPDATE SET
+    tournament_id = COALESCE(excluded.tournament_id, matches.tournament_id),
+    tournament = excluded.tournament, round = excluded.round,
+    date_timestamp = excluded.date_timestamp, date_str = excluded.date_str,
+    home_team = excluded.home_team, away_team = excluded.away_team,
+    home_sets = excluded.home_sets, away_sets = excluded.away_sets,
+    venue = excluded.venue, updated_at = excluded.updated_at
+"""
+
+_UPSERT_STANDING = """
+INSERT OR REPLACE INTO standings (tournament_id, group_name, team_id, team, rank, points,
+                                  wins, losses, sets_won, sets_lost, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_TEAM_PLAYER = """
+INSERT OR REPLACE INTO team_players (team_id, player_id, number, position, updated_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_UPSERT_TRANSFER = """
+INSERT INTO transfers (player_id, from_team_id, to_team_id, player_name, from_team, to_team,
+                       position, nationality, date, data, first_seen, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(player_id, from_team_id, to_team_id) DO UPDATE SET
+    player_name = excluded.player_name, from_team = excluded.from_team, to_team = excluded.to_team,
+    position = excluded.position, nationality = excluded.nationality,
+    date = COALESCE(NULLIF(excluded.date, ''), transfers.date),
+    data = json_patch(transfers.data, excluded.data), updated_at = excluded.updated_at
+"""
+
+# Minimal rows for entities only seen as links (never overwrite richer rows).
+# Stubs get updated_at = 0 so they always count as stale.
+_INSERT_PLAYER_STUB = """
+INSERT OR IGNORE INTO players (player_id, name, url, position, data, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INSERT_TEAM_STUB = """
+INSERT OR IGNORE INTO teams (team_id, name, url, data, updated_at) VALUES (?, ?, ?, ?, ?)
+"""
+
+
+class VolleyboxStore:
+    """
+    Embedded SQLite store for scraped entities, keyed by canonical entity id.
+
+    Safe to share between threads: writes are serialized with a lock and the
+    database runs in WAL mode so readers are not blocked by writers.
+
+    Usage:
+        with VolleyboxStore() as store:
+            store.upsert("matches", matches)
+            rows = store.matches(tournament_id="o38677")
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._listeners = []
+
+    # --- Upserts ---
+
+    def upsert(self, entity, records):
+        """
+        Upsert records of any entity type.
+
+        Args:
+            entity: 'players', 'teams', 'tournaments', 'matches', 'transfers'
+                (singular forms from exporter.detect_entity also work)
+            records: Iterable of scraped dicts
+
+        Returns:
+            Number of records upserted
+        """
+        entity = ENTITY_TABLES.get(entity, entity)
+        handler = {
+            "players": self.upsert_players,
+            "teams": self.upsert_teams,
+            "tournaments": self.upsert_tournaments,
+            "matches": self.upsert_matches,
+            "transfers": self.upsert_transfers,
+        }.get(entity)
+        if handler is None:
+            raise ValueError(f"Unknown entity: {entity!r}")
+        if not self._listeners:
+            return handler(records)
+
+        records = list(records)
+        count = handler(records)
+        for listener in self._listeners:
+            try:
+                listener(entity, records)
+            except Exception as e:
+                console.print(f"[yellow]⚠ Upsert dinleyicisi hata verdi: {e}[/yellow]")
+        return count
+
+    def add_listener(self, callback):
+        """Call callback(entity, records) after every upsert() (e.g. to update a search index)."""
+        self._listeners.append(callback)
+
+    def upsert_players(self, records):
+        now = time.time()
+        rows = []
+        for data in records:
+            p = Player.from_dict(data)
+            if p.player_id is None:
+                continue
+            rows.append((
+                p.player_id, p.name, p.url, p.position, p.nationality, p.birth_date,
+                p.height, p.weight, p.current_team, _json(_non_empty(data)), now,
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_PLAYER, rows)
+        return len(rows)
+
+    def upsert_teams(self, records):
+        """Upsert teams; a scraped roster also replaces the team's player links."""
+        now = time.time()
+        team_rows = []
+        roster_rows = []
+        stub_rows = []
+        roster_team_ids = []
+        for data in records:
+            t = Team.from_dict(data)
+            if t.team_id is None:
+                continue
+            team_rows.append((t.team_id, t.name, t.url, t.country, t.league, t.city, _json(_non_empty(data)), now))
+            if t.roster:
+                roster_team_ids.append((t.team_id,))
+                for p in t.roster:
+                    if p.player_id is None:
+                        continue
+                    roster_rows.append((t.team_id, p.player_id, p.number, p.position, now))
+                    stub_rows.append((p.player_id, p.name, p.url, p.position, _json(p.to_dict()), 0))
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_TEAM, team_rows)
+            self._conn.executemany("DELETE FROM team_players WHERE team_id = ?", roster_team_ids)
+            self._conn.executemany(_UPSERT_TEAM_PLAYER, roster_rows)
+            self._conn.executemany(_INSERT_PLAYER_STUB, stub_rows)
+        return len(team_rows)
+
+    def upsert_tournaments(self, records):
+        """Upsert tournaments with their team list and standings."""
+        now = time.time()
+        tournament_rows = []
+        standing_rows = []
+        team_stubs = []
+        standings_ids = []
+        for data in records:
+            tournament_id = entity_id(data.get("url", ""))
+            if tournament_id is None:
+                continue
+            tournament_rows.append((
+                tournament_id, data.get("name", ""), data.get("url", ""), data.get("season", ""),
+                data.get("country", ""), data.get("team_count"), _json(_non_empty(data)), now,
+            ))
+            for team in data.get("teams", []):
+                team_id = entity_id(team.get("url", ""))
+                if team_id is not None:
+                    team_stubs.append((team_id, team.get("name", ""), team.get("url", ""), _json(team), 0))
+            if data.get("standings"):
+                standings_ids.append((tournament_id,))
+                for row in map(StandingRow.from_dict, data["standings"]):
+                    if row.team_id is None:
+                        continue
+                    standing_rows.append((
+                        tournament_id, row.group, row.team_id, row.team, row.rank, row.points,
+                        row.wins, row.losses, row.sets_won, row.sets_lost, now,
+                    ))
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_TOURNAMENT, tournament_rows)
+            self._conn.executemany(_INSERT_TEAM_STUB, team_stubs)
+            self._conn.executemany("DELETE FROM standings WHERE tournament_id = ?", standings_ids)
+            self._conn.executemany(_UPSERT_STANDING, standing_rows)
+        return len(tournament_rows)
+
+    def upsert_matches(self, records, tournament_id=None):
+        """
+        Upsert matches. Match records carry their tournament_id; pass one
+        explicitly for older records scraped without it.
+        """
+        now = time.time()
+        rows = []
+        for data in records:
+            m = data if isinstance(data, Match) else Match.from_dict(data)
+            if m.match_id is None:
+                continue
+            rows.append((
+                m.match_id, m.tournament_id or tournament_id, m.tournament, m.round,
+                m.date_timestamp, m.date_str, m.home_team, m.away_team,
+                m.home_sets, m.away_sets, m.venue, now,
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_MATCH, rows)
+        return len(rows)
+
+    def upsert_transfers(self, records):
+        """Upsert transfers keyed by (player id, from team id, to team id); 0 = unknown team."""
+        now = time.time()
+        rows = []
+        for data in records:
+            t = Transfer.from_dict(data)
+            if t.player_id is None:
+                continue
+            rows.append((
+                t.player_id, t.from_team_id or 0, t.to_team_id or 0, t.player_name,
+                t.from_team, t.to_team, t.position, t.nationality, t.date, _json(_non_empty(data)), now, now,
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_TRANSFER, rows)
+        return len(rows)
+
+    # --- Queries ---
+
+    def get(self, entity, key):
+        """
+        Fetch one stored record by entity id or URL.
+
+        Returns:
+            Dict with the scraped record plus 'updated_at', or None
+        """
+        entity = ENTITY_TABLES.get(entity, entity)
+        if isinstance(key, str):
+            if "/" in key:
+                key = entity_id(key)
+            elif key.isdigit():
+                key = int(key)
+        column = KEY_COLUMNS[entity]
+        row = self._query_one(f"SELECT * FROM {entity} WHERE {column} = ?", (key,))
+        if row is None:
+            return None
+        return _row_to_record(row)
+
+    def get_by_url(self, url):
+        """Fetch a stored player, team or tournament by any of its URLs."""
+        key = entity_key(url)
+        if key is None:
+            return None
+        return self.get(f"{key.type}s", key.id)
+
+    def matches(self, tournament_id=None, team=None, since=None, until=None):
+        """Stored matches filtered by tournament, team name and date range, ordered by date."""
+        clauses, params = [], []
+        if tournament_id:
+            clauses.append("tournament_id = ?")
+            params.append(tournament_id)
+        if team:
+            clauses.append("(home_team = ? OR away_team = ?)")
+            params.extend([team, team])
+        if since is not None:
+            clauses.append("date_timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("date_timestamp < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(f"SELECT * FROM matches {where} ORDER BY date_timestamp, match_id", params)
+        return [_row_to_record(row) for row in rows]
+
+    def standings(self, tournament_id):
+        rows = self._query(
+            "SELECT * FROM standings WHERE tournament_id = ? ORDER BY group_name, rank", (tournament_id,)
+        )
+        return [dict(row) for row in rows]
+
+    def team_players(self, team_id):
+        """Players linked to a team roster."""
+        rows = self._query(
+            "SELECT p.*, tp.number AS number FROM team_players tp "
+            "JOIN players p ON p.player_id = tp.player_id WHERE tp.team_id = ? ORDER BY tp.number",
+            (team_id,),
+        )
+        return [_row_to_record(row) | {"number": row["number"]} for row in rows]
+
+    def transfers(self, player_id=None, team_id=None, limit=None):
+        """Stored transfers for a player or involving a team, newest first."""
+        clauses, params = [], []
+        if player_id is not None:
+            clauses.append("player_id = ?")
+            params.append(player_id)
+        if team_id is not None:
+            clauses.append("(from_team_id = ? OR to_team_id = ?)")
+            params.extend([team_id, team_id])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM transfers {where} ORDER BY first_seen DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [_row_to_record(row) for row in self._query(sql, params)]
+
+    def page(self, entity, limit=50, after=None, **filters):
+        """
+        One page of stored records using keyset pagination.
+        Players, teams and tournaments are ordered by id; transfers newest first.
+
+        Args:
+            entity: 'players', 'teams', 'tournaments' or 'transfers'
+            limit: Page size
+            after: Sort key of the last record of the previous page (None = first page)
+            **filters: Column filters from LIST_FILTERS, e.g. country="Türkiye"
+
+        Returns:
+            (records, next_after) where next_after is None on the last page
+        """
+        entity = ENTITY_TABLES.get(entity, entity)
+        allowed = LIST_FILTERS.get(entity)
+        if allowed is None:
+            raise ValueError(f"Unknown entity: {entity!r}")
+
+        clauses, params = [], []
+        for name, value in filters.items():
+            if name not in allowed:
+                raise ValueError(f"Unknown filter for {entity}: {name!r}")
+            if value:
+                clauses.append(f"{allowed[name]} = ? COLLATE NOCASE")
+                params.append(value)
+
+        if entity == "transfers":
+            # rowid follows insertion order, so newest transfers come first
+            sort_column, direction, comparison = "rowid", "DESC", "<"
+        else:
+            sort_column, direction, comparison = KEY_COLUMNS[entity], "ASC", ">"
+        if after is not None:
+            clauses.append(f"{sort_column} {comparison} ?")
+            params.append(after)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(
+            f"SELECT rowid AS _rowid, * FROM {entity} {where} ORDER BY {sort_column} {direction} LIMIT ?",
+            params + [limit + 1],
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_after = None
+        if has_more:
+            last = rows[-1]
+            next_after = last["_rowid"] if entity == "transfers" else last[sort_column]
+        return [_row_to_record(row) for row in rows], next_after
+
+    def recent(self, entity, limit=100):
+        """Most recently scraped records of an entity (link-only stubs excluded)."""
+        entity = ENTITY_TABLES.get(entity, entity)
+        rows = self._query(
+            f"SELECT * FROM {entity} WHERE updated_at > 0 ORDER BY updated_at DESC LIMIT ?", (int(limit),)
+        )
+        return [_row_to_record(row) for row in rows]
+
+    def search_entries(self):
+        """Yield (type, name, url, updated_at) for every stored player, team and tournament with a name."""
+        for entity_type, table in (("player", "players"), ("team", "teams"), ("tournament", "tournaments")):
+            for row in self._query(f"SELECT name, url, updated_at FROM {table} WHERE name IS NOT NULL AND name != ''"):
+                yield entity_type, row["name"], row["url"], row["updated_at"]
+
+    def last_updated(self, entity, **filters):
+        """
+        Most recent updated_at for an entity (optionally filtered by column values).
+        Stubs (updated_at = 0) are ignored, so None means nothing was scraped yet.
+        """
+        clauses = " AND ".join(["updated_at > 0"] + [f"{column} = ?" for column in filters])
+        row = self._query_one(f"SELECT MAX(updated_at) AS ts FROM {entity} WHERE {clauses}", list(filters.values()))
+        return row["ts"] if row else None
+
+    def counts(self):
+        """Row count per table."""
+        tables = ["players", "teams", "team_players", "tournaments", "matches", "standings", "transfers"]
+        return {t: self._query_one(f"SELECT COUNT(*) AS n FROM {t}")["n"] for t in tables}
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _query_one(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _json(data):
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _non_empty(data):
+    """Drop empty values so merging a sparse record keeps earlier non-empty fields."""
+    return {k: v for k, v in data.items() if v not in ("", None, [], {})}
+
+
+def _row_to_record(row):
+    """
+    Scraped record stored in `data` plus the row's updated_at. Matches have
+    no `data` column; their record is rebuilt from the typed columns.
+    """
+    if "data" not in row.keys():
+        return Match.from_dict(dict(row)).to_dict() | {"updated_at": row["updated_at"]}
+    record = json.loads(row["data"]) if row["data"] else {}
+    record["updated_at"] = row["updated_at"]
+    return record
@@ -3,21 +3,24 @@ Team/Club scraping module for women.volleybox.net
 Handles team list and individual team profile scraping.
 """
 
-import time
-import re
+from bs4 import BeautifulSoup
 from rich.console import Console
 from rich.progress import track
 
+from .core import pause
+from .urls import PLAYER_HREF_RE, TEAM_HREF_RE, absolute_url, entity_id
+
 console = Console()
 
 
-def scrape_team_list(scraper, page_limit=5):
+def scrape_team_list(scraper, page_limit=5, deadline=None):
     """
     Scrape the team/club list.
 
     Args:
         scraper: VolleyboxScraper instance
         page_limit: Max number of pages to scrape (0 = all)
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
 
     Returns:
         List of dicts with team summary info
@@ -33,7 +36,7 @@ def scrape_team_list(scraper, page_limit=5):
 
         url = scraper.build_url("clubs")
         params = {"page": page} if page > 1 else None
-        soup = scraper.get_page(url, params=params)
+        soup = scraper.get_page(url, params=params, deadline=deadline)
 
         if not soup:
             console.print(f"  [red]Sayfa {page} çekilemedi, durduruluyor.[/red]")
@@ -50,19 +53,21 @@ def scrape_team_list(scraper, page_limit=5):
             break
 
         page_count = 0
-        seen_urls = {t.get("url", "") for t in teams}
+        seen_ids = {entity_id(t.get("url", "")) for t in teams}
 
         for item in team_items:
             href = item.get("href", "")
             # Match team URLs like /tr/name-t12345
-            if not re.search(r'-t\d+$', href):
+            match = TEAM_HREF_RE.search(href)
+            if not match:
                 continue
 
-            full_url = href if href.startswith("http") else f"https://women.volleybox.net{href}"
-
-            if full_url in seen_urls:
+            team_id = int(match.group(1))
+            if team_id in seen_ids:
                 continue
-            seen_urls.add(full_url)
+            seen_ids.add(team_id)
+
+            full_url = absolute_url(href)
 
             name = item.get_text(strip=True)
             if not name or len(name) < 2:
@@ -92,7 +97,7 @@ def scrape_team_list(scraper, page_limit=5):
             if logo_img:
                 src = logo_img.get("src", "")
                 if src:
-                    logo_url = src if src.startswith("http") else f"https://women.volleybox.net{src}"
+                    logo_url = absolute_url(src)
 
             team_data = {
                 "name": name,
@@ -128,27 +133,27 @@ def scrape_team_list(scraper, page_limit=5):
     return teams
 
 
-def scrape_team_profile(scraper, url):
+def scrape_team_profile(scraper, url, deadline=None):
     """
     Scrape a single team/club profile page using DrissionPage directly.
 
     Args:
         scraper: VolleyboxScraper instance
         url: Team profile URL
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
 
     Returns:
         Dict with detailed team info
     """
     console.print(f"[bold cyan]🏐 Takım profili çekiliyor: {url}[/bold cyan]")
 
-    page = scraper._get_page()
-    page.get(url)
+    page = scraper._navigate(url, deadline)
 
-    if not scraper._wait_for_cloudflare():
+    if not scraper._wait_for_cloudflare(deadline=deadline):
         console.print("[red]Cloudflare geçilemedi.[/red]")
         return None
     
-    time.sleep(1)
+    pause(1, deadline)
     team = {"url": url}
 
     # --- Name ---
@@ -204,20 +209,45 @@ def scrape_team_profile(scraper, url):
     except Exception as e:
         console.print(f"  [yellow]Bilgi çekme hatası: {e}[/yellow]")
 
+    # Remaining sections are parsed from the rendered HTML
+    soup = BeautifulSoup(page.html or "", "lxml")
+
     # --- Roster (div.team-roster-row) ---
     roster = []
-                        position = ""
-                        number = ""
-                        
-                        # Check previous sibling for number
-                        # Check parent text for position
-                        
-                        roster.append({
-                            "name": player_name,
-                            "url": full_url,
-                            "position": position,
-                            "number": number,
-                        })
+    seen_players = set()
+    for row in soup.select("div.team-roster-row"):
+        name_link = row.select_one(".team-roster-name a[href*='-p']")
+        if not name_link:
+            continue
+        href = name_link.get("href", "")
+        match = PLAYER_HREF_RE.search(href)
+        if not match:
+            continue
+
+        player_id = int(match.group(1))
+        if player_id in seen_players:
+            continue
+        seen_players.add(player_id)
+
+        player_name = name_link.get_text(strip=True)
+        full_url = absolute_url(href)
+
+        # Number is an input value, position is plain text
+        number = ""
+        number_el = row.select_one(".team-roster-number input")
+        if number_el:
+            number = number_el.get("value", "").strip()
+        position = ""
+        position_el = row.select_one(".team-roster-position")
+        if position_el:
+            position = position_el.get_text(strip=True)
+
+        roster.append({
+            "name": player_name,
+            "url": full_url,
+            "position": position,
+            "number": number,
+        })
 
     if roster:
         team["roster"] = roster
@@ -239,7 +269,7 @@ def scrape_team_profile(scraper, url):
     if logo:
         src = logo.get("src", "")
         if src:
-            team["logo_url"] = src if src.startswith("http") else f"https://women.volleybox.net{src}"
+            team["logo_url"] = absolute_url(src)
 
     console.print(f"[bold green]✓ Profil çekildi: {team.get('name', 'N/A')}[/bold green]")
     return team
@@ -257,14 +287,18 @@ def scrape_teams_detail(scraper, team_list, limit=0):
     Returns:
         List of detailed team dicts
     """
+    return list(iter_teams_detail(scraper, team_list, limit=limit))
+
+
+def iter_teams_detail(scraper, team_list, limit=0):
+    """
+    Generator version of scrape_teams_detail.
+    Yields each detailed team as soon as it is scraped.
+    """
     if limit:
         team_list = team_list[:limit]
 
-    detailed = []
     for team_summary in track(team_list, description="Takım detayları çekiliyor..."):
         profile = scrape_team_profile(scraper, team_summary["url"])
         if profile:
-            merged = {**team_summary, **profile}
-            detailed.append(merged)
-
-    return detailed
+            yield {**team_summary, **profile}
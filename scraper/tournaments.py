@@ -8,16 +8,23 @@ import time
 from rich.console import Console
 from rich.progress import track
 
+from .core import ScrapeCancelled, check_deadline, pause
+from .urls import TEAM_HREF_RE, TOURNAMENT_HREF_RE, absolute_url, entity_id
+
 console = Console()
 
+SEASON_RE = re.compile(r'(\d{4}/\d{2,4})')
+YEAR_PREFIX_RE = re.compile(r'\d{4}')
+
 
-def scrape_tournament_list(scraper, page_limit=5):
+def scrape_tournament_list(scraper, page_limit=5, deadline=None):
     """
     Scrape the tournament/league list.
 
     Args:
         scraper: VolleyboxScraper instance
         page_limit: Max number of pages to scrape (0 = all)
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
 
     Returns:
         List of dicts with tournament summary info
@@ -33,7 +40,7 @@ def scrape_tournament_list(scraper, page_limit=5):
 
         url = scraper.build_url("clubs-tournaments")
         params = {"page": page} if page > 1 else None
-        soup = scraper.get_page(url, params=params)
+        soup = scraper.get_page(url, params=params, deadline=deadline)
 
         if not soup:
             console.print(f"  [red]Sayfa {page} çekilemedi, durduruluyor.[/red]")
@@ -50,19 +57,21 @@ def scrape_tournament_list(scraper, page_limit=5):
             break
 
         page_count = 0
-        seen_urls = {t.get("url", "") for t in tournaments}
+        seen_ids = {entity_id(t.get("url", "")) for t in tournaments}
 
         for item in tournament_items:
             href = item.get("href", "")
             # Match tournament URLs like /tr/name-c12345
-            if not re.search(r'-c\d+$', href):
+            match = TOURNAMENT_HREF_RE.search(href)
+            if not match:
                 continue
 
-            full_url = href if href.startswith("http") else f"https://women.volleybox.net{href}"
-
-            if full_url in seen_urls:
+            tournament_id = match.group(1)
+            if tournament_id in seen_ids:
                 continue
-            seen_urls.add(full_url)
+            seen_ids.add(tournament_id)
+
+            full_url = absolute_url(href)
 
             name = item.get_text(strip=True)
             if not name or len(name) < 2:
@@ -80,7 +89,7 @@ def scrape_tournament_list(scraper, page_limit=5):
                     part = part.strip()
                     if part != name and len(part) > 1:
                         # Check if it looks like a season (e.g., 2024/25)
-                        if re.match(r'\d{4}', part):
+                        if YEAR_PREFIX_RE.match(part):
                             season = part
                         elif not country:
                             country = part
@@ -118,7 +127,7 @@ def scrape_tournament_list(scraper, page_limit=5):
     return tournaments
 
 
-def scrape_tournament_detail(scraper, url):
+def scrape_tournament_detail(scraper, url, deadline=None):
     """
     Scrape a single tournament/league detail page using DrissionPage directly.
     Navigates to the main page for name/teams and to /table for standings.
@@ -126,21 +135,21 @@ def scrape_tournament_detail(scraper, url):
     Args:
         scraper: VolleyboxScraper instance
         url: Tournament URL
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
 
     Returns:
         Dict with detailed tournament info
     """
     console.print(f"[bold cyan]🏆 Turnuva detayı çekiliyor: {url}[/bold cyan]")
 
-    page = scraper._get_page()
-    page.get(url)
+    page = scraper._navigate(url, deadline)
 
     # Wait for Cloudflare
-    if not scraper._wait_for_cloudflare():
+    if not scraper._wait_for_cloudflare(deadline=deadline):
         console.print("[red]Cloudflare geçilemedi.[/red]")
         return None
 
-    time.sleep(2)
+    pause(2, deadline)
     tournament = {"url": url}
 
     # --- Name (h1.dInline.marginRight10 or just h1) ---
@@ -154,33 +163,28 @@ def scrape_tournament_detail(scraper, url):
 
     # --- Extract season from name ---
     name = tournament.get("name", "")
-    import re as re_mod
-    season_match = re_mod.search(r'(\d{4}/\d{2,4})', name)
+    season_match = SEASON_RE.search(name)
     if season_match:
         tournament["season"] = season_match.group(1)
 
     # --- Teams from classification section ---
     teams = []
+    seen_team_ids = set()
     try:
         team_links = page.eles('xpath://a[contains(@href, "-t") and contains(@href, "/tr/")]')
         for link in team_links:
             href = link.attr('href') or ''
             text = link.text.strip() if link.text else ''
-            if re.search(r'-t\d+$', href) and text and len(text) > 1:
-                full_url = href if href.startswith('http') else f"https://women.volleybox.net{href}"
-                teams.append({"name": text, "url": full_url})
+            match = TEAM_HREF_RE.search(href)
+            if match and text and len(text) > 1:
+                team_id = int(match.group(1))
+                if team_id in seen_team_ids:
+                    continue
+                seen_team_ids.add(team_id)
+                teams.append({"name": text, "url": absolute_url(href)})
     except Exception as e:
         console.print(f"  [yellow]Takım çekme hatası: {e}[/yellow]")
 
-    # Deduplicate teams
-    seen = set()
-    unique_teams = []
-    for t in teams:
-        if t["url"] not in seen:
-            seen.add(t["url"])
-            unique_teams.append(t)
-    teams = unique_teams
-
     if teams:
         tournament["teams"] = teams
         tournament["team_count"] = len(teams)
@@ -191,11 +195,11 @@ def scrape_tournament_detail(scraper, url):
     console.print(f"  Puan tablosu çekiliyor: {table_url}")
 
     try:
-        page.get(table_url)
-        if not scraper._wait_for_cloudflare():
+        scraper._navigate(table_url, deadline)
+        if not scraper._wait_for_cloudflare(deadline=deadline):
             console.print("[yellow]  /table sayfasında Cloudflare geçilemedi[/yellow]")
         else:
-            time.sleep(3)
+            pause(3, deadline)
 
             # Get the HTML and parse with BeautifulSoup
             from bs4 import BeautifulSoup
@@ -227,7 +231,7 @@ def scrape_tournament_detail(scraper, url):
                     if name_link:
                         row_data["takım"] = name_link.get_text(strip=True)
                         href = name_link.get("href", "")
-                        row_data["team_url"] = href if href.startswith("http") else f"https://women.volleybox.net{href}"
+                        row_data["team_url"] = absolute_url(href)
 
                     # Points
                     points_el = row.select_one("div.team_points")
@@ -263,6 +267,8 @@ def scrape_tournament_detail(scraper, url):
             else:
                 console.print("  [yellow]Puan tablosu bulunamadı[/yellow]")
 
+    except ScrapeCancelled:
+        raise
     except Exception as e:
         console.print(f"  [yellow]Puan tablosu hatası: {e}[/yellow]")
 
@@ -277,7 +283,7 @@ def scrape_tournament_detail(scraper, url):
     return tournament
 
 
-def scrape_tournament_matches(scraper, url, progress_callback=None):
+def scrape_tournament_matches(scraper, url, progress_callback=None, deadline=None):
     """
     Scrape all matches from a tournament matches page.
     Handles multiple rounds and 'Show More' pagination using browser interaction.
@@ -286,19 +292,28 @@ def scrape_tournament_matches(scraper, url, progress_callback=None):
         scraper: VolleyboxScraper instance
         url: Tournament matches URL
         progress_callback: Optional callable(round_index, round_count, match_count, round_name)
+        deadline: Optional Deadline, checked between rounds and "Show More" clicks
 
     Returns:
         List of dicts with match data
     """
+    return list(iter_tournament_matches(scraper, url, progress_callback=progress_callback, deadline=deadline))
+
+
+def iter_tournament_matches(scraper, url, progress_callback=None, deadline=None):
+    """
+    Generator version of scrape_tournament_matches.
+    Yields each match as soon as its round is extracted, so long crawls can be
+    streamed to disk or to a client round by round.
+    """
     console.print(f"[bold cyan]🏐 Turnuva maçları çekiliyor: {url}[/bold cyan]")
 
-    page = scraper._get_page()
-    page.get(url)
+    page = scraper._navigate(url, deadline)
 
     # Initial Cloudflare check
-    if not scraper._wait_for_cloudflare():
+    if not scraper._wait_for_cloudflare(deadline=deadline):
         console.print("[red]Cloudflare geçilemedi, maçlar çekilemiyor.[/red]")
-        return []
+        return
 
     # Get tournament name
     tournament_name = "N/A"
@@ -306,14 +321,17 @@ def scrape_tournament_matches(scraper, url, progress_callback=None):
     if name_el:
         tournament_name = name_el.text
 
-    all_matches = []
+    tournament_id = entity_id(url)
+    match_count = 0
     seen_match_ids = set()
 
     # Find round buttons with a more robust selector (onclick contains changeTournamentRound)
     try:
         page.wait.ele_displayed('xpath://button[contains(@onclick, "changeTournamentRound")]', timeout=15)
         # Wait a bit more for all buttons to render in the horizontal scroll
-        time.sleep(2)
+        pause(2, deadline)
+    except ScrapeCancelled:
+        raise
     except Exception:
         pass
 
@@ -333,6 +351,7 @@ def scrape_tournament_matches(scraper, url, progress_callback=None):
         progress_callback(0, round_count, 0, "Hazırlanıyor...")
 
     for i in range(round_count):
+        check_deadline(deadline)
         if round_buttons[i]:
             # Refetch buttons to avoid stale element reference
             round_buttons = page.eles(round_selector) or page.eles('.transfer-league-btn:not(.show-more-btn)')
@@ -345,13 +364,15 @@ def scrape_tournament_matches(scraper, url, progress_callback=None):
             try:
                 # Use JS click to bypass visibility/scroll issues in horizontal container
                 btn.click(by_js=True)
-                time.sleep(2.5) # Increased wait for AJAX load
+                pause(2.5, deadline) # Increased wait for AJAX load
                 
                 # Double check if any matches appeared, if not, try one more click
                 if not page.ele('xpath://div[@data-hid_match_id]', timeout=2):
                     console.print(f"    [dim]Yeniden deneniyor ({btn_text})...[/dim]")
                     btn.click(by_js=True)
-                    time.sleep(2.5)
+                    pause(2.5, deadline)
+            except ScrapeCancelled:
+                raise
             except Exception as e:
                 console.print(f"  [red]Buton tıklanamadı: {e}[/red]")
                 continue
@@ -375,13 +396,15 @@ def scrape_tournament_matches(scraper, url, progress_callback=None):
                         new_count = len(page.eles('xpath://div[@data-hid_match_id]'))
                         if new_count > last_count:
                             break
-                        time.sleep(0.5)
+                        pause(0.5, deadline)
                     
                     if len(page.eles('xpath://div[@data-hid_match_id]')) <= last_count:
                         # If count didn't increase after 5s, button might be stuck
                         break
                     
                     show_more_count += 1
+                except ScrapeCancelled:
+                    raise
                 except Exception:
                     break
             else:
@@ -403,6 +426,7 @@ def scrape_tournament_matches(scraper, url, progress_callback=None):
             match_data = {
                 "match_id": match_id,
                 "tournament": tournament_name,
+                "tournament_id": tournament_id,
                 "round": get_attr(box, 'data-hid_round_name'),
                 "date_timestamp": get_attr(box, 'data-hid_date'),
                 "date_str": "",
@@ -425,12 +449,12 @@ def scrape_tournament_matches(scraper, url, progress_callback=None):
             except Exception:
                 pass
 
-            all_matches.append(match_data)
+            yield match_data
+            match_count += 1
             round_match_count += 1
             
         console.print(f"    [green]✓ {round_match_count} maç eklendi (Genişletme: {show_more_count}).[/green]")
         if progress_callback:
-            progress_callback(i + 1, round_count, len(all_matches), btn_text if round_buttons[i] else f"Tur {i+1}")
+            progress_callback(i + 1, round_count, match_count, btn_text if round_buttons[i] else f"Tur {i+1}")
 
-    console.print(f"[bold green]✓ Toplam {len(all_matches)} maç çekildi.[/bold green]")
-    return all_matches
+    console.print(f"[bold green]✓ Toplam {match_count} maç çekildi.[/bold green]")
@@ -3,11 +3,20 @@ Transfer scraping module for women.volleybox.net
 Handles scraping of transfer/market data.
 """
 
-import re
+import os
+import json
 from rich.console import Console
 
+from .urls import PLAYER_HREF_RE, absolute_url, entity_id, slug_name
+
 console = Console()
 
+# Incremental mode files (high-water mark + append-only transfer log)
+TRANSFER_STATE_FILE = "transfer_state.json"
+TRANSFER_LOG_FILE = "transfer_log.jsonl"
+# Number of recent transfer keys remembered in the state file
+KNOWN_KEYS_LIMIT = 2000
+
 
 def _extract_team_name(link):
     """
@@ -29,31 +38,17 @@ def _extract_team_name(link):
             return title
 
     # Extract from URL: /tr/team-name-here-t12345 → Team Name Here
-    href = link.get("href", "")
-    match = re.search(r'/([^/]+)-t\d+$', href)
-    if match:
-        slug = match.group(1)
-        # Convert slug to title case
-        return slug.replace("-", " ").title()
-
-    return ""
-
+    return slug_name(link.get("href", ""))
 
-def _make_full_url(href):
-    """Convert relative URL to full URL."""
-    if not href:
-        return ""
-    if href.startswith("http"):
-        return href
-    return f"https://women.volleybox.net{href}"
 
-def scrape_transfers(scraper, page_limit=3):
+def scrape_transfers(scraper, page_limit=3, deadline=None):
     """
     Scrape transfer data from the homepage and transfer page.
 
     Args:
         scraper: VolleyboxScraper instance
         page_limit: Max pages of transfers to scrape
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
 
     Returns:
         List of dicts with transfer info
@@ -63,7 +58,7 @@ def scrape_transfers(scraper, page_limit=3):
     console.print("[bold cyan]📋 Transfer verileri çekiliyor...[/bold cyan]")
 
     # --- Homepage transfers ---
-    soup = scraper.get_page(scraper.build_url(""))
+    soup = scraper.get_page(scraper.build_url(""), deadline=deadline)
     if soup:
         _extract_transfers_from_page(soup, transfers)
 
@@ -71,7 +66,7 @@ def scrape_transfers(scraper, page_limit=3):
     for page in range(1, page_limit + 1):
         url = scraper.build_url("transfers")
         params = {"page": page} if page > 1 else None
-        soup = scraper.get_page(url, params=params)
+        soup = scraper.get_page(url, params=params, deadline=deadline)
 
         if not soup:
             break
@@ -89,7 +84,7 @@ def scrape_transfers(scraper, page_limit=3):
     seen = set()
     unique_transfers = []
     for t in transfers:
-        key = f"{t.get('player_url', '')}|{t.get('from_team_url', '')}|{t.get('to_team_url', '')}"
+        key = _transfer_key(t)
         if key not in seen:
             seen.add(key)
             unique_transfers.append(t)
@@ -98,6 +93,159 @@ def scrape_transfers(scraper, page_limit=3):
     return unique_transfers
 
 
+def scrape_new_transfers(scraper, page_limit=3, state_file=TRANSFER_STATE_FILE, log_file=TRANSFER_LOG_FILE,
+                         deadline=None):
+    """
+    Incrementally scrape transfers newer than the stored high-water mark.
+
+    Transfer pages list the newest transfers first, so paging stops as soon as
+    a page contains a transfer that is already known. New transfers are appended
+    to the transfer log (oldest first) and the state file is updated. Transfers
+    a crashed run logged without saving the state are recovered from the log
+    instead of being logged twice.
+
+    Args:
+        scraper: VolleyboxScraper instance
+        page_limit: Max pages of transfers to scrape
+        state_file: JSON file holding the high-water mark and recent keys
+        log_file: JSONL file new transfers are appended to
+        deadline: Optional Deadline; raises ScrapeCancelled once it passes
+
+    Returns:
+        List of dicts with the new transfers (newest first)
+    """
+    state = load_transfer_state(state_file)
+
+    console.print("[bold cyan]📋 Yeni transferler çekiliyor...[/bold cyan]")
+    if state["newest_key"]:
+        console.print(f"  [dim]Son bilinen transfer: {state['newest_key']} ({state.get('newest_date') or '-'})[/dim]")
+
+    recovered = _recover_unsaved_log(log_file, state)
+    known = set(state["known_keys"]) | set(recovered)
+
+    new_transfers = []
+    for page in range(1, page_limit + 1):
+        url = scraper.build_url("transfers")
+        params = {"page": page} if page > 1 else None
+        soup = scraper.get_page(url, params=params, deadline=deadline)
+
+        if not soup:
+            break
+
+        page_transfers = []
+        _extract_transfers_from_page(soup, page_transfers)
+        if not page_transfers:
+            break
+
+        hit_known = False
+        page_new = 0
+        for t in page_transfers:
+            key = _transfer_key(t)
+            if key in known:
+                hit_known = True
+                continue
+            known.add(key)
+            new_transfers.append(t)
+            page_new += 1
+
+        console.print(f"  [green]Sayfa {page}: {page_new} yeni transfer[/green]")
+
+        if hit_known:
+            # Reached the high-water mark, everything after this is already logged
+            break
+
+    if new_transfers:
+        _append_transfer_log(log_file, reversed(new_transfers))
+        newest = new_transfers[0]
+        state["newest_key"] = _transfer_key(newest)
+        state["newest_date"] = newest.get("date", "")
+    if new_transfers or recovered:
+        # Newest keys first, so the cap drops the oldest ones
+        new_keys = [_transfer_key(t) for t in new_transfers] + recovered
+        state["known_keys"] = (new_keys + state["known_keys"])[:KNOWN_KEYS_LIMIT]
+        state["log_size"] = _file_size(log_file)
+        save_transfer_state(state_file, state)
+
+    console.print(f"[bold green]✓ {len(new_transfers)} yeni transfer bulundu[/bold green]")
+    return new_transfers
+
+
+def load_transfer_state(state_file=TRANSFER_STATE_FILE):
+    """Load the incremental transfer state (empty state if the file is missing)."""
+    # log_size: bytes of the log covered by this state (None = unknown)
+    state = {"newest_key": None, "newest_date": "", "known_keys": [], "log_size": None}
+    if state_file and os.path.exists(state_file):
+        try:
+            with open(state_file, "r", encoding="utf-8") as f:
+                state.update(json.load(f))
+        except (OSError, ValueError) as e:
+            console.print(f"  [yellow]Transfer durumu okunamadı: {e}[/yellow]")
+    # JSON stores key tuples as lists
+    state["known_keys"] = [tuple(k) for k in state["known_keys"]]
+    if state["newest_key"]:
+        state["newest_key"] = tuple(state["newest_key"])
+    return state
+
+
+def save_transfer_state(state_file, state):
+    """Atomically write the incremental transfer state."""
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, state_file)
+
+
+def _recover_unsaved_log(log_file, state):
+    """
+    Keys of transfers appended to the log after the state was last saved
+    (a run that crashed between the two), newest first. A partial last line
+    is cut off so the next append starts on a fresh line.
+    """
+    size = _file_size(log_file)
+    saved = state.get("log_size")
+    if saved is None and not state["known_keys"]:
+        # No state saved yet: the whole log is unsaved
+        saved = 0
+    if saved is None or size <= saved:
+        return []
+
+    with open(log_file, "rb+") as f:
+        f.seek(saved)
+        tail = f.read()
+        complete = tail[: tail.rfind(b"\n") + 1]
+        if len(complete) < len(tail):
+            f.truncate(saved + len(complete))
+
+    keys = []
+    for line in complete.decode("utf-8").splitlines():
+        try:
+            keys.append(_transfer_key(json.loads(line)))
+        except ValueError:
+            continue
+    if keys:
+        console.print(f"  [yellow]Kaydedilmemiş {len(keys)} transfer logdan kurtarıldı[/yellow]")
+    return keys[::-1]
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _append_transfer_log(log_file, transfers):
+    """Append transfers to the JSONL transfer log."""
+    with open(log_file, "a", encoding="utf-8") as f:
+        for t in transfers:
+            f.write(json.dumps(t, ensure_ascii=False) + "\n")
+
+
+def _transfer_key(transfer):
+    """Dedup key for a transfer: (player id, from team id, to team id)."""
+    return tuple(
+        entity_id(transfer.get(field, "")) or transfer.get(field, "")
+        for field in ("player_url", "from_team_url", "to_team_url")
+    )
+
+
 def _extract_transfers_from_page(soup, transfers):
     """Extract transfer data from a page's HTML."""
 
@@ -123,9 +271,9 @@ def _extract_transfers_from_page(soup, transfers):
         href = link.get("href", "")
 
         # If this is a player link
-        if re.search(r'-p\d+$', href):
+        if PLAYER_HREF_RE.search(href):
             player_name = link.get_text(strip=True)
-            player_url = href if href.startswith("http") else f"https://women.volleybox.net{href}"
+            player_url = absolute_url(href)
 
             # Look at surrounding elements for team info
             parent = link.parent
@@ -146,12 +294,12 @@ def _extract_transfers_from_page(soup, transfers):
 
                 if len(team_links) >= 2:
                     from_team = _extract_team_name(team_links[0])
-                    from_team_url = _make_full_url(team_links[0].get("href", ""))
+                    from_team_url = absolute_url(team_links[0].get("href", ""))
                     to_team = _extract_team_name(team_links[1])
-                    to_team_url = _make_full_url(team_links[1].get("href", ""))
+                    to_team_url = absolute_url(team_links[1].get("href", ""))
                 elif len(team_links) == 1:
                     to_team = _extract_team_name(team_links[0])
-                    to_team_url = _make_full_url(team_links[0].get("href", ""))
+                    to_team_url = absolute_url(team_links[0].get("href", ""))
 
                 # Find position/nationality info
                 position = ""
@@ -208,18 +356,18 @@ def _parse_transfer_item(item):
         
         transfer["player_name"] = name
         href = player_link.get("href", "")
-        transfer["player_url"] = href if href.startswith("http") else f"https://women.volleybox.net{href}"
+        transfer["player_url"] = absolute_url(href)
 
     # Teams
     team_links = item.select("a[href*='-t']")
     if len(team_links) >= 2:
         transfer["from_team"] = _extract_team_name(team_links[0])
-        transfer["from_team_url"] = _make_full_url(team_links[0].get("href", ""))
+        transfer["from_team_url"] = absolute_url(team_links[0].get("href", ""))
         transfer["to_team"] = _extract_team_name(team_links[1])
-        transfer["to_team_url"] = _make_full_url(team_links[1].get("href", ""))
+        transfer["to_team_url"] = absolute_url(team_links[1].get("href", ""))
     elif len(team_links) == 1:
         transfer["to_team"] = _extract_team_name(team_links[0])
-        transfer["to_team_url"] = _make_full_url(team_links[0].get("href", ""))
+        transfer["to_team_url"] = absolute_url(team_links[0].get("href", ""))
 
     # Position info
     position_el = item.select_one(".position, .player-position")
@@ -0,0 +1,116 @@
+"""
+URL helpers for women.volleybox.net
+Normalizes site links and extracts canonical entity keys from them.
+
+Entity keys are stable across the tr/en language prefix and slug changes:
+    /tr/vakfbank-t2309, /en/vakifbank-istanbul-t2309  → EntityKey("team", 2309)
+    /tr/cansu-ozbay-p3353                             → EntityKey("player", 3353)
+    /tr/women-...-2-ligi-2025-26-o38677/matches       → EntityKey("tournament", "o38677")
+"""
+
+import re
+from collections import namedtuple
+
+BASE_URL = "https://women.volleybox.net"
+
+EntityKey = namedtuple("EntityKey", ["type", "id"])
+
+# Strict patterns: the href must end with the entity id (list/search link scanning)
+PLAYER_HREF_RE = re.compile(r"-p(\d+)$")
+TEAM_HREF_RE = re.compile(r"-t(\d+)$")
+TOURNAMENT_HREF_RE = re.compile(r"-([co]\d+)$")
+
+# Lenient pattern: entity id segment anywhere in the path, e.g. ".../name-o38677/table"
+_ENTITY_SEGMENT_RE = re.compile(r"-([ptco])(\d+)(?=/|$)")
+_LANG_PREFIX_RE = re.compile(r"^/(tr|en)(?=/)")
+_SLUG_RE = re.compile(r"/([^/]+)-[ptco]\d+$")
+
+_TYPE_BY_PREFIX = {"p": "player", "t": "team", "c": "tournament", "o": "tournament"}
+
+
+def absolute_url(href):
+    """Convert a relative or protocol-relative link to a full URL."""
+    if not href:
+        return ""
+    if href.startswith("http"):
+        return href
+    if href.startswith("//"):
+        return f"https:{href}"
+    if not href.startswith("/"):
+        href = f"/{href}"
+    return f"{BASE_URL}{href}"
+
+
+def normalize_url(url, lang=None):
+    """
+    Normalize a site URL: absolute, no query/fragment, no trailing slash.
+
+    Args:
+        url: Absolute or relative URL
+        lang: If given, rewrite the language prefix (e.g. 'tr' or 'en')
+
+    Returns:
+        Normalized URL string
+    """
+    url = absolute_url(url.strip())
+    url = url.split("#", 1)[0].split("?", 1)[0].rstrip("/")
+    if lang and url.startswith(BASE_URL):
+        path = _LANG_PREFIX_RE.sub(f"/{lang}", url[len(BASE_URL):])
+        url = f"{BASE_URL}{path}"
+    return url
+
+
+def classify_href(href):
+    """
+    Classify a link that points directly at a player, team or tournament.
+
+    Returns:
+        EntityKey or None if the link is not an entity profile link
+    """
+    if not href:
+        return None
+    match = PLAYER_HREF_RE.search(href)
+    if match:
+        return EntityKey("player", int(match.group(1)))
+    match = TEAM_HREF_RE.search(href)
+    if match:
+        return EntityKey("team", int(match.group(1)))
+    match = TOURNAMENT_HREF_RE.search(href)
+    if match:
+        return EntityKey("tournament", match.group(1))
+    return None
+
+
+def entity_key(url):
+    """
+    Extract the canonical entity key from any entity URL, including sub-pages
+    like '/matches' or '/table', query strings and trailing slashes.
+
+    Returns:
+        EntityKey or None if the URL does not contain an entity id
+    """
+    if not url:
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0].rstrip("/")
+    matches = _ENTITY_SEGMENT_RE.findall(path)
+    if not matches:
+        return None
+    prefix, number = matches[0]
+    entity_type = _TYPE_BY_PREFIX[prefix]
+    if entity_type == "tournament":
+        return EntityKey(entity_type, f"{prefix}{number}")
+    return EntityKey(entity_type, int(number))
+
+
+def entity_id(url):
+    """Return just the entity id of a URL (int for players/teams, 'o38677' style for tournaments)."""
+    key = entity_key(url)
+    return key.id if key else None
+
+
+def slug_name(href):
+    """Turn an entity slug into a readable name: /tr/team-name-t12345 → Team Name."""
+    match = _SLUG_RE.search(href or "")
+    if not match:
+        return ""
+    return match.group(1).replace("-", " ").title()
@@ -4,12 +4,21 @@ import altair as alt
 import json
 import sys
 import os
+import glob
+import time
+import threading
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scraper.core import VolleyboxScraper
 from scraper.teams import scrape_team_list, scrape_team_profile
 from scraper.tournaments import scrape_tournament_detail, scrape_tournament_matches
+from scraper.analytics import (
+    MatchExplorer, compute_standings, looks_like_groups, reconcile_standings, team_row,
+    count_chart_data, roster_chart_data, win_loss_chart_data,
+)
+from scraper.store import VolleyboxStore
+from scraper.urls import entity_id, entity_key
 
 # Page config
 st.set_page_config(
@@ -56,14 +65,164 @@ section[data-testid="stSidebar"] { background-color: #020617; border-right: 1px
 </style>
 """, unsafe_allow_html=True)
 
-# ── Session State ───────────────────────────────────────────
-if 'scraper' not in st.session_state:
-    st.session_state.scraper = None
+# ── Shared scraper & cache ──────────────────────────────────
+# Seconds scraped data is reused by every session before it is scraped again
+DETAIL_TTL = 15 * 60
+MATCHES_TTL = 30 * 60
+TEAM_TTL = 60 * 60
+# Folder searched for saved match datasets (e.g. matches_2ligi_full.json)
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ScrapeFailed(Exception):
+    """Raised instead of returning None so a failed scrape is never cached."""
+
+class NotStored(Exception):
+    """Raised by a cached loader when the store has no fresh copy (never cached)."""
 
+
+@st.cache_resource
 def get_scraper():
-    if st.session_state.scraper is None:
-        st.session_state.scraper = VolleyboxScraper(headless=True)
-    return st.session_state.scraper
+    """One headless browser shared by all sessions (launched on first use)."""
+    return VolleyboxScraper(headless=True)
+
+@st.cache_resource
+def scraper_lock():
+    """Sessions share the browser tab, so scrapes run one at a time."""
+    return threading.Lock()
+
+@st.cache_resource
+def get_store():
+    return VolleyboxStore()
+
+@st.cache_resource
+def refresh_tokens():
+    """URL → token of its last forced refresh; part of the loaders' cache keys."""
+    return {}
+
+def refresh_token(url):
+    return refresh_tokens().get(entity_key(url) or url, 0)
+
+def mark_refreshed(url):
+    """Invalidate the cached entries of one URL (for every session) after a forced scrape."""
+    refresh_tokens()[entity_key(url) or url] = time.time_ns()
+
+def fresh_record(url, ttl, detail_keys):
+    """Stored record for a URL if it was scraped within ttl and has detail fields, else None."""
+    record = get_store().get_by_url(url)
+    if not record or time.time() - record.pop("updated_at", 0) > ttl:
+        return None
+    return record if any(record.get(key) for key in detail_keys) else None
+
+def scrape_shared(func, *args, **kwargs):
+    with scraper_lock():
+        return func(get_scraper(), *args, **kwargs)
+
+def fetch_tournament_detail(url):
+    """Scrape a tournament detail and save it to the store (uncached)."""
+    detail = scrape_shared(scrape_tournament_detail, url)
+    if not detail:
+        raise ScrapeFailed(url)
+    get_store().upsert("tournaments", [detail])
+    return detail
+
+@st.cache_data(ttl=DETAIL_TTL, show_spinner=False)
+def load_tournament_detail(url, refresh_token=0):
+    """Tournament detail from the store or the site, shared across sessions for DETAIL_TTL."""
+    return fresh_record(url, DETAIL_TTL, ("standings", "teams")) or fetch_tournament_detail(url)
+
+def stored_matches(url):
+    """Matches of a tournament from the store if scraped within MATCHES_TTL, else None."""
+    tournament_id = entity_id(url)
+    store = get_store()
+    updated = store.last_updated("matches", tournament_id=tournament_id)
+    if not updated or time.time() - updated >= MATCHES_TTL:
+        return None
+    matches = store.matches(tournament_id=tournament_id)
+    for match in matches:
+        match.pop("updated_at", None)
+    return matches
+
+def fetch_tournament_matches(url, progress_callback=None, force=False):
+    """
+    Scrape all matches of a tournament and save them to the store (uncached,
+    so progress is reported live). Unless forced, a copy stored by another
+    session while this one waited for the browser is used instead.
+    """
+    with scraper_lock():
+        matches = None if force else stored_matches(url)
+        if matches:
+            return matches
+        matches = scrape_tournament_matches(get_scraper(), url, progress_callback=progress_callback)
+    if not matches:
+        raise ScrapeFailed(url)
+    get_store().upsert("matches", matches)
+    return matches
+
+@st.cache_data(ttl=MATCHES_TTL, show_spinner=False)
+def load_tournament_matches(url, refresh_token=0):
+    """Stored matches of a tournament, shared across sessions; NotStored when a scrape is needed."""
+    matches = stored_matches(url)
+    if not matches:
+        raise NotStored(url)
+    return matches
+
+def fetch_team_profile(url):
+    """Scrape a team profile and save it to the store (uncached)."""
+    detail = scrape_shared(scrape_team_profile, url)
+    if not detail:
+        raise ScrapeFailed(url)
+    get_store().upsert("teams", [detail])
+    return detail
+
+@st.cache_data(ttl=TEAM_TTL, show_spinner=False)
+def load_team_profile(url, refresh_token=0):
+    """Team profile from the store or the site, shared across sessions for TEAM_TTL."""
+    return fresh_record(url, TEAM_TTL, ("roster", "coach", "arena", "founded")) or fetch_team_profile(url)
+
+def saved_match_files():
+    """Saved match datasets next to the app, newest first."""
+    paths = glob.glob(os.path.join(DATA_DIR, "*matches*.json"))
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+@st.cache_data(show_spinner=False)
+def load_saved_matches(path, mtime):
+    """Read a saved match list (re-read when the file's mtime changes)."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list) or (data and "home_team" not in data[0]):
+        raise ValueError(f"{os.path.basename(path)} bir maç listesi değil")
+    return data
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def league_table(version, _df, group_by=None):
+    """Standings of every team, computed once per dataset version instead of on every rerun."""
+    return compute_standings(_df, group_by=group_by)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_explorer(version, _df):
+    """Filter indexes of a dataset version, shared by reruns and sessions."""
+    return MatchExplorer(_df)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def match_chart_data(version, _explorer, kind, limit):
+    """Pre-aggregated match chart frame ('label', 'count') of a dataset version."""
+    counts = _explorer.round_counts() if kind == "rounds" else _explorer.home_counts()
+    return count_chart_data(counts, limit)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def roster_charts(roster):
+    """Height and position chart frames of a roster (small input, hashed as is)."""
+    return roster_chart_data(roster)
+
+def dataset_version(df):
+    """Content hash of a match frame; cache key of everything derived from it."""
+    return f"{len(df)}-{pd.util.hash_pandas_object(df.astype(str), index=False).sum():x}"
+
+def set_match_data(matches):
+    st.session_state.match_data = matches
+    st.session_state.match_df = load_match_data(matches)
+    st.session_state.match_version = dataset_version(st.session_state.match_df)
 
 def load_match_data(data):
     df = pd.DataFrame(data)
@@ -87,11 +246,15 @@ with st.sidebar:
     )
     
     st.divider()
+    force_refresh = st.checkbox("♻️ Önbelleği atla", help="Kayıtlı veriyi kullanmadan siteden yeniden çek")
     if st.button("🔄 Scraper Yenile"):
-        if st.session_state.scraper:
-            st.session_state.scraper.close()
-        st.session_state.scraper = None
+        # Shared by all sessions: wait for a running scrape, the browser relaunches on next use
+        with scraper_lock():
+            get_scraper().close()
         st.success("Scraper sıfırlandı!")
+    if st.button("🧹 Önbelleği Temizle"):
+        st.cache_data.clear()
+        st.success("Önbellek temizlendi!")
 
 
 # ── TURNUVA ÇEK ────────────────────────────────────────────
@@ -120,10 +283,15 @@ if page == "🏆 Turnuva Çek":
         result_area = st.empty()
         
         try:
-            scraper = get_scraper()
-            progress.progress(0.3, text="Tarayıcı hazır, sayfa yükleniyor...")
-            
-            detail = scrape_tournament_detail(scraper, tourney_url)
+            progress.progress(0.3, text="Sayfa yükleniyor (önbellekte yoksa tarayıcıyla)...")
+            try:
+                if force_refresh:
+                    detail = fetch_tournament_detail(tourney_url)
+                    mark_refreshed(tourney_url)
+                else:
+                    detail = load_tournament_detail(tourney_url, refresh_token(tourney_url))
+            except ScrapeFailed:
+                detail = None
             progress.progress(0.8, text="Veriler çıkarılıyor...")
             
             if detail:
@@ -172,10 +340,18 @@ if page == "🏆 Turnuva Çek":
             match_counter.metric("Çekilen Maç", f"{match_count:,}")
         
         try:
-            scraper = get_scraper()
-            status_text.info("Tarayıcı hazır, maçlar yükleniyor...")
-            
-            matches = scrape_tournament_matches(scraper, matches_url, progress_callback=on_progress)
+            status_text.info("Maçlar yükleniyor (önbellekte yoksa tarayıcıyla)...")
+            try:
+                if force_refresh:
+                    matches = fetch_tournament_matches(matches_url, on_progress, force=True)
+                    mark_refreshed(matches_url)
+                else:
+                    try:
+                        matches = load_tournament_matches(matches_url, refresh_token(matches_url))
+                    except NotStored:
+                        matches = fetch_tournament_matches(matches_url, on_progress)
+            except ScrapeFailed:
+                matches = []
             
             progress_bar.progress(1.0, text="Tamamlandı!")
             status_text.empty()
@@ -183,9 +359,8 @@ if page == "🏆 Turnuva Çek":
             if matches:
                 match_counter.metric("Toplam Çekilen Maç", f"{len(matches):,}")
                 
-                df_matches = load_match_data(matches)
-                st.session_state.match_data = matches
-                st.session_state.match_df = df_matches
+                set_match_data(matches)
+                df_matches = st.session_state.match_df
                 
                 st.success(f"**{len(matches)} maç** yüklendi! 📊 Maç Analizi sayfasından detaylı analiz yapabilirsiniz.")
                 
@@ -201,6 +376,38 @@ if page == "🏆 Turnuva Çek":
                 st.error("❌ Maç bulunamadı")
         except Exception as e:
             st.error(f"Hata: {str(e)}")
+    
+    # --- KAYITLI VERİ ---
+    st.markdown("---")
+    st.subheader("📂 Kayıtlı Veri Seti")
+    st.caption("Daha önce kaydedilmiş maç listesini tarayıcı açmadan yükleyin.")
+    
+    saved_files = saved_match_files()
+    col_s1, col_s2 = st.columns(2)
+    with col_s1:
+        saved_path = st.selectbox(
+            "Klasördeki dosyalar", saved_files, format_func=os.path.basename,
+            index=None, placeholder="Dosya seçin"
+        )
+    with col_s2:
+        uploaded = st.file_uploader("veya JSON yükleyin", type=["json"])
+    
+    if st.button("📂 Veri Setini Yükle"):
+        try:
+            if uploaded is not None:
+                matches = json.load(uploaded)
+                source = uploaded.name
+            elif saved_path:
+                matches = load_saved_matches(saved_path, os.path.getmtime(saved_path))
+                source = os.path.basename(saved_path)
+            else:
+                matches = None
+                st.warning("Önce bir dosya seçin.")
+            if matches:
+                set_match_data(matches)
+                st.success(f"**{len(matches):,} maç** yüklendi ({source}). 📊 Maç Analizi sayfasına geçebilirsiniz.")
+        except Exception as e:
+            st.error(f"Hata: {str(e)}")
 
 
 # ── TAKIM ÇEK ──────────────────────────────────────────────
@@ -221,10 +428,15 @@ elif page == "👥 Takım Çek":
         progress = st.progress(0, text="Bağlanıyor...")
         
         try:
-            scraper = get_scraper()
-            progress.progress(0.3, text="Tarayıcı hazır, takım sayfası yükleniyor...")
-            
-            detail = scrape_team_profile(scraper, team_url)
+            progress.progress(0.3, text="Takım sayfası yükleniyor (önbellekte yoksa tarayıcıyla)...")
+            try:
+                if force_refresh:
+                    detail = fetch_team_profile(team_url)
+                    mark_refreshed(team_url)
+                else:
+                    detail = load_team_profile(team_url, refresh_token(team_url))
+            except ScrapeFailed:
+                detail = None
             progress.progress(0.8, text="Veriler çıkarılıyor...")
             
             if detail:
@@ -238,25 +450,25 @@ elif page == "👥 Takım Çek":
                     st.dataframe(df_r, use_container_width=True, hide_index=True)
                     
                     if 'height' in df_r.columns and 'position' in df_r.columns:
-                        df_r['height_num'] = pd.to_numeric(df_r['height'].astype(str).str.replace('cm', ''), errors='coerce')
+                        heights, positions = roster_charts(detail['roster'])
                         
                         col_c1, col_c2 = st.columns(2)
                         with col_c1:
-                            chart = alt.Chart(df_r.dropna(subset=['height_num'])).mark_bar(
+                            chart = alt.Chart(heights).mark_bar(
                                 cornerRadiusTopLeft=4, cornerRadiusTopRight=4
                             ).encode(
                                 x=alt.X('player_name:N', sort='-y', title='Oyuncu'),
-                                y=alt.Y('height_num:Q', title='Boy (cm)'),
+                                y=alt.Y('height:Q', title='Boy (cm)'),
                                 color=alt.Color('position:N', legend=None),
-                                tooltip=['player_name', 'height_num', 'position']
+                                tooltip=[alt.Tooltip('player_name', title='Oyuncu'), alt.Tooltip('height', title='Boy (cm)'), alt.Tooltip('position', title='Pozisyon')]
                             ).properties(title="Oyuncu Boyları", height=300)
                             st.altair_chart(chart, use_container_width=True)
                         
                         with col_c2:
-                            chart_pos = alt.Chart(df_r).mark_arc(innerRadius=50).encode(
-                                theta=alt.Theta("count()", stack=True),
-                                color=alt.Color("position:N"),
-                                tooltip=["position", "count()"]
+                            chart_pos = alt.Chart(positions).mark_arc(innerRadius=50).encode(
+                                theta=alt.Theta("count:Q", stack=True),
+                                color=alt.Color("label:N", title="Pozisyon"),
+                                tooltip=[alt.Tooltip("label", title="Pozisyon"), alt.Tooltip("count", title="Oyuncu")]
                             ).properties(title="Pozisyon Dağılımı", height=300)
                             st.altair_chart(chart_pos, use_container_width=True)
                 
@@ -273,57 +485,49 @@ elif page == "📊 Maç Analizi":
     st.title("Maç Analizi")
     
     if 'match_df' not in st.session_state or st.session_state.get('match_df') is None:
-        st.info("Önce 🏆 Turnuva Çek sayfasından maç verisi çekin.")
+        st.info("Önce 🏆 Turnuva Çek sayfasından maç verisi çekin veya kayıtlı bir veri seti yükleyin.")
     else:
         df = st.session_state.match_df
+        version = st.session_state.get('match_version') or dataset_version(df)
+        explorer = get_explorer(version, df)
         
         # Summary
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Toplam Maç", f"{len(df):,}")
+            st.metric("Toplam Maç", f"{len(explorer):,}")
         with col2:
-            teams = set()
-            if 'home_team' in df.columns: teams.update(df['home_team'].dropna().unique())
-            if 'away_team' in df.columns: teams.update(df['away_team'].dropna().unique())
-            st.metric("Takım", f"{len(teams):,}")
+            st.metric("Takım", f"{len(explorer.teams):,}")
         with col3:
-            st.metric("Hafta", f"{df['round'].nunique():,}" if 'round' in df.columns else "N/A")
+            st.metric("Hafta", f"{len(explorer.rounds):,}" if 'round' in df.columns else "N/A")
         with col4:
-            st.metric("Salon", f"{df['venue'].nunique():,}" if 'venue' in df.columns else "N/A")
+            st.metric("Salon", f"{len(explorer.venues):,}" if 'venue' in df.columns else "N/A")
         
         st.markdown("---")
         
-        # Filters
-        col_f1, col_f2, col_f3 = st.columns(3)
+        # Filters (index lookups on the explorer, no full-frame masks)
+        col_f1, col_f2, col_f3, col_f4 = st.columns(4)
         with col_f1:
-            rounds = ["Tümü"] + sorted(df['round'].dropna().unique().tolist()) if 'round' in df.columns else ["Tümü"]
-            selected_round = st.selectbox("Hafta", rounds)
+            selected_round = st.selectbox("Hafta", ["Tümü"] + explorer.rounds)
         with col_f2:
-            all_teams = set()
-            if 'home_team' in df.columns: all_teams.update(df['home_team'].dropna().unique())
-            if 'away_team' in df.columns: all_teams.update(df['away_team'].dropna().unique())
-            selected_team = st.selectbox("Takım", ["Tümü"] + sorted(all_teams))
+            selected_team = st.selectbox("Takım", ["Tümü"] + explorer.teams)
         with col_f3:
+            selected_venue = st.selectbox("Salon", ["Tümü"] + explorer.venues)
+        with col_f4:
             score_filter = st.selectbox("Durum", ["Tümü", "Oynandı", "Oynanmadı"])
         
-        filtered = df.copy()
-        if selected_round != "Tümü" and 'round' in filtered.columns:
-            filtered = filtered[filtered['round'] == selected_round]
-        if selected_team != "Tümü":
-            mask = pd.Series(False, index=filtered.index)
-            if 'home_team' in filtered.columns: mask |= (filtered['home_team'] == selected_team)
-            if 'away_team' in filtered.columns: mask |= (filtered['away_team'] == selected_team)
-            filtered = filtered[mask]
-        if score_filter == "Oynandı":
-            filtered = filtered[filtered['score'] != 'vs']
-        elif score_filter == "Oynanmadı":
-            filtered = filtered[filtered['score'] == 'vs']
+        rows = explorer.filter(
+            team=None if selected_team == "Tümü" else selected_team,
+            round_name=None if selected_round == "Tümü" else selected_round,
+            venue=None if selected_venue == "Tümü" else selected_venue,
+            played={"Tümü": None, "Oynandı": True, "Oynanmadı": False}[score_filter],
+        )
+        display_cols = [c for c in ['round', 'date_str', 'home_team', 'score', 'away_team', 'venue'] if c in df.columns]
+        filtered = explorer.take(rows, display_cols or None)
         
         st.caption(f"{len(filtered):,} / {len(df):,} maç gösteriliyor")
         
-        display_cols = [c for c in ['round', 'date_str', 'home_team', 'score', 'away_team', 'venue'] if c in filtered.columns]
         st.dataframe(
-            filtered[display_cols] if display_cols else filtered,
+            filtered,
             column_config={"round": "Hafta", "date_str": "Tarih", "home_team": "Ev Sahibi", "score": "Skor", "away_team": "Deplasman", "venue": "Salon"},
             use_container_width=True, hide_index=True, height=500
         )
@@ -337,21 +541,20 @@ elif page == "📊 Maç Analizi":
         with col_left:
             if 'round' in df.columns:
                 st.subheader("Haftalık Maç Sayısı")
-                rc = df['round'].value_counts().reset_index()
-                rc.columns = ['Hafta', 'Maç']
-                chart = alt.Chart(rc.head(15)).mark_bar(cornerRadiusTopLeft=4, cornerRadiusTopRight=4, color='#8b5cf6').encode(
-                    x=alt.X('Hafta:N', sort='-y'), y='Maç:Q', tooltip=['Hafta', 'Maç']
+                rc = match_chart_data(version, explorer, "rounds", 15)
+                chart = alt.Chart(rc).mark_bar(cornerRadiusTopLeft=4, cornerRadiusTopRight=4, color='#8b5cf6').encode(
+                    x=alt.X('label:N', sort='-y', title='Hafta'), y=alt.Y('count:Q', title='Maç'),
+                    tooltip=[alt.Tooltip('label', title='Hafta'), alt.Tooltip('count', title='Maç')]
                 ).properties(height=300)
                 st.altair_chart(chart, use_container_width=True)
         with col_right:
             if 'home_team' in df.columns:
                 st.subheader("En Çok Ev Sahibi Olan Takımlar")
-                tc = df['home_team'].value_counts().head(10).reset_index()
-                tc.columns = ['Takım', 'Maç']
+                tc = match_chart_data(version, explorer, "home", 10)
                 chart2 = alt.Chart(tc).mark_bar(cornerRadiusTopLeft=4, cornerRadiusTopRight=4).encode(
-                    x=alt.X('Takım:N', sort='-y'), y='Maç:Q',
-                    color=alt.Color('Maç:Q', scale=alt.Scale(scheme='purples'), legend=None),
-                    tooltip=['Takım', 'Maç']
+                    x=alt.X('label:N', sort='-y', title='Takım'), y=alt.Y('count:Q', title='Maç'),
+                    color=alt.Color('count:Q', scale=alt.Scale(scheme='purples'), legend=None),
+                    tooltip=[alt.Tooltip('label', title='Takım'), alt.Tooltip('count', title='Maç')]
                 ).properties(height=300)
                 st.altair_chart(chart2, use_container_width=True)
 
@@ -361,47 +564,49 @@ elif page == "📋 Takım Analizi":
     st.title("Takım Analizi")
     
     if 'match_df' not in st.session_state or st.session_state.get('match_df') is None:
-        st.info("Önce 🏆 Turnuva Çek sayfasından maç verisi çekin.")
+        st.info("Önce 🏆 Turnuva Çek sayfasından maç verisi çekin veya kayıtlı bir veri seti yükleyin.")
     else:
         df = st.session_state.match_df
-        all_teams = set()
-        if 'home_team' in df.columns: all_teams.update(df['home_team'].dropna().unique())
-        if 'away_team' in df.columns: all_teams.update(df['away_team'].dropna().unique())
+        version = st.session_state.get('match_version') or dataset_version(df)
+        # Per-round tables only make sense when rounds are groups, not weeks
+        by_group = looks_like_groups(get_explorer(version, df).rounds) and st.checkbox(
+            "Gruplara göre sırala", value=False, help="'Hafta' sütunu grup adı taşıyor (Group 1, Group 2...)"
+        )
+        totals = league_table(version, df)
+        standings = league_table(version, df, "round") if by_group else totals
         
-        selected_team = st.selectbox("Takım Seç", sorted(all_teams))
+        selected_team = st.selectbox("Takım Seç", sorted(totals['team']))
         
         if selected_team:
+            # Season totals; rank and table come from the team's (first) group
+            row = team_row(totals, selected_team)
+            table_row = team_row(standings, selected_team)
             home_mask = df['home_team'] == selected_team if 'home_team' in df.columns else pd.Series(False, index=df.index)
             away_mask = df['away_team'] == selected_team if 'away_team' in df.columns else pd.Series(False, index=df.index)
             team_matches = df[home_mask | away_mask]
-            played = team_matches[team_matches['score'] != 'vs'] if 'score' in team_matches.columns else team_matches
-            
-            wins = losses = 0
-            if 'home_sets' in played.columns and 'away_sets' in played.columns:
-                for _, row in played.iterrows():
-                    hs = row.get('home_sets', 0) or 0
-                    as_ = row.get('away_sets', 0) or 0
-                    is_home = row.get('home_team') == selected_team
-                    if is_home:
-                        wins += 1 if hs > as_ else 0
-                        losses += 1 if as_ > hs else 0
-                    else:
-                        wins += 1 if as_ > hs else 0
-                        losses += 1 if hs > as_ else 0
+            played = int(row['played'])
+            wins = int(row['wins'])
+            losses = int(row['losses'])
             
             st.markdown(f"### {selected_team}")
             col1, col2, col3, col4 = st.columns(4)
             col1.metric("Toplam", len(team_matches))
-            col2.metric("Oynanan", len(played))
-            col3.metric("Galibiyet", wins, delta=f"{(wins/len(played)*100):.0f}%" if len(played)>0 else None)
+            col2.metric("Oynanan", played)
+            col3.metric("Galibiyet", wins, delta=f"{(wins/played*100):.0f}%" if played > 0 else None)
             col4.metric("Mağlubiyet", losses)
             
+            col5, col6, col7, col8 = st.columns(4)
+            col5.metric("Sıra", f"{int(table_row['rank'])}. ({table_row['group']})" if by_group else int(row['rank']))
+            col6.metric("Puan", int(row['points']))
+            col7.metric("Set", f"{int(row['sets_won'])}-{int(row['sets_lost'])}")
+            col8.metric("Set Averajı", "∞" if row['set_ratio'] == float('inf') else f"{row['set_ratio']:.3f}")
+            
             if wins + losses > 0:
-                wl = pd.DataFrame({'Sonuç': ['Galibiyet', 'Mağlubiyet'], 'Sayı': [wins, losses]})
+                wl = win_loss_chart_data(wins, losses, labels=('Galibiyet', 'Mağlubiyet'))
                 chart_wl = alt.Chart(wl).mark_arc(innerRadius=50).encode(
-                    theta='Sayı:Q',
-                    color=alt.Color('Sonuç:N', scale=alt.Scale(domain=['Galibiyet','Mağlubiyet'], range=['#10b981','#ef4444'])),
-                    tooltip=['Sonuç', 'Sayı']
+                    theta='count:Q',
+                    color=alt.Color('label:N', title='Sonuç', scale=alt.Scale(domain=['Galibiyet','Mağlubiyet'], range=['#10b981','#ef4444'])),
+                    tooltip=[alt.Tooltip('label', title='Sonuç'), alt.Tooltip('count', title='Sayı')]
                 ).properties(height=250)
                 st.altair_chart(chart_wl, use_container_width=True)
             
@@ -412,3 +617,26 @@ elif page == "📋 Takım Analizi":
                 column_config={"round": "Hafta", "date_str": "Tarih", "home_team": "Ev Sahibi", "score": "Skor", "away_team": "Deplasman", "venue": "Salon"},
                 use_container_width=True, hide_index=True
             )
+            
+            st.subheader("Puan Durumu")
+            table = standings[standings['group'] == table_row['group']] if by_group else standings
+            st.dataframe(
+                table,
+                column_config={
+                    "group": "Grup", "rank": "Sıra", "team": "Takım", "played": "O", "wins": "G", "losses": "M",
+                    "sets_won": "AS", "sets_lost": "VS",
+                    "set_ratio": st.column_config.NumberColumn("Set Av.", format="%.3f"), "points": "Puan",
+                },
+                use_container_width=True, hide_index=True
+            )
+            
+            scraped = (st.session_state.get('tournament_detail') or {}).get('standings')
+            if scraped:
+                with st.expander("🔎 Site puan tablosuyla karşılaştır"):
+                    reconciliation = reconcile_standings(standings if by_group else totals, scraped)
+                    mismatches = reconciliation[reconciliation['status'] != 'ok']
+                    if mismatches.empty:
+                        st.success("Hesaplanan puan tablosu sitedeki tabloyla birebir aynı.")
+                    else:
+                        st.warning(f"{len(mismatches)} takımda fark var (eksik maç verisi veya ceza puanı olabilir).")
+                        st.dataframe(mismatches, use_container_width=True, hide_index=True)